@@ -0,0 +1,7 @@
+"""
+Benchmarks for `federleicht`, run them from the repository root, e.g.
+
+```cmd
+python -m benchmarks.hashing 100MB 1GB
+```
+"""
@@ -0,0 +1,194 @@
+"""
+Compare the streaming fingerprint of `federleicht.args.digest` against the former
+approach of serializing the whole DataFrame into an in-memory feather buffer.
+
+Every measurement runs in a fresh process to report the peak resident set size (RSS)
+which the hashing adds on top of the DataFrame itself.
+
+```cmd
+python -m benchmarks.hashing 100MB 1GB 5GB
+```
+"""
+
+import argparse
+import io
+import multiprocessing
+import queue as queues
+import re
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+try:
+    import resource
+except ModuleNotFoundError:  # pragma: no cover
+    resource = None
+
+import federleicht.args as args
+
+UNITS = {"": 1, "KB": 2**10, "MB": 2**20, "GB": 2**30}
+
+
+def parse_size(size: str) -> int:
+    """
+    Parse a human readable size like `100MB` into bytes.
+    """
+
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)\s*([KMG]?B?)", size.strip().upper())
+
+    if match is None:
+        raise argparse.ArgumentTypeError(f"Invalid size: {size}")
+
+    value, unit = match.groups()
+
+    return int(float(value) * UNITS[unit.rstrip("B") + "B" if unit else ""])
+
+
+def dataframe(nbytes: int) -> pd.DataFrame:
+    """
+    Create a DataFrame of roughly `nbytes` with integer, float, datetime and
+    categorical columns.
+    """
+
+    rows = max(1, nbytes // 25)
+    rng = np.random.default_rng(0)
+
+    return pd.DataFrame(
+        {
+            "int": rng.integers(0, 2**31, rows),
+            "float": rng.random(rows),
+            "time": np.datetime64("2020-01-01") + rng.integers(0, 10**6, rows),
+            "category": pd.Categorical.from_codes(
+                rng.integers(0, 4, rows), ["a", "b", "c", "d"]
+            ),
+        }
+    )
+
+
+def legacy(df: pd.DataFrame) -> str:
+    """
+    Fingerprint by serializing the whole DataFrame into a feather buffer.
+    """
+
+    buffer = io.BytesIO()
+    df.to_feather(buffer)
+
+    return args.hash(buffer.getvalue()).hexdigest()
+
+
+def reset_maxrss() -> None:
+    """
+    Reset the peak resident set size of the current process, only supported on Linux.
+    """
+
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:  # pragma: no cover
+        pass
+
+
+def maxrss() -> int:
+    """
+    Peak resident set size of the current process in bytes, or 0 if unsupported.
+    """
+
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:  # pragma: no cover
+        pass
+
+    if resource is None:  # pragma: no cover
+        return 0
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def measure(name: str, nbytes: int, queue: multiprocessing.Queue) -> None:
+
+    df = dataframe(nbytes)
+    size = int(df.memory_usage(deep=True).sum())
+
+    reset_maxrss()
+    baseline = maxrss()
+
+    func = legacy if name == "legacy" else args.digest
+
+    start = time.perf_counter()
+    func(df)
+    elapsed = time.perf_counter() - start
+
+    queue.put((size, elapsed, maxrss() - baseline))
+
+
+def run(name: str, nbytes: int):
+    """
+    Measure one approach for one size in a separate process, return None if the
+    process died, e.g. killed by the OOM killer.
+    """
+
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+
+    process = ctx.Process(target=measure, args=(name, nbytes, queue))
+    process.start()
+
+    while True:
+        try:
+            result = queue.get(timeout=1)
+            break
+        except queues.Empty:
+            if not process.is_alive():
+                result = None
+                break
+
+    process.join()
+
+    return result
+
+
+def main(argv=None) -> int:
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "sizes",
+        nargs="*",
+        type=parse_size,
+        default=[parse_size("100MB"), parse_size("1GB")],
+        help="sizes of the DataFrames to fingerprint, e.g. 100MB 1GB 5GB",
+    )
+    options = parser.parse_args(argv)
+
+    print(f"hasher: {args.hash.__module__}.{args.hash.__name__}\n")
+    print("| approach | frame [MB] | time [s] | throughput [MB/s] | peak RSS [MB] |")
+    print("| :------- | ---------: | -------: | ----------------: | ------------: |")
+
+    for nbytes in options.sizes:
+        for name in ("legacy", "digest"):
+            result = run(name, nbytes)
+
+            if result is None:
+                print(f"| {name} | {nbytes / 2**20:.0f} | failed | | |", flush=True)
+                continue
+
+            size, elapsed, rss = result
+            mb = size / 2**20
+
+            print(
+                f"| {name} | {mb:.0f} | {elapsed:.3f} | {mb / elapsed:.0f} "
+                f"| {rss / 2**20:.0f} |",
+                flush=True,
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
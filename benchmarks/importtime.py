@@ -0,0 +1,128 @@
+"""
+Measure the time of `import federleicht` with `python -X importtime`.
+
+Every repetition runs in a fresh interpreter, the median cumulative import time of the
+package is compared against a budget. Importing the package and decorating a function
+must not import pandas, pyarrow or numpy, they are deferred until the first call.
+
+```cmd
+python -m benchmarks.importtime --repeat 10 --budget 300
+```
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+MODULE = "federleicht"
+
+DEFERRED = ("pandas", "pyarrow", "numpy")
+"""Modules which are imported on the first call of a decorated function."""
+
+BUDGET = 0.3
+"""Budget of the median import time in seconds."""
+
+DECORATE = "\n".join(
+    [
+        "import federleicht",
+        "@federleicht.cache_dataframe",
+        "def load(): pass",
+    ]
+)
+"""Statement which imports the package and decorates a function."""
+
+
+def importtime(statement: str = DECORATE) -> Dict[str, float]:
+    """
+    Run the statement in a new interpreter and return the cumulative import time in
+    seconds of every module it imported.
+    """
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    modules = {}
+
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+
+        _, cumulative, name = line.split("|")
+
+        try:
+            modules[name.strip()] = int(cumulative) / 1e6
+        except ValueError:
+            # header line
+            continue
+
+    return modules
+
+
+def measure(
+    statement: str = DECORATE,
+    repeat: int = 5,
+) -> Tuple[float, List[Dict[str, float]]]:
+    """
+    Return the median import time of the package in seconds and the import times of
+    all repetitions.
+    """
+
+    runs = [importtime(statement) for _ in range(repeat)]
+
+    return statistics.median(run[MODULE] for run in runs), runs
+
+
+def deferred(modules: Dict[str, float]) -> List[str]:
+    """
+    Return the deferred modules which were imported nevertheless.
+    """
+
+    return [name for name in DEFERRED if name in modules]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=BUDGET * 1e3,
+        help="budget of the median import time in milliseconds",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="number of the slowest modules to print",
+    )
+
+    args = parser.parse_args()
+
+    median, runs = measure(repeat=args.repeat)
+    last = runs[-1]
+
+    print(f"import {MODULE}: {median * 1e3:.1f} ms (median of {args.repeat})")
+    print(f"budget: {args.budget:.1f} ms")
+
+    print("\nslowest modules:")
+    slowest = sorted(last.items(), key=lambda item: item[1], reverse=True)
+
+    for name, seconds in slowest[slice(1, args.top + 1)]:
+        print(f"  {name:<40} {seconds * 1e3:8.1f} ms")
+
+    imported = deferred(last)
+
+    if imported:
+        print(f"\nimported eagerly: {', '.join(imported)}")
+
+    sys.exit(1 if imported or median * 1e3 > args.budget else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Compare lookup and clear times of the flat and the sharded cache directory layout.
+
+Every layout and size is measured in a fresh temporary directory filled with empty
+cache files, the directory is created next to the current directory by default to
+benchmark the same filesystem the cache would use.
+
+```cmd
+python -m benchmarks.layout 10k 100k 1M
+```
+"""
+
+import argparse
+import os
+import random
+import secrets
+import tempfile
+import time
+
+import federleicht.layout as layout
+from federleicht.cache import clear_cache
+from federleicht.config import CACHE
+
+UNITS = {"": 1, "K": 10**3, "M": 10**6}
+
+
+def parse_count(count: str) -> int:
+    """
+    Parse a human readable number like `100k` into an integer.
+    """
+
+    count = count.strip().upper()
+    unit = count[-1] if count[-1] in UNITS else ""
+
+    try:
+        return int(float(count.rstrip(unit)) * UNITS[unit])
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid count: {count}") from None
+
+
+def populate(cache_dir: str, keys, sharded: bool) -> float:
+    """
+    Create an empty cache file for each key and return the elapsed time.
+    """
+
+    start = time.perf_counter()
+
+    for key in keys:
+        file = layout.path(cache_dir, key, sharded)
+
+        try:
+            fd = os.open(file, os.O_WRONLY | os.O_CREAT, 0o644)
+        except FileNotFoundError:
+            file.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(file, os.O_WRONLY | os.O_CREAT, 0o644)
+
+        os.close(fd)
+
+    return time.perf_counter() - start
+
+
+def lookup(cache_dir: str, keys, sharded: bool) -> float:
+    """
+    Stat each key, half of them hits and half misses, and return the mean time
+    per lookup in seconds.
+    """
+
+    start = time.perf_counter()
+
+    for key in keys:
+        try:
+            os.stat(layout.path(cache_dir, key, sharded))
+        except FileNotFoundError:
+            pass
+
+    return (time.perf_counter() - start) / len(keys)
+
+
+def measure(count: int, sharded: bool, lookups: int, directory: str):
+
+    rng = random.Random(0)
+    keys = [secrets.token_hex(CACHE.digest) for _ in range(count)]
+
+    probes = rng.sample(keys, min(lookups // 2, count))
+    probes += [secrets.token_hex(CACHE.digest) for _ in range(len(probes))]
+    rng.shuffle(probes)
+
+    with tempfile.TemporaryDirectory(dir=directory) as cache_dir:
+        write = populate(cache_dir, keys, sharded)
+        read = lookup(cache_dir, probes, sharded)
+
+        start = time.perf_counter()
+        errors = clear_cache(cache_dir)
+        clear = time.perf_counter() - start
+
+    assert errors == 0
+
+    return write, read, clear
+
+
+def main(argv=None) -> int:
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "counts",
+        nargs="*",
+        type=parse_count,
+        default=[parse_count("10k"), parse_count("100k")],
+        help="number of cache files, e.g. 10k 100k 1M",
+    )
+    parser.add_argument(
+        "--lookups",
+        type=int,
+        default=20000,
+        help="number of lookups, half of them misses",
+    )
+    parser.add_argument(
+        "--dir",
+        default=".",
+        help="parent directory of the temporary cache directories",
+    )
+    options = parser.parse_args(argv)
+
+    print("| layout | entries | populate [s] | lookup [µs] | clear [s] |")
+    print("| :----- | ------: | -----------: | ----------: | --------: |")
+
+    for count in options.counts:
+        for sharded in (False, True):
+            write, read, clear = measure(count, sharded, options.lookups, options.dir)
+
+            print(
+                f"| {'sharded' if sharded else 'flat'} | {count:,} | {write:.2f} "
+                f"| {read * 1e6:.1f} | {clear:.2f} |",
+                flush=True,
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
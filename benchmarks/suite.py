@@ -0,0 +1,465 @@
+"""
+Reproducible benchmark suite of the hashing, write and read paths.
+
+The suite sweeps row counts, dtype mixes, argument sizes, hashers and codecs over
+synthetic data generated with a fixed seed, so it runs offline and every run measures
+the same data. Each case runs in a fresh process, which reports the peak resident set
+size (RSS) the first call adds and the latency percentiles of the repeated calls after
+it.
+
+Stages:
+
+- `unique`: `federleicht.args.unique` of a list argument with `arg_size` items
+- `digest`: `federleicht.args.digest` of a DataFrame with each hasher
+- `function`: `federleicht.hash.function` of a DataFrame argument, not memoized
+- `write`: `federleicht.feather.write` with each codec
+- `read`: `federleicht.feather.read` of the file written with each codec
+
+`run` writes the results as JSON, `compare` matches the cases of two runs and flags
+regressions of the median latency or the peak RSS.
+
+```cmd
+python -m benchmarks.suite run --output baseline.json
+python -m benchmarks.suite run --output current.json
+python -m benchmarks.suite compare baseline.json current.json --threshold 0.1
+```
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+import federleicht
+import federleicht.args as args
+import federleicht.feather as feather
+import federleicht.hash as hash
+from benchmarks.hashing import maxrss, reset_maxrss
+from benchmarks.layout import parse_count
+
+STAGES = ("unique", "digest", "function", "write", "read")
+"""Stages of the suite."""
+
+
+def _numeric(rows: int, rng: np.random.Generator) -> Dict[str, Any]:
+    return {"int": rng.integers(0, 2**31, rows), "float": rng.random(rows)}
+
+
+def _categorical(rows: int, rng: np.random.Generator) -> Dict[str, Any]:
+    categories = [f"category-{i}" for i in range(16)]
+
+    return {
+        "category": pd.Categorical.from_codes(rng.integers(0, 16, rows), categories)
+    }
+
+
+def _string(rows: int, rng: np.random.Generator) -> Dict[str, Any]:
+    text = np.char.add("row-", rng.integers(0, rows, rows).astype(str))
+
+    return {"string": pd.Series(text, dtype=object)}
+
+
+def _datetime(rows: int, rng: np.random.Generator) -> Dict[str, Any]:
+    return {"time": np.datetime64("2020-01-01", "s") + rng.integers(0, 10**8, rows)}
+
+
+DTYPES: Dict[str, Callable[[int, np.random.Generator], Dict[str, Any]]] = {
+    "numeric": _numeric,
+    "categorical": _categorical,
+    "string": _string,
+    "datetime": _datetime,
+}
+"""Column generators of the dtype mixes, `mixed` combines all of them."""
+
+
+def hashers() -> Dict[str, Callable]:
+    """
+    Return the available hashers by name.
+    """
+
+    available = {
+        "md5": hashlib.md5,
+        "blake2b": hashlib.blake2b,
+        "sha1": hashlib.sha1,
+    }
+
+    try:
+        from xxhash import xxh3_128, xxh128
+
+        available.update(xxh128=xxh128, xxh3_128=xxh3_128)
+    except ModuleNotFoundError:
+        pass
+
+    return available
+
+
+def synthetic(rows: int, dtypes: str = "mixed", seed: int = 0) -> pd.DataFrame:
+    """
+    Create a DataFrame with `rows` rows of a dtype mix, identical for the same seed.
+    """
+
+    rng = np.random.default_rng(seed)
+    names = list(DTYPES) if dtypes == "mixed" else [dtypes]
+
+    data = {}
+
+    for name in names:
+        data.update(DTYPES[name](rows, rng))
+
+    return pd.DataFrame(data)
+
+
+def identifier(case: Dict[str, Any]) -> str:
+    """
+    Return a readable and unique name of a case, e.g. `write[rows=1000,codec=lz4]`.
+    """
+
+    params = ",".join(f"{k}={v}" for k, v in case.items() if k != "stage")
+
+    return f"{case['stage']}[{params}]"
+
+
+def cases(options: argparse.Namespace) -> List[Dict[str, Any]]:
+    """
+    Return all cases of the sweep.
+    """
+
+    result = []
+    frames = list(itertools.product(options.rows, options.dtypes))
+
+    for stage in options.stages:
+        if stage == "unique":
+            for size, name in itertools.product(options.arg_sizes, options.hashers):
+                result.append({"stage": stage, "arg_size": size, "hasher": name})
+        elif stage == "digest":
+            for (rows, dtypes), name in itertools.product(frames, options.hashers):
+                result.append(
+                    {"stage": stage, "rows": rows, "dtypes": dtypes, "hasher": name}
+                )
+        elif stage == "function":
+            for rows, dtypes in frames:
+                result.append({"stage": stage, "rows": rows, "dtypes": dtypes})
+        else:
+            for (rows, dtypes), codec in itertools.product(frames, options.codecs):
+                result.append(
+                    {"stage": stage, "rows": rows, "dtypes": dtypes, "codec": codec}
+                )
+
+    return result
+
+
+def prepare(case: Dict[str, Any], directory: str) -> Callable[[], Any]:
+    """
+    Create the data of a case and return the function to measure.
+    """
+
+    if "hasher" in case:
+        args.hash = hashers()[case["hasher"]]
+
+    if case["stage"] == "unique":
+        value = list(range(case["arg_size"]))
+        return lambda: args.unique(value)
+
+    file = os.path.join(directory, "cache")
+
+    if case["stage"] == "read":
+        feather.write(
+            synthetic(case["rows"], case["dtypes"]), file, codec=case["codec"]
+        )
+        return lambda: feather.read(file)
+
+    df = synthetic(case["rows"], case["dtypes"])
+
+    if case["stage"] == "digest":
+        return lambda: args.digest(df)
+
+    if case["stage"] == "write":
+        return lambda: feather.write(df, file, codec=case["codec"])
+
+    def function():
+        args.forget(df)
+        return hash.function(synthetic, ((df,), {}))
+
+    return function
+
+
+def measure(
+    case: Dict[str, Any],
+    repeat: int,
+    directory: str,
+    queue: multiprocessing.Queue,
+) -> None:
+
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        func = prepare(case, tmp)
+
+        # the peak RSS of the first call, later calls reuse the freed memory
+        reset_maxrss()
+        baseline = maxrss()
+
+        start = time.perf_counter()
+        func()
+        first = time.perf_counter() - start
+
+        peak = maxrss() - baseline
+
+        seconds = []
+
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            seconds.append(time.perf_counter() - start)
+
+    p50, p90, p99 = np.percentile(seconds, [50, 90, 99])
+
+    queue.put(
+        {
+            "id": identifier(case),
+            **case,
+            "repeat": repeat,
+            "seconds": {
+                "first": first,
+                "min": min(seconds),
+                "mean": float(np.mean(seconds)),
+                "p50": float(p50),
+                "p90": float(p90),
+                "p99": float(p99),
+            },
+            "peak_rss": peak,
+        }
+    )
+
+
+def run(case: Dict[str, Any], repeat: int, directory: str) -> Dict[str, Any]:
+    """
+    Measure one case in a separate process.
+    """
+
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+
+    process = ctx.Process(target=measure, args=(case, repeat, directory, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+
+    return result
+
+
+def environment() -> Dict[str, Any]:
+    """
+    Describe the machine and the versions of the run.
+    """
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "python": platform.python_version(),
+        "federleicht": federleicht.__version__,
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "pyarrow": pa.__version__,
+        "hasher": f"{args.hash.__module__}.{args.hash.__name__}",
+        "argv": sys.argv[1:],
+    }
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = 0.1,
+) -> List[Dict[str, Any]]:
+    """
+    Match the cases of two runs and flag changes of the median latency or the peak
+    RSS beyond the relative threshold.
+
+    Returns:
+        List[Dict[str, Any]]: One row per case of both runs with the ratios of the
+            current to the baseline run and the `status` `regression`,
+            `improvement` or `ok`.
+    """
+
+    before = {r["id"]: r for r in baseline["results"]}
+    rows = []
+
+    for result in current["results"]:
+        old = before.get(result["id"])
+
+        if old is None:
+            continue
+
+        latency = result["seconds"]["p50"] / max(old["seconds"]["p50"], 1e-9)
+        memory = (result["peak_rss"] + 2**20) / (old["peak_rss"] + 2**20)
+
+        if latency > 1 + threshold or memory > 1 + threshold:
+            status = "regression"
+        elif latency < 1 - threshold:
+            status = "improvement"
+        else:
+            status = "ok"
+
+        rows.append(
+            {
+                "id": result["id"],
+                "p50_before": old["seconds"]["p50"],
+                "p50_after": result["seconds"]["p50"],
+                "latency": latency,
+                "rss_before": old["peak_rss"],
+                "rss_after": result["peak_rss"],
+                "memory": memory,
+                "status": status,
+            }
+        )
+
+    return rows
+
+
+def main_run(options: argparse.Namespace) -> int:
+
+    results = []
+    todo = cases(options)
+
+    for i, case in enumerate(todo, 1):
+        result = run(case, options.repeat, options.dir)
+        results.append(result)
+
+        print(
+            f"[{i}/{len(todo)}] {result['id']}: "
+            f"p50={result['seconds']['p50'] * 1e3:.3f} ms, "
+            f"peak RSS={result['peak_rss'] / 2**20:.1f} MB",
+            file=sys.stderr,
+            flush=True,
+        )
+
+    report = json.dumps({"environment": environment(), "results": results}, indent=2)
+
+    if options.output is None:
+        print(report)
+    else:
+        with open(options.output, "w") as f:
+            f.write(report)
+
+    return 0
+
+
+def main_compare(options: argparse.Namespace) -> int:
+
+    with open(options.baseline) as f:
+        baseline = json.load(f)
+
+    with open(options.current) as f:
+        current = json.load(f)
+
+    rows = compare(baseline, current, options.threshold)
+
+    print("| case | p50 before [ms] | p50 after [ms] | ratio | RSS ratio | status |")
+    print("| :--- | --------------: | -------------: | ----: | --------: | :----- |")
+
+    for row in rows:
+        print(
+            f"| {row['id']} | {row['p50_before'] * 1e3:.3f} "
+            f"| {row['p50_after'] * 1e3:.3f} | {row['latency']:.2f} "
+            f"| {row['memory']:.2f} | {row['status']} |"
+        )
+
+    return int(any(row["status"] == "regression" for row in rows))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    runner = commands.add_parser("run", help="run the suite and write JSON results")
+    runner.add_argument(
+        "--stages",
+        nargs="+",
+        choices=STAGES,
+        default=list(STAGES),
+        help="stages to measure",
+    )
+    runner.add_argument(
+        "--rows",
+        nargs="+",
+        type=parse_count,
+        default=[10**3, 10**5],
+        help="row counts of the DataFrames, e.g. 1k 100k 1M",
+    )
+    runner.add_argument(
+        "--dtypes",
+        nargs="+",
+        choices=[*DTYPES, "mixed"],
+        default=[*DTYPES, "mixed"],
+        help="dtype mixes of the DataFrames",
+    )
+    runner.add_argument(
+        "--arg-sizes",
+        nargs="+",
+        type=parse_count,
+        default=[10, 10**3, 10**5],
+        help="number of items of the list argument of `unique`",
+    )
+    runner.add_argument(
+        "--hashers",
+        nargs="+",
+        choices=list(hashers()),
+        default=list(hashers()),
+        help="hashers of `unique` and `digest`",
+    )
+    runner.add_argument(
+        "--codecs",
+        nargs="+",
+        choices=["lz4", "zstd", "uncompressed"],
+        default=["lz4", "zstd", "uncompressed"],
+        help="compression codecs of `write` and `read`",
+    )
+    runner.add_argument(
+        "--repeat",
+        type=int,
+        default=20,
+        help="measured calls per case after the first call",
+    )
+    runner.add_argument(
+        "--dir",
+        default=".",
+        help="directory of the temporary cache files",
+    )
+    runner.add_argument(
+        "--output",
+        "-o",
+        help="file of the JSON results, defaults to stdout",
+    )
+    runner.set_defaults(main=main_run)
+
+    comparer = commands.add_parser("compare", help="compare two JSON results")
+    comparer.add_argument("baseline", help="JSON results of the baseline run")
+    comparer.add_argument("current", help="JSON results of the current run")
+    comparer.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative change of the median latency or peak RSS to flag",
+    )
+    comparer.set_defaults(main=main_compare)
+
+    options = parser.parse_args(argv)
+
+    return options.main(options)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
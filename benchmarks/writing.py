@@ -0,0 +1,114 @@
+"""
+Compare the peak memory of writing a cache file at once against streaming it in record
+batches of bounded size with `federleicht.feather.write(chunksize=...)`.
+
+Every measurement runs in a fresh process to report the peak resident set size (RSS)
+which writing adds on top of the DataFrame itself.
+
+```cmd
+python -m benchmarks.writing 1GB --chunksize 65536
+```
+"""
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import federleicht.feather as feather
+from benchmarks.hashing import dataframe, maxrss, parse_size, reset_maxrss
+
+
+def strings(nbytes: int):
+    """
+    Create the DataFrame of `benchmarks.hashing` with an additional string column,
+    numeric columns are converted to arrow without copying, strings are not.
+    """
+
+    df = dataframe(nbytes // 4)
+    text = np.char.add("row-", df["int"].to_numpy().astype(str))
+    df["text"] = pd.Series(text, dtype=object)
+
+    return df
+
+
+def measure(nbytes: int, chunksize: int, codec: str, queue: multiprocessing.Queue):
+
+    df = strings(nbytes)
+    size = int(df.memory_usage(deep=True).sum())
+
+    with tempfile.TemporaryDirectory(dir=".") as directory:
+        file = os.path.join(directory, "cache")
+
+        reset_maxrss()
+        baseline = maxrss()
+
+        start = time.perf_counter()
+        feather.write(df, file, codec=codec, chunksize=chunksize)
+        elapsed = time.perf_counter() - start
+
+        queue.put((size, elapsed, maxrss() - baseline))
+
+
+def run(nbytes: int, chunksize: int, codec: str):
+    """
+    Measure one write in a separate process.
+    """
+
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+
+    process = ctx.Process(target=measure, args=(nbytes, chunksize, codec, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+
+    return result
+
+
+def main(argv=None) -> int:
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "sizes",
+        nargs="*",
+        type=parse_size,
+        default=[parse_size("100MB"), parse_size("1GB")],
+        help="sizes of the DataFrames to write, e.g. 100MB 1GB",
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=2**16,
+        help="rows per record batch of the streamed write",
+    )
+    parser.add_argument(
+        "--codec",
+        default="uncompressed",
+        help="compression codec of the cache file",
+    )
+    options = parser.parse_args(argv)
+
+    print(f"codec: {options.codec}\n")
+    print("| write | frame [MB] | time [s] | peak RSS [MB] |")
+    print("| :---- | ---------: | -------: | ------------: |")
+
+    for nbytes in options.sizes:
+        for chunksize in (None, options.chunksize):
+            size, elapsed, rss = run(nbytes, chunksize, options.codec)
+            name = "table" if chunksize is None else f"chunksize={chunksize}"
+
+            print(
+                f"| {name} | {size / 2**20:.0f} | {elapsed:.3f} | {rss / 2**20:.0f} |",
+                flush=True,
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,13 +2,22 @@
 .. include:: ../README.md
 """
 
-from federleicht.cache import clear_cache, delete_cache, from_cache
+from federleicht.cache import clear_cache, delete_cache, from_cache, migrate_cache
 from federleicht.config import __version__  # noqa: F401
 from federleicht.dataframe import cache_dataframe
+from federleicht.prefetch import warm
+from federleicht.ranges import cache_range
+from federleicht.stats import cache_info
+from federleicht.writer import flush
 
 __all__ = [
     "from_cache",
     "clear_cache",
     "delete_cache",
+    "migrate_cache",
     "cache_dataframe",
+    "cache_range",
+    "flush",
+    "warm",
+    "cache_info",
 ]
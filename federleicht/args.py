@@ -9,22 +9,40 @@ For `os.PathLike` objects a tuple with the resolved path, size and modification
 used for hashing to detect if the file changed.
 
 For `numpy.ndarray`, `pandas.DataFrame` and `pandas.Series` a tuple of the type and the
-binary representation is used for hashing to detect if the data changed.
+binary representation is used for hashing to detect if the data changed, for pandas
+objects including the names and types of the index and columns. The same holds for
+`pyarrow.Table`, `pyarrow.RecordBatch`, `pyarrow.Array` and `pyarrow.ChunkedArray`,
+whose buffers are hashed without conversion, and for polars DataFrames and Series, which
+are hashed as their Arrow representation. Values of object columns with mixed types are
+encoded one by one together with their type.
+
+The fingerprint of immutable objects, pyarrow objects and read-only ndarrays, is
+memoized as long as the object is alive. The same holds for DataFrames and Series whose
+index and columns are backed by pyarrow, e.g. read with `dtype_backend="pyarrow"`, or by
+read-only ndarrays. Assignments replace the pyarrow arrays of such objects, so the memo
+is only used while the object holds the same arrays and metadata. Writeable ndarrays
+and pandas objects backed by them can be modified in place at any time, so they are
+hashed on every call.
 """
 
-import io
 import json
 import os
 import pathlib
+import threading
 import types
+import weakref
 from abc import ABC, abstractmethod
 from datetime import datetime
 from decimal import Decimal
 from fractions import Fraction
 from types import MappingProxyType
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Optional, Tuple
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+
+import federleicht.tables as tables
 
 try:
     from xxhash import xxh128 as hash  # type: ignore
@@ -32,6 +50,13 @@ except ModuleNotFoundError:
     from hashlib import md5 as hash
 
 
+ARROW = (pa.Table, pa.RecordBatch, pa.Array, pa.ChunkedArray)
+"""Immutable pyarrow objects which are fingerprinted by their buffers."""
+
+MIXED = ("mixed", "mixed-integer", "mixed-integer-float")
+"""Inferred types of object data with values of different types."""
+
+
 class _Hash(ABC):  # pragma: no cover
     """
     Abstract base class for hashing algorithms to use as type hint for the `hash`
@@ -105,15 +130,349 @@ def representation(obj: Any) -> str:
     return str(obj)
 
 
-def json_encoder(obj: Any) -> str:
+def immutable(obj: Any) -> bool:
+    """
+    Check if the data of an object can't be modified in place, which holds for pyarrow
+    objects and for read-only ndarrays whose bases are read-only as well.
+    """
+
+    if isinstance(obj, ARROW):
+        return True
+
+    if not isinstance(obj, np.ndarray):
+        return False
+
+    # a read-only view of a writeable array changes with the array
+    while isinstance(obj, np.ndarray):
+        if obj.flags.writeable:
+            return False
+
+        obj = obj.base
+
+    return obj is None or isinstance(obj, (bytes, pa.Buffer, *ARROW))
+
+
+def backing(values: Any) -> Optional[Tuple[Any, ...]]:
+    """
+    Return the objects holding the data of a column or an index, or None if the data
+    can be modified in place.
+
+    pyarrow backed data is immutable, an assignment replaces the pyarrow array of the
+    pandas array, so both are returned. numpy backed data must be `immutable`.
+    """
+
+    if isinstance(values, pd.RangeIndex):
+        return (values,)
+
+    if isinstance(values, pd.MultiIndex):
+        return None
+
+    array = values.array
+
+    if isinstance(array, pd.arrays.ArrowExtensionArray):
+        return array, array.__arrow_array__()
+
+    if not isinstance(values.dtype, np.dtype):
+        return None
+
+    array = np.asarray(values)
+
+    if not immutable(array):
+        return None
+
+    while isinstance(array.base, np.ndarray):
+        array = array.base
+
+    return (array,)
+
+
+def frozen(obj: Any) -> Optional[Tuple[Any, ...]]:
+    """
+    Return the objects holding the data of a DataFrame or Series, or None if any of
+    them can be modified in place.
+    """
+
+    columns = [obj] if isinstance(obj, pd.Series) else (c for _, c in obj.items())
+    objects = []
+
+    for values in (obj.index, *columns):
+        data = backing(values)
+
+        if data is None:
+            return None
+
+        objects.extend(data)
+
+    return tuple(objects)
+
+
+def update_array(hasher: _Hash, array: "pa.Array") -> None:
+    """
+    Feed the physical buffers of a pyarrow array into the hasher without copying them.
+    """
+
+    hasher.update(f"{array.type}:{len(array)}:{array.offset}".encode())
+
+    for buffer in array.buffers():
+        if buffer is not None:
+            hasher.update(buffer)
+
+    if isinstance(array, pa.DictionaryArray):
+        update_array(hasher, array.dictionary)
+
+
+def update_numpy(hasher: _Hash, array: np.ndarray, chunksize: int = 2**26) -> None:
+    """
+    Feed the buffer of a numpy array into the hasher. Non-contiguous arrays are copied
+    in chunks of at most `chunksize` bytes and object arrays are canonically encoded.
+    """
+
+    hasher.update(f"{array.dtype.str}:{array.shape}".encode())
+
+    if array.dtype.hasobject:
+        update_values(hasher, array.reshape(-1))
+        return
+
+    array = np.atleast_1d(array)
+
+    if array.flags.c_contiguous:
+        hasher.update(array.reshape(-1).view(np.uint8))
+        return
+
+    rows = max(1, chunksize // max(1, array[:1].nbytes))
+
+    for start in range(0, len(array), rows):
+        chunk = np.ascontiguousarray(array[slice(start, start + rows)])
+        hasher.update(chunk.reshape(-1).view(np.uint8))
+
+
+def update_objects(hasher: _Hash, values: np.ndarray) -> None:
+    """
+    Feed a 1-dimensional object array value by value into the hasher, each value is
+    encoded by `serialize` and tagged with its type, so `1` and `"1"` differ.
+
+    Raises a TypeError if a value has no unique representation.
+    """
+
+    for value in values:
+        text = repr(value) if value is pd.NA or value is pd.NaT else serialize(value)
+        encoded = f"{type(value).__qualname__}:{text}".encode()
+        hasher.update(f"{len(encoded)}:".encode())
+        hasher.update(encoded)
+
+
+def update_values(hasher: _Hash, values: Any) -> None:
+    """
+    Feed a column, an index or a 1-dimensional object array into the hasher.
+
+    numpy backed data is fed through the buffer protocol, extension and object data is
+    converted into pyarrow arrays. Object data of mixed types, which pyarrow would
+    convert or reject, is encoded value by value with `update_objects`.
+    """
+
+    if isinstance(values, pd.RangeIndex):
+        hasher.update(repr(values).encode())
+        return
+
+    if isinstance(values, pd.MultiIndex):
+        for _, level in values.to_frame(index=False).items():
+            update_values(hasher, level)
+        return
+
+    dtype = values.dtype
+
+    if isinstance(dtype, np.dtype) and not dtype.hasobject:
+        update_numpy(hasher, np.asarray(values))
+        return
+
+    array = getattr(values, "array", values)
+
+    if dtype == object:
+        objects = np.asarray(array, dtype=object)
+
+        if pd.api.types.infer_dtype(objects, skipna=True) in MIXED:
+            update_objects(hasher, objects)
+            return
+
+    try:
+        arrow = pa.array(array, from_pandas=True)
+    except (pa.ArrowException, TypeError, ValueError):
+        update_objects(hasher, np.asarray(array, dtype=object))
+        return
+
+    for chunk in getattr(arrow, "chunks", [arrow]):
+        update_array(hasher, chunk)
+
+
+def header(obj: Any) -> str:
+    """
+    Return the metadata of a DataFrame or Series, which is the type, dtype and names of
+    the index and columns and the names and dtypes of the columns.
+    """
+
+    if isinstance(obj, pd.Series):
+        axes = [obj.index]
+        columns = [(obj.name, obj.dtype)]
+    else:
+        axes = [obj.index, obj.columns]
+        columns = obj.dtypes.items()
+
+    return repr(
+        (
+            type(obj).__name__,
+            [(type(axis).__name__, str(axis.dtype), list(axis.names)) for axis in axes],
+            [f"{name!r}:{dtype}" for name, dtype in columns],
+        )
+    )
+
+
+def digest(obj: Any) -> str:
+    """
+    Return the hexdigest of the binary representation of a DataFrame, Series, ndarray or
+    pyarrow object.
+
+    The data is fed column by column into an incremental hasher using the buffers of
+    the underlying numpy or pyarrow arrays, so the object is never serialized as whole.
+    """
+
+    hasher = hash()
+
+    # pyarrow.Table, pyarrow.RecordBatch, pyarrow.Array, pyarrow.ChunkedArray
+    if isinstance(obj, ARROW):
+        if isinstance(obj, (pa.Table, pa.RecordBatch)):
+            hasher.update(obj.schema.serialize())
+            columns = obj.columns
+        else:
+            columns = [obj]
+
+        for column in columns:
+            for chunk in getattr(column, "chunks", [column]):
+                update_array(hasher, chunk)
+
+        return hasher.hexdigest()
+
+    # pandas.DataFrame, pandas.Series
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        hasher.update(header(obj).encode())
+        update_values(hasher, obj.index)
+
+        columns = [obj] if isinstance(obj, pd.Series) else (c for _, c in obj.items())
+
+        for column in columns:
+            update_values(hasher, column)
+
+        return hasher.hexdigest()
+
+    # numpy.ndarray
+    update_numpy(hasher, obj)
+
+    return hasher.hexdigest()
+
+
+_fingerprints: Dict[int, Tuple[weakref.ref, Any, str]] = {}
+_fingerprints_lock = threading.Lock()
+
+
+def state(obj: Any) -> Optional[Tuple[str, Tuple[weakref.ref, ...]]]:
+    """
+    Return the metadata and weak references to the data of a DataFrame or Series
+    which is `frozen`, or None if it isn't.
+    """
+
+    objects = frozen(obj)
+
+    if objects is None:
+        return None
+
+    try:
+        return header(obj), tuple(weakref.ref(o) for o in objects)
+    except TypeError:
+        return None
+
+
+def same(memo: Any, other: Any) -> bool:
+    """
+    Check if two results of `state` refer to the same metadata and data.
+    """
+
+    if memo is None or other is None:
+        return memo is other
+
+    return (
+        memo[0] == other[0]
+        and len(memo[1]) == len(other[1])
+        and all(a() is b() for a, b in zip(memo[1], other[1]))
+    )
+
+
+def fingerprint(obj: Any) -> str:
+    """
+    Return the `digest` of a DataFrame, Series, ndarray or pyarrow object, which is
+    memoized for `immutable` objects and `frozen` pandas objects until they are
+    garbage collected.
+    """
+
+    memo = state(obj) if isinstance(obj, (pd.DataFrame, pd.Series)) else None
+
+    if memo is None and not immutable(obj):
+        return digest(obj)
+
+    key = id(obj)
+
+    try:
+        ref = weakref.ref(obj, lambda _: _fingerprints.pop(key, None))
+    except TypeError:
+        return digest(obj)
+
+    with _fingerprints_lock:
+        cached = _fingerprints.get(key)
+
+    if cached is not None and cached[0]() is obj and same(cached[1], memo):
+        return cached[2]
+
+    result = digest(obj)
+
+    with _fingerprints_lock:
+        _fingerprints[key] = (ref, memo, result)
+
+    return result
+
+
+def forget(obj: Any) -> None:
+    """
+    Remove the memoized fingerprint of an object, e.g. after making a read-only ndarray
+    writeable again.
+    """
+
+    with _fingerprints_lock:
+        _fingerprints.pop(id(obj), None)
+
+
+def json_encoder(obj: Any, content: Callable[[os.PathLike], str] = None) -> str:
     """
     Encode an object to a unique string representation, for mutable types it can result
     in returning a hexdigest of the object.
+
+    Args:
+        obj (Any): The object to encode.
+        content (Callable[[os.PathLike], str], optional): A function returning a digest
+            of the file content, e.g. `federleicht.content.ContentMemo.digest`, to
+            fingerprint files by their content instead of their size and modification
+            time. Defaults to None.
     """
 
     # pathlib.Path
     if isinstance(obj, os.PathLike):
         p = pathlib.Path(obj)
+
+        if content is not None and p.is_file():
+            return str(
+                (
+                    p.resolve().as_posix(),
+                    content(p),
+                )
+            )
+
         return str(
             (
                 p.resolve().as_posix(),
@@ -122,22 +481,35 @@ def json_encoder(obj: Any) -> str:
             )
         )
 
-    # pandas.DataFrame
-    if hasattr(obj, "to_feather"):
-        buffer = io.BytesIO()
-        obj.to_feather(buffer)
+    # pandas.DataFrame, pandas.Series
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
         return str(
             (
                 type(obj),
-                hash(buffer.getvalue()).hexdigest(),
+                fingerprint(obj),
                 unique(**obj.attrs).hexdigest(),
             )
         )
 
-    if isinstance(obj, pd.Series):
-        return json_encoder(obj.to_frame())
+    # numpy.ndarray, pyarrow.Table, pyarrow.Array, ...
+    if isinstance(obj, (np.ndarray, *ARROW)):
+        return str(
+            (
+                type(obj),
+                fingerprint(obj),
+            )
+        )
 
-    # numpy.ndarray
+    # polars.DataFrame, polars.Series
+    if tables.is_polars(obj):
+        return str(
+            (
+                type(obj),
+                digest(obj.to_arrow()),
+            )
+        )
+
+    # numpy scalars, memoryview, array.array
     if hasattr(obj, "tobytes"):
         return str(
             (
@@ -165,15 +537,25 @@ def dumps(
     Generate a JSON string for all arguments and keyword arguments.
     """
 
-    data = json.dumps(
-        (args, kwargs),
+    return serialize((args, kwargs))
+
+
+def serialize(
+    data: Any,
+    default: Callable[[Any], str] = json_encoder,
+) -> str:
+    """
+    Generate a JSON string for the data with sorted keys, objects which are not JSON
+    serializable are encoded by `default`.
+    """
+
+    return json.dumps(
+        data,
         sort_keys=True,
-        default=json_encoder,
+        default=default,
         indent=4,
     )
 
-    return data
-
 
 def unique(
     *args: Any,
@@ -192,4 +574,5 @@ def unique(
 __all__ = [
     "unique",
     "hash",
+    "forget",
 ]
@@ -5,6 +5,7 @@ import pandas as pd
 from pathlibutil import Path
 
 import federleicht.args as args
+import federleicht.feather as feather
 from federleicht.config import CACHE
 
 
@@ -33,7 +34,9 @@ def save(
     """
     Dump the DataFrame attributes and their hash into a JSON file.
 
-    Creates a JSON file only when `df.attrs` is not empty.
+    Creates a JSON file only when `df.attrs` is not empty, results without attributes,
+    e.g. a `pyarrow.Table`, are skipped. The file is written atomically, so readers
+    never see a partially written file.
 
     Args:
         df (pd.DataFrame): The DataFrame whose attributes are to be dumped.
@@ -44,23 +47,22 @@ def save(
         Path: The path to the created JSON file, or None if df.attrs is empty.
     """
 
-    if not df.attrs:
+    if not getattr(df, "attrs", None):
         return None
 
-    file: Path = filename.with_suffix(CACHE.attrs)
-
-    file.write_text(
-        json.dumps(
-            {
-                "attrs": df.attrs,
-                "lock": lock(df.attrs, default=default),
-            },
-            default=default,
-            indent=4,
-        ),
+    text = json.dumps(
+        {
+            "attrs": df.attrs,
+            "lock": lock(df.attrs, default=default),
+        },
+        default=default,
+        indent=4,
     )
 
-    return file
+    return feather.atomic(
+        filename.with_suffix(CACHE.attrs),
+        lambda tmp: tmp.write_text(text),
+    )
 
 
 def restore(df: pd.DataFrame, filename: Path, **kwargs) -> pd.DataFrame:
@@ -74,6 +76,9 @@ def restore(df: pd.DataFrame, filename: Path, **kwargs) -> pd.DataFrame:
 
     Returns:
         pd.DataFrame: The DataFrame with updated attributes.
+
+    Raises:
+        ValueError: If the JSON file is invalid.
     """
 
     file: Path = filename.with_suffix(CACHE.attrs)
@@ -1,27 +1,61 @@
-import re
+from __future__ import annotations
+
+import os
+import time
+from datetime import timedelta
+from typing import TYPE_CHECKING
 
-import pandas as pd
 from pathlibutil import Path
 
+import federleicht.layout as layout
 from federleicht.config import CACHE
+from federleicht.manifest import Manifest, connect
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 def from_cache(df: pd.DataFrame) -> bool:
     """
     Check if a DataFrame was loaded from the cache.
 
+    A `pyarrow.Table` is marked by the federleicht metadata in its schema, a
+    `polars.DataFrame` has no attributes and is never marked.
+
     Args:
         df (pd.DataFrame): The DataFrame to check.
 
     Returns:
         bool: True if the DataFrame was loaded from the cache, False otherwise.
     """
-    return df.attrs.get("from_cache", None) is not None
+
+    # only pyarrow objects import pyarrow, which is then imported already
+    if type(df).__module__.split(".")[0] == "pyarrow":
+        import pyarrow as pa
+
+        import federleicht.tables as tables
+
+        if isinstance(df, pa.Table):
+            return tables.METADATA in (df.schema.metadata or {})
+
+    return getattr(df, "attrs", {}).get("from_cache", None) is not None
+
+
+def unlink(cache_file: str) -> None:
+    """
+    Delete a cache file and its optional attributes file, missing files are ignored.
+    """
+
+    cache = Path(cache_file)
+
+    cache.delete(missing_ok=True)
+    cache.with_suffix(CACHE.attrs).delete(missing_ok=True)
 
 
 def delete_cache(cache_file: str) -> None:
     """
-    Delete a cache file and its optional attributes file.
+    Delete a cache file and its optional attributes file, and remove it from the
+    manifest of the cache directory. Cache files in the sharded layout are supported.
 
     Args:
         filename (str): The name of the cache file to delete.
@@ -32,16 +66,31 @@ def delete_cache(cache_file: str) -> None:
 
     cache = Path(cache_file)
 
-    cache.delete(missing_ok=True)
-    cache.with_suffix(CACHE.attrs).delete(missing_ok=True)
+    unlink(cache)
 
+    cache_dir = layout.root(cache)
 
-def clear_cache(cache_dir: str = CACHE.dir, **kwargs) -> int:
+    if Manifest.exists(cache_dir):
+        connect(cache_dir).remove([cache.name])
+
+
+def clear_cache(cache_dir: str = CACHE.dir, rebuild: bool = False, **kwargs) -> int:
     """
     Clear all cache files from the cache directory.
 
+    When the cache directory has a manifest, the expired cache files are looked up in
+    the manifest by their creation time instead of scanning the directory, and removed
+    from it in a single transaction. Cache files missing in the manifest, e.g. of
+    decorators without `manifest=True`, are only cleared with `rebuild=True`, which
+    synchronizes the manifest with the cache directory first. Without a manifest the
+    directory is scanned and cache files expire by their modification time. Cache files
+    are cleared in flat and sharded layout.
+
     Args:
         cache_dir (str): The directory where the cache files are stored.
+        rebuild (bool, optional): Scan the cache directory once with
+            `Manifest.rebuild` to clear cache files missing in the manifest as well.
+            Defaults to False.
         **kwargs: argument for `datetime.timedelta` to determine expiration time.
 
     Returns:
@@ -52,25 +101,127 @@ def clear_cache(cache_dir: str = CACHE.dir, **kwargs) -> int:
         0
     """
 
-    if not kwargs:
-        is_expired = lambda file: True  # noqa
-    else:
-        is_expired = lambda file: file.is_expired(**kwargs)  # noqa
+    before = time.time() - timedelta(**kwargs).total_seconds() if kwargs else None
+    error = 0
+
+    if not Manifest.exists(cache_dir):
+        for entry in layout.scan(cache_dir):
+            try:
+                if before is None or entry.stat().st_mtime < before:
+                    unlink(entry.path)
+            except Exception:
+                error += 1
+
+        return error
+
+    manifest = connect(cache_dir)
+
+    if rebuild:
+        manifest.rebuild()
+
+    keys = manifest.keys() if before is None else manifest.expired(before)
+    removed = []
+
+    for key in keys:
+        try:
+            unlink(layout.find(cache_dir, key))
+            removed.append(key)
+        except Exception:
+            error += 1
+
+    manifest.remove(removed)
+
+    return error
+
+
+def evict_cache(
+    cache_dir: str = CACHE.dir,
+    max_bytes: int = 0,
+    policy: str = "lru",
+    limit: int = 64,
+    keep: str = None,
+) -> int:
+    """
+    Evict cache files until the size of the cache directory fits into the budget.
+
+    Requires the manifest of the cache directory, which tracks the size, the last access
+    time and the hits of each cache file. At most `limit` files are evicted per call, so
+    a single call never stalls, the remaining overflow is evicted by the next call.
+
+    Args:
+        cache_dir (str): The directory where the cache files are stored.
+        max_bytes (int): The maximum size of all cache files in bytes.
+        policy (str, optional): `lru` or `lfu` eviction. Defaults to "lru".
+        limit (int, optional): Maximum number of files to evict. Defaults to 64.
+        keep (str, optional): Name of a cache file which must not be evicted, e.g. the
+            file which was just written. Defaults to None.
+
+    Returns:
+        int: The number of errors encountered while evicting the cache files.
+
+    Example:
+        >>> evict_cache(max_bytes=2**30, policy="lfu")
+        0
+    """
+
+    manifest = connect(cache_dir)
 
-    regex = re.compile(f"[a-f0-9]{{{CACHE.digest}}}", re.IGNORECASE)
+    overflow = manifest.nbytes() - max_bytes
+
+    if overflow <= 0:
+        return 0
 
     error = 0
-    files = (file for file in Path(cache_dir).iterdir() if file.is_file())
+    victims = [e for e in manifest.victims(policy, limit + 1) if e.key != keep]
 
-    for file in files:
-        if not regex.fullmatch(file.name):
-            continue
+    for entry in victims[:limit]:
+        if overflow <= 0:
+            break
+
+        try:
+            delete_cache(layout.find(cache_dir, entry.key))
+            overflow -= entry.size
+        except Exception:
+            error += 1
 
-        if not is_expired(file):
+    return error
+
+
+def migrate_cache(cache_dir: str = CACHE.dir, sharded: bool = True) -> int:
+    """
+    Move all cache files and their attributes files into the sharded layout, or back
+    into the flat layout. Run it once while no other process writes to the cache
+    directory, the manifest needs no update as the keys are unchanged.
+
+    Args:
+        cache_dir (str): The directory where the cache files are stored.
+        sharded (bool, optional): Migrate into the sharded layout, False to migrate
+            into the flat layout. Defaults to True.
+
+    Returns:
+        int: The number of errors encountered while moving the cache files.
+
+    Example:
+        >>> migrate_cache(sharded=True)
+        0
+    """
+
+    error = 0
+
+    for entry in list(layout.scan(cache_dir)):
+        source = Path(entry.path)
+        target = layout.path(cache_dir, entry.name, sharded)
+
+        if source == target:
             continue
 
         try:
-            delete_cache(file)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(source, target)
+
+            source = source.with_suffix(CACHE.attrs)
+            if source.is_file():
+                os.replace(source, target.with_suffix(CACHE.attrs))
         except Exception:
             error += 1
 
@@ -0,0 +1,187 @@
+"""
+Cache generator functions which yield `pandas.DataFrame` chunks.
+
+On a miss `write` passes every chunk through to the caller and appends it as record
+batch to an Arrow IPC stream, which is renamed into the cache file when the generator
+is exhausted. On a hit `read` replays the chunks batch by batch. Only a single chunk is
+held in memory at a time in both cases.
+
+The index of each chunk is stored as column, so replayed chunks keep their labels, e.g.
+the continuing `RangeIndex` of `pd.read_csv(..., chunksize=...)`.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional
+
+from pathlibutil import Path
+
+import federleicht.compression as compression
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+SUFFIX = ".arrows"
+"""Suffix of the cache files of generator functions, Arrow IPC streams."""
+
+
+def write(
+    chunks: Iterable[pd.DataFrame],
+    file: Path,
+    memory_map: bool = False,
+    codec: Optional[str] = None,
+    level: Optional[int] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield the chunks and write them into an Arrow IPC stream.
+
+    Caching is best effort: if a chunk can't be written, e.g. its schema differs from
+    the first chunk, the stream is discarded and the remaining chunks are passed
+    through. The stream is discarded as well if the generator is not exhausted.
+
+    Args:
+        chunks (Iterable[pd.DataFrame]): The chunks to write.
+        file (Path): The destination of the stream.
+        memory_map (bool, optional): Write the stream uncompressed. Defaults to False.
+        codec (str, optional): The compression codec `lz4`, `zstd`, `uncompressed` or
+            `auto` to choose the codec from the first chunk. Defaults to None, which
+            uses the pyarrow default.
+        level (int, optional): The compression level for `zstd`. Defaults to None.
+
+    Returns:
+        bool: True if the stream was written, as return value of the generator.
+    """
+
+    import pandas as pd
+    import pyarrow as pa
+
+    import federleicht.feather as feather
+
+    compression.validate(codec, level, memory_map)
+
+    file = Path(file)
+    tmp = feather.temporary(file)
+
+    writer = None
+    schema = None
+    failed = False
+
+    try:
+        for chunk in chunks:
+            if failed is False:
+                try:
+                    if writer is None:
+                        schema, writer = _open(chunk, tmp, memory_map, codec, level)
+
+                    writer.write_batch(
+                        pa.RecordBatch.from_pandas(
+                            chunk,
+                            schema=schema,
+                            preserve_index=True,
+                        )
+                    )
+                except Exception:
+                    failed = True
+
+            yield chunk
+
+        if failed is True:
+            return False
+
+        if writer is None:
+            schema, writer = _open(pd.DataFrame(), tmp, memory_map, codec, level)
+
+        writer.close()
+        writer = None
+
+        os.replace(tmp, file)
+
+        return True
+    finally:
+        if writer is not None:
+            writer.close()
+
+        tmp.delete(missing_ok=True)
+
+
+def _open(chunk, tmp, memory_map, codec, level):
+    """
+    Open the stream with the schema of the first chunk.
+    """
+
+    import pyarrow as pa
+
+    import federleicht.feather as feather
+
+    if memory_map is True:
+        codec = "uncompressed"
+    elif codec == "auto":
+        codec, level = compression.choose(chunk)
+    elif codec is None:
+        codec = compression.default()
+
+    schema = pa.Schema.from_pandas(chunk, preserve_index=True)
+    schema = schema.with_metadata(
+        {
+            **(schema.metadata or {}),
+            feather.METADATA: json.dumps(
+                {
+                    "compression": codec,
+                    "compression_level": level,
+                }
+            ).encode(),
+        }
+    )
+
+    options = pa.ipc.IpcWriteOptions(
+        compression=None if codec == "uncompressed" else pa.Codec(codec, level),
+    )
+
+    return schema, pa.ipc.new_stream(str(tmp), schema, options=options)
+
+
+def read(file: Path, memory_map: bool = False) -> Iterator[pd.DataFrame]:
+    """
+    Open an Arrow IPC stream and return a generator which reads it batch by batch.
+
+    Args:
+        file (Path): The stream to read.
+        memory_map (bool, optional): Memory-map the stream and return chunks with
+            `pyarrow` backed columns. Defaults to False.
+
+    Returns:
+        Iterator[pd.DataFrame]: The chunks in the order they were written.
+
+    Raises:
+        FileNotFoundError: If the stream does not exist, raised before the generator
+            is returned.
+    """
+
+    import pandas as pd
+    import pyarrow as pa
+
+    source = pa.memory_map(str(file)) if memory_map else pa.OSFile(str(file))
+
+    try:
+        reader = pa.ipc.open_stream(source)
+    except BaseException:
+        source.close()
+        raise
+
+    def replay() -> Iterator[pd.DataFrame]:
+        with source:
+            for batch in reader:
+                yield batch.to_pandas(
+                    types_mapper=pd.ArrowDtype if memory_map else None
+                )
+
+    return replay()
+
+
+__all__ = [
+    "SUFFIX",
+    "write",
+    "read",
+]
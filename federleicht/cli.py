@@ -0,0 +1,552 @@
+"""
+Command line interface to administrate a cache directory, run it with
+`python -m federleicht`.
+
+- `stats`: number and size of the cache entries, an age histogram and the totals per
+  decorated function and storage format
+- `ls`: list the cache entries sorted by size, age, hits or name
+- `prune`: delete the cache entries matching age, size and function filters
+- `verify`: detect truncated cache files by their magic bytes
+
+The cache directory is listed with `os.scandir`, which doesn't stat the files. Size,
+age, function and hits of the files recorded in the manifest are read from the
+manifest, only the other files are stated. Files are stated, verified and deleted by a
+thread pool, which hides the latency of network filesystems.
+
+```cmd
+python -m federleicht --cache-dir .pandas_cache stats
+python -m federleicht prune --older-than 30d --function "reports.*" --dry-run
+```
+"""
+
+import argparse
+import fnmatch
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import federleicht.chunks as chunks
+import federleicht.layout as layout
+import federleicht.storage as storage
+from federleicht.config import CACHE
+from federleicht.manifest import Entry, Manifest, connect
+
+SIZES = {"": 1, "K": 2**10, "M": 2**20, "G": 2**30, "T": 2**40}
+"""Binary units of sizes."""
+
+AGES = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+"""Units of ages."""
+
+BUCKETS = (
+    ("< 1 hour", 3600),
+    ("< 1 day", 86400),
+    ("< 1 week", 604800),
+    ("< 30 days", 2592000),
+    (">= 30 days", float("inf")),
+)
+"""Upper bounds of the age histogram of `stats`."""
+
+MAGIC = {
+    "feather": (b"ARROW1", b"ARROW1"),
+    "parquet": (b"PAR1", b"PAR1"),
+    "stream": (b"", b"\xff\xff\xff\xff\x00\x00\x00\x00"),
+}
+"""Leading and trailing bytes of complete cache files by format."""
+
+
+class Listing(NamedTuple):
+    """
+    The cache entries of a cache directory.
+
+    Attributes:
+        entries (List[Entry]): The entries with size, age and hits.
+        paths (Dict[str, str]): The paths of the entries by key.
+        source (str): `manifest` or `scan` if the directory has no manifest.
+    """
+
+    entries: List[Entry]
+    paths: Dict[str, str]
+    source: str
+
+
+def parse_size(size: str) -> int:
+    """
+    Parse a size like `500MB`, `1.5G` or `1024` into bytes.
+    """
+
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)\s*([KMGT]?)I?B?", size.strip().upper())
+
+    if match is None:
+        raise argparse.ArgumentTypeError(f"Invalid size: {size}")
+
+    value, unit = match.groups()
+
+    return int(float(value) * SIZES[unit])
+
+
+def parse_age(age: str) -> float:
+    """
+    Parse an age like `90s`, `12h`, `30d` or `2w` into seconds.
+    """
+
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)\s*([smhdw])", age.strip().lower())
+
+    if match is None:
+        raise argparse.ArgumentTypeError(f"Invalid age: {age}")
+
+    value, unit = match.groups()
+
+    return float(value) * AGES[unit]
+
+
+def format_size(nbytes: float) -> str:
+    """
+    Format bytes with a binary unit, e.g. `1.5 GB`.
+    """
+
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(nbytes) < 1024:
+            return f"{nbytes:.0f} {unit}" if unit == "B" else f"{nbytes:.1f} {unit}"
+
+        nbytes /= 1024
+
+    return f"{nbytes:.1f} TB"
+
+
+def format_age(seconds: float) -> str:
+    """
+    Format an age with its largest unit, e.g. `3d`.
+    """
+
+    for unit, factor in reversed(AGES.items()):
+        if seconds >= factor:
+            return f"{seconds / factor:.0f}{unit}"
+
+    return f"{max(seconds, 0):.0f}s"
+
+
+def listing(cache_dir: str, workers: int = 16, scan: bool = False) -> Listing:
+    """
+    Return the cache files of the cache directory with their manifest entries, files
+    missing in the manifest are stated and have an unknown function. All files are
+    stated if the directory has no manifest or `scan` is True.
+    """
+
+    files = list(layout.scan(cache_dir))
+    recorded = {}
+    source = "scan"
+
+    if scan is False and Manifest.exists(cache_dir):
+        recorded = {entry.key: entry for entry in connect(cache_dir).entries()}
+        source = "manifest"
+
+    unrecorded = [f for f in files if f.name not in recorded]
+
+    with ThreadPoolExecutor(workers) as pool:
+        stats = list(pool.map(os.DirEntry.stat, unrecorded))
+
+    entries = [recorded[f.name] for f in files if f.name in recorded]
+    entries += [
+        Entry(f.name, "", s.st_size, s.st_mtime, s.st_atime, 0)
+        for f, s in zip(unrecorded, stats)
+    ]
+
+    return Listing(entries, {f.name: f.path for f in files}, source)
+
+
+def select(
+    entries: Iterable[Entry],
+    older_than: Optional[float] = None,
+    larger_than: Optional[int] = None,
+    function: Optional[str] = None,
+    now: Optional[float] = None,
+) -> List[Entry]:
+    """
+    Return the entries created more than `older_than` seconds ago, larger than
+    `larger_than` bytes and whose function matches the `fnmatch` pattern `function`.
+    """
+
+    now = time.time() if now is None else now
+
+    return [
+        entry
+        for entry in entries
+        if (older_than is None or now - entry.created > older_than)
+        and (larger_than is None or entry.size > larger_than)
+        and (function is None or fnmatch.fnmatchcase(entry.function, function))
+    ]
+
+
+def kind(key: str) -> str:
+    """
+    Return the storage format of a cache file by its name.
+    """
+
+    if key.endswith(chunks.SUFFIX):
+        return "stream"
+
+    return storage.detect(key).name
+
+
+def delete(file: str) -> int:
+    """
+    Delete a cache file and its attributes file.
+
+    Returns:
+        int: The number of bytes reclaimed.
+    """
+
+    reclaimed = 0
+
+    for path in (file, os.path.splitext(file)[0] + CACHE.attrs):
+        try:
+            size = os.stat(path).st_size
+            os.remove(path)
+        except FileNotFoundError:
+            continue
+
+        reclaimed += size
+
+    return reclaimed
+
+
+def truncated(file: str) -> Optional[str]:
+    """
+    Check if a cache file is truncated by its leading and trailing magic bytes and
+    the footer length of feather files, without reading the file.
+
+    Returns:
+        Optional[str]: The reason why the file is invalid, None if it is complete.
+    """
+
+    head, tail = MAGIC[kind(os.path.basename(file))]
+
+    try:
+        with open(file, "rb") as f:
+            size = f.seek(0, os.SEEK_END)
+
+            if size < len(head) + len(tail):
+                return f"too small: {size} bytes"
+
+            f.seek(0)
+            start = f.read(len(head))
+
+            f.seek(size - len(tail) - 4)
+            footer, end = f.read(4), f.read(len(tail))
+    except OSError as e:
+        return str(e)
+
+    if start != head:
+        return "invalid header"
+
+    if end != tail:
+        return "truncated: missing end of file"
+
+    if head == b"ARROW1" and int.from_bytes(footer, "little", signed=True) > size:
+        return "truncated: invalid footer"
+
+    return None
+
+
+def histogram(entries: Sequence[Entry], now: float) -> List[Tuple[str, int, int]]:
+    """
+    Return the label, the number and the size of the entries per age bucket.
+    """
+
+    counts = [[label, 0, 0] for label, _ in BUCKETS]
+
+    for entry in entries:
+        age = now - entry.created
+
+        for bucket, (_, upper) in zip(counts, BUCKETS):
+            if age < upper:
+                bucket[1] += 1
+                bucket[2] += entry.size
+                break
+
+    return [tuple(bucket) for bucket in counts]
+
+
+def totals(entries: Iterable[Entry], key) -> List[Tuple[str, int, int]]:
+    """
+    Return the number and the size of the entries grouped by `key`, largest first.
+    """
+
+    groups: Dict[str, List[int]] = {}
+
+    for entry in entries:
+        group = groups.setdefault(key(entry), [0, 0])
+        group[0] += 1
+        group[1] += entry.size
+
+    return sorted(
+        ((name, n, size) for name, (n, size) in groups.items()),
+        key=lambda t: t[2],
+        reverse=True,
+    )
+
+
+def table(rows: Iterable[Sequence]) -> None:
+    """
+    Print rows as aligned columns, the first column left aligned.
+    """
+
+    rows = [[str(c) for c in row] for row in rows]
+
+    if not rows:
+        return
+
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+
+    for row in rows:
+        cells = [row[0].ljust(widths[0])]
+        cells += [c.rjust(w) for c, w in zip(row[1:], widths[1:])]
+        print("  ".join(cells).rstrip())
+
+
+def command_stats(options: argparse.Namespace) -> int:
+
+    result = listing(options.cache_dir, options.workers, options.scan)
+    now = time.time()
+
+    print(f"cache directory: {options.cache_dir} ({result.source})")
+    print(f"entries: {len(result.entries):,}")
+    print(f"size: {format_size(sum(e.size for e in result.entries))}")
+
+    print("\nage:")
+    table(
+        (f"  {label}", f"{n:,}", format_size(size))
+        for label, n, size in histogram(result.entries, now)
+    )
+
+    print("\nformats:")
+    table(
+        (f"  {name}", f"{n:,}", format_size(size))
+        for name, n, size in totals(result.entries, lambda e: kind(e.key))
+    )
+
+    print("\nfunctions:")
+    table(
+        (f"  {name or '(unknown)'}", f"{n:,}", format_size(size))
+        for name, n, size in totals(result.entries, lambda e: e.function)
+    )
+
+    return 0
+
+
+def command_ls(options: argparse.Namespace) -> int:
+
+    result = listing(options.cache_dir, options.workers, options.scan)
+    now = time.time()
+
+    order = {
+        "size": lambda e: e.size,
+        "age": lambda e: now - e.created,
+        "hits": lambda e: e.hits,
+        "name": lambda e: e.key,
+    }
+
+    entries = sorted(
+        result.entries,
+        key=order[options.sort],
+        reverse=options.sort != "name",
+    )
+
+    if options.reverse:
+        entries.reverse()
+
+    if options.limit is not None:
+        entries = entries[slice(0, options.limit)]
+
+    table(
+        [("key", "size", "age", "hits", "function")]
+        + [
+            (
+                e.key,
+                format_size(e.size),
+                format_age(now - e.created),
+                e.hits,
+                e.function or "(unknown)",
+            )
+            for e in entries
+        ]
+    )
+
+    return 0
+
+
+def command_prune(options: argparse.Namespace) -> int:
+
+    if (options.older_than, options.larger_than, options.function) == (None,) * 3:
+        print(
+            "prune requires --older-than, --larger-than or --function",
+            file=sys.stderr,
+        )
+        return 2
+
+    result = listing(options.cache_dir, options.workers, options.scan)
+
+    if options.function is not None:
+        if result.source == "scan":
+            print(
+                "prune --function requires the manifest of the cache directory",
+                file=sys.stderr,
+            )
+            return 2
+
+        unknown = sum(1 for e in result.entries if not e.function)
+
+        if unknown:
+            print(
+                f"warning: {unknown:,} entries are missing in the manifest and "
+                "never match --function",
+                file=sys.stderr,
+            )
+
+    victims = select(
+        result.entries,
+        options.older_than,
+        options.larger_than,
+        options.function,
+    )
+
+    if options.dry_run:
+        size = sum(e.size for e in victims)
+        print(f"would delete {len(victims):,} entries, {format_size(size)}")
+        return 0
+
+    with ThreadPoolExecutor(options.workers) as pool:
+        reclaimed = sum(pool.map(delete, (result.paths[e.key] for e in victims)))
+
+    if Manifest.exists(options.cache_dir):
+        connect(options.cache_dir).remove(e.key for e in victims)
+
+    print(f"deleted {len(victims):,} entries, reclaimed {format_size(reclaimed)}")
+
+    return 0
+
+
+def command_verify(options: argparse.Namespace) -> int:
+
+    files = [entry.path for entry in layout.scan(options.cache_dir)]
+
+    with ThreadPoolExecutor(options.workers) as pool:
+        reasons = list(pool.map(truncated, files))
+
+    invalid = [(file, reason) for file, reason in zip(files, reasons) if reason]
+
+    for file, reason in invalid:
+        print(f"{file}: {reason}")
+
+    if options.delete and invalid:
+        with ThreadPoolExecutor(options.workers) as pool:
+            reclaimed = sum(pool.map(delete, (file for file, _ in invalid)))
+
+        if Manifest.exists(options.cache_dir):
+            connect(options.cache_dir).remove(os.path.basename(f) for f, _ in invalid)
+
+        print(f"deleted {len(invalid):,} files, reclaimed {format_size(reclaimed)}")
+
+    print(f"verified {len(files):,} files, {len(invalid):,} invalid")
+
+    return 1 if invalid and not options.delete else 0
+
+
+def parser() -> argparse.ArgumentParser:
+    """
+    Return the argument parser of the command line interface.
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="python -m federleicht",
+        description="Administrate a federleicht cache directory.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=CACHE.dir,
+        help=f"the cache directory, defaults to {CACHE.dir}",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=16,
+        help="threads to stat, verify and delete files, defaults to 16",
+    )
+    parser.add_argument(
+        "--scan",
+        action="store_true",
+        help="scan the cache directory even if it has a manifest",
+    )
+
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    stats = commands.add_parser("stats", help="show size, ages and totals")
+    stats.set_defaults(main=command_stats)
+
+    ls = commands.add_parser("ls", help="list the cache entries")
+    ls.add_argument(
+        "--sort",
+        choices=["size", "age", "hits", "name"],
+        default="age",
+        help="largest, oldest, most hit first or by name, defaults to age",
+    )
+    ls.add_argument("--reverse", action="store_true", help="reverse the order")
+    ls.add_argument("--limit", type=int, help="list at most this many entries")
+    ls.set_defaults(main=command_ls)
+
+    prune = commands.add_parser("prune", help="delete matching cache entries")
+    prune.add_argument(
+        "--older-than",
+        type=parse_age,
+        help="entries created before this age, e.g. 12h, 30d, 2w",
+    )
+    prune.add_argument(
+        "--larger-than",
+        type=parse_size,
+        help="entries larger than this size, e.g. 100MB",
+    )
+    prune.add_argument(
+        "--function",
+        help="entries of functions matching this pattern, e.g. 'reports.*', "
+        "requires the manifest",
+    )
+    prune.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="only report what would be deleted",
+    )
+    prune.set_defaults(main=command_prune)
+
+    verify = commands.add_parser("verify", help="detect truncated cache files")
+    verify.add_argument(
+        "--delete",
+        action="store_true",
+        help="delete the invalid cache files",
+    )
+    verify.set_defaults(main=command_verify)
+
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Run the command line interface.
+
+    Returns:
+        int: The exit code, 1 if `verify` found invalid files.
+    """
+
+    options = parser().parse_args(argv)
+
+    return options.main(options)
+
+
+__all__ = [
+    "main",
+    "parse_size",
+    "parse_age",
+    "truncated",
+]
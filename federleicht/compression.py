@@ -0,0 +1,189 @@
+"""
+Select the compression codec of the feather files.
+
+Feather supports `lz4`, `zstd` with an optional level and `uncompressed` files. Which
+codec loads fastest depends on the data and on the bandwidth of the storage, on a slow
+network share a stronger compression pays off, on a local SSD decompression costs more
+than it saves.
+
+`choose` samples the DataFrame, measures the compressed size and the decompression
+throughput of every candidate codec and picks the codec with the lowest estimated read
+time for the given storage bandwidth.
+"""
+
+from __future__ import annotations
+
+import io
+import time
+from typing import TYPE_CHECKING, List, NamedTuple, Optional, Tuple
+
+from federleicht.config import CACHE
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+CODECS = ("lz4", "zstd", "uncompressed")
+"""Compression codecs supported by feather files."""
+
+CANDIDATES: Tuple[Tuple[str, Optional[int]], ...] = (
+    ("uncompressed", None),
+    ("lz4", None),
+    ("zstd", 1),
+    ("zstd", 3),
+    ("zstd", 9),
+)
+"""Codecs and levels which are compared by `choose`."""
+
+
+class Profile(NamedTuple):
+    """
+    Measured throughput of a codec for a sample of a DataFrame.
+
+    Attributes:
+        codec (str): The compression codec.
+        level (int): The compression level or None for the default level.
+        nbytes (int): Size of the compressed sample in bytes.
+        seconds (float): Time to decompress the sample.
+    """
+
+    codec: str
+    level: Optional[int]
+    nbytes: int
+    seconds: float
+
+    def estimate(self, bandwidth: float) -> float:
+        """
+        Estimate the time in seconds to read and decompress the sample.
+
+        Args:
+            bandwidth (float): The storage bandwidth in bytes per second.
+        """
+
+        return self.nbytes / bandwidth + self.seconds
+
+
+def validate(
+    compression: Optional[str],
+    level: Optional[int] = None,
+    memory_map: bool = False,
+) -> None:
+    """
+    Raise a ValueError if the compression codec or the level is not supported, or if
+    a memory-mapped file should be compressed.
+    """
+
+    if memory_map is True and compression not in (None, "uncompressed"):
+        raise ValueError(f"memory_map requires an uncompressed file: {compression=}")
+
+    if compression is None or compression == "auto":
+        if level is not None:
+            raise ValueError(f"compression_level requires a codec, got {compression=}")
+        return
+
+    if compression not in CODECS:
+        raise ValueError(
+            f"Invalid compression: {compression}. Must be one of {CODECS} or 'auto'."
+        )
+
+    if level is not None and compression != "zstd":
+        raise ValueError(f"compression_level is only supported for zstd: {level}")
+
+
+def default() -> str:
+    """
+    Return the codec used by pyarrow when no compression is specified.
+    """
+
+    import pyarrow as pa
+
+    return "lz4" if pa.Codec.is_available("lz4_frame") else "uncompressed"
+
+
+def profile(
+    df: pd.DataFrame,
+    sample: int = 2**16,
+    candidates: Tuple[Tuple[str, Optional[int]], ...] = CANDIDATES,
+) -> List[Profile]:
+    """
+    Measure the compressed size and decompression time of a sample of the DataFrame
+    for each candidate codec.
+
+    Args:
+        df (pd.DataFrame): The DataFrame, `pyarrow.Table` or `polars.DataFrame` to
+            profile.
+        sample (int, optional): Maximum number of evenly spaced rows in the sample.
+        candidates (Tuple[Tuple[str, Optional[int]], ...], optional): Codecs and levels
+            to compare. Defaults to `CANDIDATES`.
+
+    Returns:
+        List[Profile]: The measured profile for each available codec.
+    """
+
+    import numpy as np
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    import federleicht.tables as tables
+
+    step = max(1, len(df) // sample)
+
+    if isinstance(df, pd.DataFrame):
+        table = pa.Table.from_pandas(df.iloc[::step], preserve_index=None)
+    else:
+        table = tables.to_arrow(df).take(np.arange(0, len(df), step))
+
+    profiles = []
+
+    for codec, level in candidates:
+        if codec != "uncompressed" and not pa.Codec.is_available(codec):
+            continue
+
+        buffer = io.BytesIO()
+        feather.write_feather(
+            table,
+            buffer,
+            compression=codec,
+            compression_level=level,
+        )
+
+        data = buffer.getvalue()
+
+        start = time.perf_counter()
+        feather.read_table(pa.BufferReader(data))
+        seconds = time.perf_counter() - start
+
+        profiles.append(Profile(codec, level, len(data), seconds))
+
+    return profiles
+
+
+def choose(
+    df: pd.DataFrame,
+    bandwidth: float = CACHE.bandwidth,
+) -> Tuple[str, Optional[int]]:
+    """
+    Choose the codec which minimises the estimated read time of the DataFrame.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to write.
+        bandwidth (float, optional): The storage bandwidth in bytes per second.
+            Defaults to CACHE.bandwidth.
+
+    Returns:
+        Tuple[str, Optional[int]]: The codec and the compression level.
+    """
+
+    if len(df) == 0:
+        return default(), None
+
+    best = min(profile(df), key=lambda p: p.estimate(bandwidth))
+
+    return best.codec, best.level
+
+
+__all__ = [
+    "CODECS",
+    "choose",
+    "profile",
+]
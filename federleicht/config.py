@@ -11,6 +11,10 @@ CacheConfig = namedtuple(
         "digest",
         "expires",
         "attrs",
+        "content",
+        "bandwidth",
+        "pending",
+        "manifest",
     ],
 )
 
@@ -20,6 +24,10 @@ CACHE = CacheConfig(
     digest=16,
     expires="seconds",
     attrs=".json",
+    content="content.json",
+    bandwidth=100 * 2**20,
+    pending=2**30,
+    manifest="manifest.sqlite",
 )
 """
 CACHE configuration.
@@ -30,4 +38,10 @@ Attributes:
     digest (int): The digest size for hashing.
     expires (str): The expiration time unit for the cache.
     attrs (str): The file extension for attribute storage.
+    content (str): The file name of the memo for content fingerprints of files.
+    bandwidth (int): The assumed storage bandwidth in bytes per second to choose a
+        compression codec automatically.
+    pending (int): The memory budget in bytes for DataFrames waiting to be written in
+        the background.
+    manifest (str): The file name of the SQLite manifest in the cache directory.
 """
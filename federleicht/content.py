@@ -0,0 +1,156 @@
+"""
+Content fingerprints for `os.PathLike` arguments.
+
+By default a path argument is hashed by its resolved path, size and modification time,
+so a file which is copied again with identical bytes invalidates the cache. With a
+content fingerprint the bytes of the file are hashed instead.
+
+To avoid reading unchanged files over and over, `ContentMemo` persists a small memo
+from `(device, inode, size, mtime_ns)` to the digest of the file in the cache directory.
+Only files which are new or modified are read again.
+"""
+
+import json
+import os
+import threading
+from typing import Any, Callable, Dict
+
+from pathlibutil import Path
+
+from federleicht.config import CACHE
+
+
+def digest(file: Path, chunksize: int = 2**24) -> str:
+    """
+    Return the hexdigest of the content of a file, which is read with large sequential
+    reads into a reused buffer.
+
+    Args:
+        file (Path): The file to hash.
+        chunksize (int, optional): The size of each read in bytes. Defaults to 16 MiB.
+
+    Returns:
+        str: The hexdigest of the file content.
+    """
+
+    import federleicht.args as args
+
+    hasher = args.hash()
+    buffer = memoryview(bytearray(chunksize))
+
+    with open(file, "rb", buffering=0) as f:
+        while True:
+            size = f.readinto(buffer)
+
+            if not size:
+                break
+
+            hasher.update(buffer[:size])
+
+    return hasher.hexdigest()
+
+
+class ContentMemo:
+    """
+    Persistent memo of file content digests stored as JSON file in the cache directory.
+
+    Args:
+        cache_dir (str): The directory where the memo is stored.
+        max_entries (int, optional): Maximum number of memoized files, the oldest
+            entries are dropped first. Defaults to 10000.
+    """
+
+    def __init__(self, cache_dir: str = CACHE.dir, max_entries: int = 10000) -> None:
+
+        self.file = Path(cache_dir).joinpath(CACHE.content)
+        self.max_entries = max_entries
+
+        self._memo: Dict[str, str] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(stat: os.stat_result) -> str:
+        """
+        Return the memo key of a file from its stat result.
+        """
+
+        return f"{stat.st_dev}:{stat.st_ino}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    def load(self) -> Dict[str, str]:
+        """
+        Load the memo from the cache directory, a missing or corrupt memo is empty.
+        """
+
+        try:
+            memo = json.loads(self.file.read_text())
+        except (FileNotFoundError, ValueError):
+            memo = {}
+
+        return memo if isinstance(memo, dict) else {}
+
+    def save(self) -> None:
+        """
+        Write the memo atomically into the cache directory.
+        """
+
+        self.file.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp = self.file.with_name(f"{self.file.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(self._memo))
+
+        os.replace(tmp, self.file)
+
+    def digest(self, file: os.PathLike) -> str:
+        """
+        Return the digest of the file content, from the memo if the file is unchanged.
+
+        Args:
+            file (os.PathLike): The file to fingerprint.
+
+        Returns:
+            str: The hexdigest of the file content.
+        """
+
+        key = self.key(os.stat(file))
+
+        with self._lock:
+            if self._memo is None:
+                self._memo = self.load()
+
+            try:
+                return self._memo[key]
+            except KeyError:
+                pass
+
+        result = digest(file)
+
+        with self._lock:
+            self._memo = {**self.load(), **self._memo, key: result}
+
+            stale = len(self._memo) - self.max_entries
+
+            for outdated in list(self._memo)[:stale]:
+                del self._memo[outdated]
+
+            self.save()
+
+        return result
+
+    def encoder(self) -> Callable[[Any], str]:
+        """
+        Return a JSON encoder for `federleicht.args` which fingerprints files by their
+        memoized content digest.
+        """
+
+        def encoder(obj: Any) -> str:
+            import federleicht.args as args
+
+            return args.json_encoder(obj, content=self.digest)
+
+        return encoder
+
+
+__all__ = [
+    "ContentMemo",
+    "digest",
+]
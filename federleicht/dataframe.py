@@ -1,13 +1,47 @@
+from __future__ import annotations
+
+import importlib
+import inspect
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from functools import wraps
-from typing import Any, Callable, Dict, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
-import pandas as pd
 from pathlibutil import Path
 
-import federleicht.attrs as attrs
+import federleicht.chunks as chunks
+import federleicht.compression
 import federleicht.hash as hash
-from federleicht.cache import delete_cache
+import federleicht.layout as layout
+import federleicht.storage
+from federleicht.cache import delete_cache, evict_cache
 from federleicht.config import CACHE
+from federleicht.content import ContentMemo
+from federleicht.lock import SingleFlight
+from federleicht.manifest import POLICIES, connect
+from federleicht.memory import MemoryCache, copy, nbytes
+from federleicht.prefetch import Progress, readahead, submit
+from federleicht.stats import Event, Stats
+from federleicht.writer import WRITER
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow.compute as pc
+
+EXECUTORS = ("thread", "process")
+"""Executors to compute the misses of `map`."""
 
 
 def is_expired(file: Path, expires: Union[int, Dict[str, Any]]) -> bool:
@@ -43,6 +77,56 @@ def is_expired(file: Path, expires: Union[int, Dict[str, Any]]) -> bool:
     return file.is_expired(**timedelta)
 
 
+def size(cache: Path) -> int:
+    """Return the size of a cache file including its optional attributes file."""
+
+    try:
+        attrs_size = cache.with_suffix(CACHE.attrs).stat().st_size
+    except FileNotFoundError:
+        attrs_size = 0
+
+    return cache.stat().st_size + attrs_size
+
+
+def unpack(item: Any) -> Tuple[Tuple[Any, ...], Dict[str, Any]]:
+    """
+    Return the positional and keyword arguments of an item of `map`, a tuple holds the
+    positional arguments, a dict the keyword arguments, anything else is the only
+    positional argument.
+    """
+
+    if isinstance(item, tuple):
+        return item, {}
+
+    if isinstance(item, dict):
+        return (), item
+
+    return (item,), {}
+
+
+def compute(
+    module: str,
+    qualname: str,
+    args: Tuple[Any, ...],
+    kwargs: Dict,
+) -> Tuple[Any, float]:
+    """
+    Call a module-level function in a worker process of `map` and return the result
+    and the seconds it took. If the function is decorated, the undecorated function is
+    called, the result is stored by the caller.
+    """
+
+    obj = importlib.import_module(module)
+
+    for name in qualname.split("."):
+        obj = getattr(obj, name)
+
+    start = time.perf_counter()
+    result = getattr(obj, "__wrapped__", obj)(*args, **kwargs)
+
+    return result, time.perf_counter() - start
+
+
 def cache_dataframe(
     func: Callable = None,
     *,
@@ -50,10 +134,36 @@ def cache_dataframe(
     expires: Union[int, Dict[str, int]] = None,
     cache_attrs: bool = False,
     pepper: Callable[[], bytes] = None,
+    memory_map: bool = False,
+    memory: Union[int, MemoryCache] = None,
+    content_hash: bool = False,
+    compression: str = None,
+    compression_level: int = None,
+    write_behind: bool = False,
+    single_flight: bool = False,
+    lock_timeout: float = None,
+    manifest: bool = False,
+    max_bytes: int = None,
+    eviction: str = "lru",
+    sharded: bool = False,
+    format: str = "feather",
+    chunksize: int = None,
+    on_event: Callable[[Event], None] = None,
 ):
     """
     Decorator to cache the result of a function that returns a pandas DataFrame.
 
+    Functions returning a `pyarrow.Table` or a `polars.DataFrame` are cached without
+    converting the result to pandas, a hit returns the same type.
+
+    Coroutine functions are supported as well, hashing the arguments, reading and
+    writing the cache files is run in the default executor of the event loop to keep
+    it responsive.
+
+    Generator functions which yield DataFrame chunks are cached as Arrow IPC stream,
+    which is written while the chunks pass through to the caller and replayed chunk
+    by chunk on a hit. The stream is only kept if the generator is exhausted.
+
     To reliable cache a DataFrame the decorated function must always return the same
     DataFrame for the same arguments!
     All arguments of the decorated function must be pickleable!
@@ -78,12 +188,72 @@ def cache_dataframe(
             all be serializable. Defaults to False.
         pepper (callable, optional): A function that returns a salt to spice up the
             hash of the cache. Defaults to None.
+        memory_map (bool, optional): Store the cache uncompressed and memory-map it on
+            loading. The returned DataFrame has `pyarrow` backed columns which are
+            paged in lazily and shared between processes. Defaults to False.
+        memory (Union[int, MemoryCache], optional): Byte budget of an in-process LRU
+            cache in front of the cache directory, or a `MemoryCache` to share between
+            decorated functions. Cached DataFrames are returned as copies, so callers
+            can't modify the cached entries. Defaults to None.
+        content_hash (bool, optional): Fingerprint `os.PathLike` arguments by their
+            content instead of their size and modification time. Digests of unchanged
+            files are memoized in the cache directory. Defaults to False.
+        compression (str, optional): Compression codec of the feather files, one of
+            `lz4`, `zstd`, `uncompressed` or `auto` to choose the codec with the
+            lowest estimated read time from a sample of each DataFrame. The codec is
+            stored in the metadata of the file. Defaults to None, which uses `lz4`.
+        compression_level (int, optional): Compression level for `zstd`.
+            Defaults to None.
+        write_behind (bool, optional): Return the DataFrame immediately and write the
+            cache file in a background thread. Use `federleicht.flush` to wait for
+            pending writes. Defaults to False.
+        single_flight (bool, optional): On a miss only one thread or process computes
+            the DataFrame, concurrent callers with the same arguments wait on a lock
+            file next to the cache file and read the finished cache file.
+            Defaults to False.
+        lock_timeout (float, optional): Maximum number of seconds to wait for the
+            single-flight lock, afterwards the DataFrame is computed without the lock.
+            Defaults to None, which waits forever.
+        manifest (bool, optional): Record size, creation time, last access time and
+            hits of each cache entry in a SQLite manifest in the cache directory,
+            which `federleicht.clear_cache` queries instead of scanning the
+            directory. Defaults to False.
+        max_bytes (int, optional): Size budget of the cache directory in bytes, which
+            requires the manifest. When a new cache file exceeds the budget the least
+            recently (`lru`) or least frequently (`lfu`) used cache files are evicted.
+            Defaults to None.
+        eviction (str, optional): The eviction policy `lru` or `lfu`.
+            Defaults to "lru".
+        sharded (bool, optional): Store the cache files in nested directories named
+            after the prefix of their hash, e.g. `cache_dir/ab/cd/abcd...`, which keeps
+            directory lookups fast with many entries. Use `federleicht.migrate_cache`
+            to move existing cache files. Defaults to False.
+        format (str, optional): Storage format of the cache files, `feather` or
+            `parquet`. Parquet files are dictionary encoded with row group statistics,
+            smaller on slow shared storage but slower to decode. The format is part of
+            the hash, so both formats coexist in one cache directory.
+            Defaults to "feather".
+        chunksize (int, optional): Convert and write the DataFrame in record batches
+            of at most `chunksize` rows instead of converting it at once, which bounds
+            the additional memory of a miss by the size of a batch. Defaults to None.
+        on_event (Callable[[Event], None], optional): Called with every hit, miss,
+            expiration, error and timed stage of a call, see `federleicht.stats`.
+            Defaults to None.
 
     Returns:
-        callable: The wrapped function with caching functionality.
+        callable: The wrapped function with caching functionality. Its `columns` and
+            `filter` methods return the wrapped function reading only a subset of the
+            columns or rows, they can be chained. Functions which are neither
+            coroutine nor generator functions have a `map` method to call them for
+            many arguments, computing the misses in parallel. Its `prefetch` method
+            warms up the cache for many arguments in the background and its
+            `cache_info` method returns the statistics of the function.
 
     Raises:
         TypeError: If the `expires` argument is not an int or dict.
+        ValueError: If the compression is not supported or combined with `memory_map`,
+            the eviction policy or the format is unknown, or the chunksize is not
+            positive.
 
     Example:
         ```python
@@ -100,34 +270,627 @@ def cache_dataframe(
             cache_dir=cache_dir,
             cache_attrs=cache_attrs,
             pepper=pepper,
+            memory_map=memory_map,
+            memory=memory,
+            content_hash=content_hash,
+            compression=compression,
+            compression_level=compression_level,
+            write_behind=write_behind,
+            single_flight=single_flight,
+            lock_timeout=lock_timeout,
+            manifest=manifest,
+            max_bytes=max_bytes,
+            eviction=eviction,
+            sharded=sharded,
+            format=format,
+            chunksize=chunksize,
+            on_event=on_event,
+        )
+
+    federleicht.compression.validate(compression, compression_level, memory_map)
+
+    storage = federleicht.storage.get(format)
+
+    if memory_map is True and storage.name != "feather":
+        raise ValueError(f"memory_map requires format='feather', got {format=}")
+
+    if chunksize is not None and chunksize < 1:
+        raise ValueError(f"chunksize must be positive: {chunksize}")
+
+    generator = inspect.isgeneratorfunction(func)
+    suffix = chunks.SUFFIX if generator else storage.suffix
+
+    if generator and (
+        memory is not None
+        or cache_attrs
+        or write_behind
+        or single_flight
+        or storage.name != "feather"
+    ):
+        raise ValueError(
+            "Generator functions don't support memory, cache_attrs, write_behind, "
+            "single_flight or other formats than feather."
         )
 
-    @wraps(func)
-    def wrapper(*args, **kwargs):
+    if isinstance(memory, int):
+        memory = MemoryCache(memory)
+
+    encoder = ContentMemo(cache_dir).encoder() if content_hash is True else None
+    if eviction not in POLICIES:
+        raise ValueError(f"Invalid eviction: {eviction}. Must be lru or lfu.")
+
+    index = connect(cache_dir) if manifest is True or max_bytes is not None else None
+    function = f"{func.__module__}.{func.__qualname__}"
+    stats = Stats(function, on_event)
+
+    def locate(args, kwargs) -> Tuple[str, Path]:
+        """hash the arguments and return the lock and the path of the cache file."""
+
+        # feather keys are unchanged, other formats are part of the hash
+        if storage.name == "feather":
+            arguments = (args, kwargs)
+        else:
+            arguments = (args, kwargs, storage.name)
 
-        lock: str = hash.function(func, (args, kwargs), pepper)
-        cache: Path = Path(cache_dir).joinpath(lock)
+        start = time.perf_counter()
+        lock: str = hash.function(func, arguments, pepper, encoder)
+        stats.record("hash", time.perf_counter() - start)
+
+        return lock, layout.path(cache_dir, lock + suffix, sharded)
+
+    def load(
+        lock: str,
+        cache: Path,
+        columns: Sequence[str] = None,
+        filter: pc.Expression = None,
+    ) -> Optional[pd.DataFrame]:
+        """load the DataFrame from memory or from the cache file, None on a miss."""
+
+        import federleicht.feather as feather
+        import federleicht.tables as tables
+
+        if memory is not None:
+            start = time.perf_counter()
+            df = memory.get(lock, expires)
+
+            if df is not None:
+                df = tables.mark(df, cache)
+                stats.record("read", time.perf_counter() - start)
+                stats.record("hit")
+
+                if index is not None:
+                    index.hit(cache.name)
+
+                return feather.select(df, columns, filter)
 
         try:
             if is_expired(cache, expires):
                 delete_cache(cache)
-                raise FileNotFoundError
+                stats.record("expired")
+                return None
 
-            df = pd.read_feather(cache)
-            df.attrs["from_cache"] = cache
+            start = time.perf_counter()
+            df = storage.read(cache, memory_map, columns, filter)
+            stat = cache.stat()
+        except FileNotFoundError:
+            return None
+        except Exception:
+            stats.record("error")
+            raise
 
-            if cache_attrs is True:
+        stats.record("read", time.perf_counter() - start, stat.st_size)
+        stats.record("hit")
+
+        df = tables.mark(df, cache)
+
+        if cache_attrs is True and tables.kind(df) == "pandas":
+            import federleicht.attrs as attrs
+
+            try:
                 df = attrs.restore(df, cache)
+            except ValueError:
+                # an invalid attributes file is recomputed like a miss
+                return None
 
-        except FileNotFoundError:
-            df: pd.DataFrame = func(*args, **kwargs)
+        if memory is not None and columns is None and filter is None:
+            memory.put(lock, df, stat.st_mtime)
+
+        if index is not None:
+            index.hit(cache.name)
+
+        return df
+
+    def acquire(cache: Path, timeout: float = lock_timeout) -> Optional[SingleFlight]:
+        """lock the cache file for single-flight, None if disabled or timed out."""
+
+        if single_flight is not True:
+            return None
+
+        flight = SingleFlight(cache, timeout)
+
+        return flight if flight.acquire() else None
+
+    def write(cache: Path, df: pd.DataFrame, flight: SingleFlight = None) -> None:
+        """write the DataFrame and its attributes into the cache file."""
+
+        try:
+            start = time.perf_counter()
 
             cache.parent.mkdir(parents=True, exist_ok=True)
-            df.to_feather(cache)
 
+            # the attributes are in place before the cache file is published
             if cache_attrs is True:
+                import federleicht.attrs as attrs
+
                 attrs.save(df, cache)
 
+            storage.write(
+                df, cache, memory_map, compression, compression_level, chunksize
+            )
+
+            nbytes = size(cache)
+            stats.record("write", time.perf_counter() - start, nbytes)
+
+            if index is not None:
+                index.add(cache.name, function, nbytes)
+
+            if max_bytes is not None:
+                evict_cache(cache_dir, max_bytes, eviction, keep=cache.name)
+        except Exception:
+            stats.record("error")
+            raise
+        finally:
+            if flight is not None:
+                flight.release()
+
+    def store(
+        lock: str,
+        cache: Path,
+        df: pd.DataFrame,
+        flight: SingleFlight = None,
+    ) -> pd.DataFrame:
+        """store the DataFrame in memory and write it now or in the background."""
+
+        if memory is not None:
+            memory.put(lock, df)
+
+        if write_behind is True:
+            snapshot = copy(df)
+            WRITER.submit(nbytes(snapshot), write, cache, snapshot, flight)
+        else:
+            write(cache, df, flight)
+
+        return df
+
+    def evaluate(args, kwargs) -> Any:
+        """call the function on a miss."""
+
+        stats.record("miss")
+        start = time.perf_counter()
+
+        try:
+            df = func(*args, **kwargs)
+        except Exception:
+            stats.record("error")
+            raise
+
+        stats.record("compute", time.perf_counter() - start)
+
+        return df
+
+    async def evaluate_async(args, kwargs) -> Any:
+        """await the coroutine function on a miss."""
+
+        stats.record("miss")
+        start = time.perf_counter()
+
+        try:
+            df = await func(*args, **kwargs)
+        except Exception:
+            stats.record("error")
+            raise
+
+        stats.record("compute", time.perf_counter() - start)
+
         return df
 
-    return wrapper
+    if generator is True:
+
+        def replay(cache: Path) -> Optional[Iterator[pd.DataFrame]]:
+            """open the cached chunks of a generator function, None on a miss."""
+
+            try:
+                if is_expired(cache, expires):
+                    delete_cache(cache)
+                    stats.record("expired")
+                    return None
+
+                start = time.perf_counter()
+                it = chunks.read(cache, memory_map)
+            except FileNotFoundError:
+                return None
+
+            stats.record("read", time.perf_counter() - start)
+            stats.record("hit")
+
+            if index is not None:
+                index.hit(cache.name)
+
+            return it
+
+        def record(cache: Path, it: Iterator[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+            """pass the chunks through and write them into the cache file."""
+
+            stats.record("miss")
+            start = time.perf_counter()
+
+            cache.parent.mkdir(parents=True, exist_ok=True)
+
+            written = yield from chunks.write(
+                it, cache, memory_map, compression, compression_level
+            )
+
+            if written is True:
+                # chunks are computed while they are written
+                nbytes = size(cache)
+                stats.record("write", time.perf_counter() - start, nbytes)
+
+                if index is not None:
+                    index.add(cache.name, function, nbytes)
+
+                if max_bytes is not None:
+                    evict_cache(cache_dir, max_bytes, eviction, keep=cache.name)
+
+        def call(args, kwargs, columns=None, filter=None):
+
+            import federleicht.feather as feather
+
+            lock, cache = locate(args, kwargs)
+            it = replay(cache)
+            hit = it is not None
+
+            if hit is False:
+                it = record(cache, func(*args, **kwargs))
+
+            try:
+                for chunk in it:
+                    if hit is True:
+                        chunk.attrs["from_cache"] = cache
+
+                    yield feather.select(chunk, columns, filter)
+            finally:
+                it.close()
+
+        def fill(lock, cache, args, kwargs):
+            """compute the chunks of a miss and write them into the cache file."""
+
+            for _ in record(cache, func(*args, **kwargs)):
+                pass
+
+        def wrap(columns=None, filter=None):
+            """bind the read options to a generator with the signature of func."""
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                yield from call(args, kwargs, columns, filter)
+
+            return wrapper
+
+    elif inspect.iscoroutinefunction(func):
+
+        # callers of coroutine functions have imported asyncio already
+        import asyncio
+
+        async def acquire_async(cache: Path) -> Optional[SingleFlight]:
+            """poll the single-flight lock without blocking threads of the executor."""
+
+            if single_flight is not True:
+                return None
+
+            loop = asyncio.get_running_loop()
+            deadline = None if lock_timeout is None else loop.time() + lock_timeout
+            delay = 0.001
+
+            while True:
+                flight = await loop.run_in_executor(None, acquire, cache, 0)
+
+                if flight is not None:
+                    return flight
+
+                if deadline is not None and loop.time() >= deadline:
+                    return None
+
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 0.1)
+
+        async def call(args, kwargs, columns=None, filter=None):
+
+            import federleicht.feather as feather
+
+            loop = asyncio.get_running_loop()
+
+            lock, cache = await loop.run_in_executor(None, locate, args, kwargs)
+            df = await loop.run_in_executor(None, load, lock, cache, columns, filter)
+
+            if df is not None:
+                return df
+
+            flight = await acquire_async(cache)
+
+            try:
+                if single_flight is True:
+                    df = await loop.run_in_executor(
+                        None, load, lock, cache, columns, filter
+                    )
+
+                if df is None:
+                    df = await evaluate_async(args, kwargs)
+                    await loop.run_in_executor(None, store, lock, cache, df, flight)
+                    flight = None
+
+                    df = feather.select(df, columns, filter)
+            finally:
+                if flight is not None:
+                    flight.release()
+
+            return df
+
+        def fill(lock, cache, args, kwargs):
+            """compute a miss in a new event loop of the calling thread."""
+
+            asyncio.run(call(args, kwargs))
+
+        def wrap(columns=None, filter=None):
+            """bind the read options to an async function with the signature of func."""
+
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                return await call(args, kwargs, columns, filter)
+
+            return wrapper
+
+    else:
+
+        def call(args, kwargs, columns=None, filter=None):
+
+            lock, cache = locate(args, kwargs)
+            df = load(lock, cache, columns, filter)
+
+            if df is not None:
+                return df
+
+            return miss(lock, cache, args, kwargs, columns, filter)
+
+        def miss(lock, cache, args, kwargs, columns=None, filter=None):
+            """compute, store and return the result of a miss."""
+
+            import federleicht.feather as feather
+
+            df = None
+            flight = acquire(cache)
+
+            try:
+                if single_flight is True:
+                    df = load(lock, cache, columns, filter)
+
+                if df is None:
+                    df = store(lock, cache, evaluate(args, kwargs), flight)
+                    flight = None
+
+                    df = feather.select(df, columns, filter)
+            finally:
+                if flight is not None:
+                    flight.release()
+
+            return df
+
+        fill = miss
+
+        def batch(iterable, max_workers, executor, concat, columns=None, filter=None):
+            """load the hits and compute the misses of many calls in parallel."""
+
+            import federleicht.feather as feather
+            import federleicht.tables as tables
+
+            if executor not in EXECUTORS:
+                raise ValueError(
+                    f"Invalid executor: {executor}. Must be one of {EXECUTORS}."
+                )
+
+            if executor == "process" and "<locals>" in func.__qualname__:
+                raise ValueError(
+                    f"executor='process' requires a module-level function, "
+                    f"got {func.__qualname__}."
+                )
+
+            def finish(key: Tuple[str, Path], df: Any, seconds: float) -> Any:
+                """store the result computed by a worker process."""
+
+                stats.record("miss")
+                stats.record("compute", seconds)
+
+                return feather.select(store(*key, df), columns, filter)
+
+            calls = [unpack(item) for item in iterable]
+            keys = [locate(args, kwargs) for args, kwargs in calls]
+
+            with ThreadPoolExecutor(max_workers) as threads:
+                results = list(
+                    threads.map(lambda key: load(*key, columns, filter), keys)
+                )
+
+                # calls with the same arguments are computed only once
+                misses: Dict[str, List[int]] = {}
+
+                for i, df in enumerate(results):
+                    if df is None:
+                        misses.setdefault(keys[i][0], []).append(i)
+
+                if executor == "thread":
+                    futures = {
+                        lock: threads.submit(
+                            miss, *keys[first], *calls[first], columns, filter
+                        )
+                        for lock, (first, *_) in misses.items()
+                    }
+                else:
+                    with ProcessPoolExecutor(max_workers) as processes:
+                        computed = {
+                            processes.submit(
+                                compute,
+                                func.__module__,
+                                func.__qualname__,
+                                *calls[first],
+                            ): lock
+                            for lock, (first, *_) in misses.items()
+                        }
+
+                        # results are written while other misses are computed
+                        futures = {}
+
+                        for future in as_completed(computed):
+                            lock = computed[future]
+                            futures[lock] = threads.submit(
+                                finish, keys[misses[lock][0]], *future.result()
+                            )
+
+                for lock, indices in misses.items():
+                    for i in indices:
+                        results[i] = futures[lock].result()
+
+            if concat is True:
+                return tables.concat(results)
+
+            return results
+
+        def wrap(columns=None, filter=None):
+            """bind the read options to a function with the signature of func."""
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                return call(args, kwargs, columns, filter)
+
+            def mapping(
+                iterable: Iterable[Any],
+                max_workers: int = None,
+                executor: str = "thread",
+                concat: bool = False,
+            ):
+                """
+                Call the decorated function for each item of the iterable. All keys are
+                computed first, the hits are loaded by a thread pool and only the misses
+                are computed in a thread or process pool.
+
+                Args:
+                    iterable (Iterable[Any]): The arguments of each call, a tuple of
+                        positional arguments, a dict of keyword arguments or a single
+                        argument.
+                    max_workers (int, optional): Maximum number of threads and
+                        processes. Defaults to None, which uses the default of
+                        `concurrent.futures`.
+                    executor (str, optional): Compute the misses in a `thread` or
+                        `process` pool. Processes require a module-level function
+                        and pickleable arguments and results. Defaults to "thread".
+                    concat (bool, optional): Concatenate the results instead of
+                        returning a list. Defaults to False.
+
+                Returns:
+                    The results in the order of the iterable, or their concatenation.
+
+                Raises:
+                    ValueError: If the executor is unknown or processes are used with
+                        a function which is not defined at module level.
+
+                Example:
+                    ```python
+                    frames = load.map([("A", 2024), ("B", 2024)], executor="process")
+                    ```
+                """
+
+                return batch(iterable, max_workers, executor, concat, columns, filter)
+
+            wrapper.map = mapping
+
+            return wrapper
+
+    def preload(item: Any) -> bool:
+        """warm up the entry of one call of `prefetch`, True if it was cached."""
+
+        args, kwargs = unpack(item)
+        lock, cache = locate(args, kwargs)
+
+        if memory is not None:
+            if load(lock, cache) is not None:
+                return True
+        else:
+            try:
+                if not is_expired(cache, expires):
+                    readahead(cache)
+                    return True
+            except FileNotFoundError:
+                pass
+
+        fill(lock, cache, args, kwargs)
+
+        return False
+
+    def bind(columns=None, filter=None) -> Callable:
+        """the decorated function with read options and methods to refine them."""
+
+        wrapper = wrap(columns, filter)
+
+        def projection(*names: str) -> Callable:
+            """
+            Return the decorated function which reads only the columns and the index
+            of the cached DataFrame. The cache file always holds the full DataFrame.
+
+            Example:
+                ```python
+                df = create_dataframe.columns("a", "b")(*args, **kwargs)
+                ```
+            """
+
+            return bind(names, filter)
+
+        def selection(expression: pc.Expression) -> Callable:
+            """
+            Return the decorated function which reads only the rows of the cached
+            DataFrame matching a `pyarrow.compute` expression. Multiple filters are
+            combined with `&`. The cache file always holds the full DataFrame.
+
+            Example:
+                ```python
+                df = create_dataframe.filter(pc.field("status") == "ok")(*args)
+                ```
+            """
+
+            return bind(columns, expression if filter is None else filter & expression)
+
+        def prefetch(iterable: Iterable[Any], max_workers: int = None) -> Progress:
+            """
+            Warm up the cache for the items of `map` in a background thread pool.
+            Missing and expired entries are computed, existing cache files are read
+            into the page cache or loaded into the memory tier.
+
+            Returns:
+                Progress: Handle reporting the progress of the warm-up.
+
+            Example:
+                ```python
+                progress = create_dataframe.prefetch([("A", 2024), ("B", 2024)])
+                progress.wait()
+                ```
+            """
+
+            return submit(preload, iterable, max_workers)
+
+        wrapper.columns = projection
+        wrapper.filter = selection
+        wrapper.prefetch = prefetch
+        wrapper.cache_info = stats.info
+        wrapper.stats = stats
+        wrapper.memory = memory
+
+        return wrapper
+
+    return bind()
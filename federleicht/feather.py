@@ -0,0 +1,352 @@
+"""
+Read and write `pandas.DataFrame` objects as feather files.
+
+With `memory_map=True` the file is written uncompressed and opened as memory-map on
+reading. The columns of the returned DataFrame are backed by `pyarrow` buffers which
+reference the mapped file, so nothing is copied into the process memory and all
+processes reading the same file share the operating system page cache.
+
+With `columns` only the requested columns and the index are read and decoded, the
+other columns of the file are skipped. A `filter` expression of `pyarrow.compute` is
+applied while the record batches of the file are scanned with `pyarrow.dataset`, so
+rows which don't match are never converted to pandas.
+
+The compression codec is stored in the schema metadata of the feather file and can be
+inspected with `metadata`.
+
+Files are written into a temporary file and atomically renamed, so readers never see
+a partially written feather file.
+
+A `pyarrow.Table` or `polars.DataFrame` is written as it is instead of a DataFrame and
+`read` returns the same type, see `federleicht.tables`.
+"""
+
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.feather as feather
+from pathlibutil import Path
+
+import federleicht.compression as compression
+import federleicht.tables as tables
+
+METADATA = b"federleicht"
+"""Key of the federleicht metadata in the schema of the feather file."""
+
+ROW = "__federleicht_row__"
+"""Name of the temporary column with the row numbers used by `select`."""
+
+
+def write(
+    df: pd.DataFrame,
+    file: Path,
+    memory_map: bool = False,
+    codec: Optional[str] = None,
+    level: Optional[int] = None,
+    chunksize: Optional[int] = None,
+) -> Path:
+    """
+    Write the DataFrame to a feather file.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to write.
+        file (Path): The destination of the feather file.
+        memory_map (bool, optional): Write the file uncompressed, which is required to
+            memory-map the file without copying on reading. Defaults to False.
+        codec (str, optional): The compression codec `lz4`, `zstd`, `uncompressed` or
+            `auto` to choose the codec with `federleicht.compression.choose`.
+            Defaults to None, which uses the pyarrow default.
+        level (int, optional): The compression level for `zstd`. Defaults to None.
+        chunksize (int, optional): Convert and write the DataFrame in record batches
+            of at most `chunksize` rows, which bounds the memory of the conversion to
+            a single batch. Defaults to None, which converts the whole DataFrame.
+
+    Returns:
+        Path: The path to the feather file.
+
+    Raises:
+        ValueError: If the codec is not supported or the file should be memory-mapped
+            but compressed.
+    """
+
+    compression.validate(codec, level, memory_map)
+
+    if memory_map is True:
+        codec = "uncompressed"
+    elif codec == "auto":
+        codec, level = compression.choose(df)
+    elif codec is None:
+        codec = compression.default()
+
+    if chunksize is not None:
+        return atomic(file, lambda tmp: stream(df, tmp, codec, level, chunksize))
+
+    table = to_arrow(df, compression=codec, compression_level=level)
+
+    return atomic(
+        file,
+        lambda tmp: feather.write_feather(
+            table,
+            tmp,
+            compression=codec,
+            compression_level=level,
+        ),
+    )
+
+
+def stream(
+    df: pd.DataFrame,
+    file: Path,
+    codec: str,
+    level: Optional[int],
+    chunksize: int,
+) -> None:
+    """
+    Write the DataFrame as Arrow IPC file, which is a feather file, one record batch
+    of `chunksize` rows after the other.
+    """
+
+    schema, it = batches(df, chunksize, compression=codec, compression_level=level)
+
+    options = pa.ipc.IpcWriteOptions(
+        compression=None if codec == "uncompressed" else pa.Codec(codec, level),
+    )
+
+    with pa.ipc.new_file(str(file), schema, options=options) as writer:
+        for batch in it:
+            writer.write_batch(batch)
+
+
+def to_arrow(df: pd.DataFrame, **metadata) -> pa.Table:
+    """
+    Convert the DataFrame into a `pyarrow.Table` with the federleicht metadata in its
+    schema. Tables and polars DataFrames are not converted, their type is added to the
+    metadata.
+    """
+
+    if isinstance(df, pd.DataFrame):
+        table = pa.Table.from_pandas(df, preserve_index=None)
+    else:
+        metadata = {"type": tables.kind(df), **metadata}
+        table = tables.to_arrow(df)
+
+    return table.replace_schema_metadata(
+        {
+            **(table.schema.metadata or {}),
+            METADATA: json.dumps(metadata).encode(),
+        }
+    )
+
+
+def batches(
+    df: pd.DataFrame,
+    chunksize: int,
+    **metadata,
+) -> Tuple[pa.Schema, Iterator[pa.RecordBatch]]:
+    """
+    Return the schema of the DataFrame with the federleicht metadata and an iterator
+    converting the DataFrame into record batches of at most `chunksize` rows.
+
+    The schema is inferred from the first batch, inferring it from the whole DataFrame
+    would convert all object columns at once. Only if a column of the first batch has
+    no type, e.g. all values are None, the whole DataFrame is inferred. The pandas
+    metadata of a `RangeIndex` is updated to describe the whole DataFrame.
+    """
+
+    if chunksize < 1:
+        raise ValueError(f"chunksize must be positive: {chunksize}")
+
+    if not isinstance(df, pd.DataFrame):
+        table = to_arrow(df, **metadata)
+
+        return table.schema, iter(table.to_batches(max_chunksize=chunksize))
+
+    schema = pa.Schema.from_pandas(
+        df.iloc[slice(0, chunksize)],
+        preserve_index=None,
+    )
+
+    if any(pa.types.is_null(field.type) for field in schema):
+        schema = pa.Schema.from_pandas(df, preserve_index=None)
+
+    pandas = schema.pandas_metadata
+
+    for index in pandas["index_columns"]:
+        if isinstance(index, dict) and index["kind"] == "range":
+            index.update(start=df.index.start, stop=df.index.stop, step=df.index.step)
+
+    schema = schema.with_metadata(
+        {
+            **schema.metadata,
+            b"pandas": json.dumps(pandas).encode(),
+            METADATA: json.dumps(metadata).encode(),
+        }
+    )
+
+    def it() -> Iterator[pa.RecordBatch]:
+        # at least one batch, which carries the dictionaries of categorical columns
+        for start in range(0, max(len(df), 1), chunksize):
+            yield pa.RecordBatch.from_pandas(
+                df.iloc[slice(start, start + chunksize)],
+                schema=schema,
+                preserve_index=None,
+            )
+
+    return schema, it()
+
+
+def temporary(file: Path) -> Path:
+    """
+    Return a temporary file next to the file which is unique per process and thread.
+    """
+
+    file = Path(file)
+
+    return file.with_name(f".{file.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+def atomic(file: Path, write: Callable[[Path], Any]) -> Path:
+    """
+    Call `write` with a temporary file next to the file and atomically rename it, the
+    temporary file is deleted if writing fails.
+    """
+
+    file = Path(file)
+    tmp = temporary(file)
+
+    try:
+        write(tmp)
+        os.replace(tmp, file)
+    except BaseException:
+        tmp.delete(missing_ok=True)
+        raise
+
+    return file
+
+
+def schema(file: Path) -> pa.Schema:
+    """
+    Read the schema of a feather file without reading its data.
+    """
+
+    with pa.memory_map(str(file)) as source:
+        return pa.ipc.open_file(source).schema
+
+
+def project(file: Path, columns: Sequence[str]) -> List[str]:
+    """
+    Return the columns to read for a projection, extended by the index columns of the
+    DataFrame so the index is restored.
+    """
+
+    columns = list(columns)
+    index = (schema(file).pandas_metadata or {}).get("index_columns", [])
+
+    return columns + [c for c in index if isinstance(c, str) and c not in columns]
+
+
+def read(
+    file: Path,
+    memory_map: bool = False,
+    columns: Optional[Sequence[str]] = None,
+    filter: Optional[pc.Expression] = None,
+) -> pd.DataFrame:
+    """
+    Read a DataFrame from a feather file.
+
+    Args:
+        file (Path): The feather file to read.
+        memory_map (bool, optional): Memory-map the file and return a DataFrame with
+            `pyarrow` backed columns (`dtype_backend="pyarrow"`). Columns are paged in
+            lazily by the operating system. Defaults to False.
+        columns (Sequence[str], optional): Read only these columns and the index.
+            Defaults to None, which reads all columns.
+        filter (pc.Expression, optional): Read only the rows matching the expression,
+            e.g. `pc.field("status") == "ok"`. Defaults to None.
+
+    Returns:
+        pd.DataFrame: The DataFrame read from the feather file, or the `pyarrow.Table`
+            or `polars.DataFrame` which was written.
+    """
+
+    if memory_map is not True and columns is None and filter is None:
+        if tables.stored(schema(file)) == "pandas":
+            return pd.read_feather(file)
+
+    columns = None if columns is None else project(file, columns)
+
+    if filter is None:
+        table = feather.read_table(file, columns=columns, memory_map=memory_map)
+    else:
+        table = ds.dataset(str(file), format="feather").to_table(
+            columns=columns,
+            filter=filter,
+        )
+
+    return tables.from_arrow(table, memory_map)
+
+
+def select(
+    df: pd.DataFrame,
+    columns: Optional[Sequence[str]] = None,
+    filter: Optional[pc.Expression] = None,
+) -> pd.DataFrame:
+    """
+    Apply the same projection and filter as `read` to a DataFrame in memory, e.g. a
+    DataFrame which was just computed. The dtypes of the DataFrame are kept.
+
+    A `RangeIndex` is only stored as metadata in the feather file, so like `read` the
+    filtered DataFrame gets a new `RangeIndex` while other indexes keep their labels.
+    """
+
+    if not isinstance(df, pd.DataFrame):
+        if columns is None and filter is None:
+            return df
+
+        return tables.select(df, columns, filter)
+
+    if filter is not None:
+        # without attrs, which pyarrow would try to serialize into the schema
+        table = pa.Table.from_pandas(pd.DataFrame(df), preserve_index=None)
+        table = table.append_column(ROW, pa.array(np.arange(len(df))))
+        rows = table.filter(filter).column(ROW).to_numpy()
+
+        if isinstance(df.index, pd.RangeIndex):
+            df = df.iloc[rows].reset_index(drop=True)
+        else:
+            df = df.iloc[rows]
+
+    if columns is not None:
+        df = df[list(columns)]
+
+    return df
+
+
+def metadata(file: Path) -> Dict[str, Any]:
+    """
+    Read the federleicht metadata, e.g. the compression codec, of a feather file
+    without reading its data.
+
+    Args:
+        file (Path): The feather file.
+
+    Returns:
+        Dict[str, Any]: The metadata or an empty dict for files written by others.
+    """
+
+    return json.loads((schema(file).metadata or {}).get(METADATA, b"{}"))
+
+
+__all__ = [
+    "write",
+    "read",
+    "select",
+    "metadata",
+]
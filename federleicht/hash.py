@@ -1,19 +1,22 @@
 import hashlib
+import importlib.metadata
 import types
 from typing import Any, Callable, Tuple
 
-import pandas as pd
-import pyarrow as pa
-
-import federleicht.args as args
 from federleicht.config import CACHE
 
+DEPENDENCIES = ("pandas", "pyarrow")
+"""Dependencies whose versions are part of the salt."""
+
 __salt__: bytes = None
 
 
 def salt() -> bytes:
     """Generate a salt based on the main dependency versions.
 
+    The versions are read from the package metadata on the first call, so neither
+    pandas nor pyarrow is imported.
+
     Returns:
         bytes: The first 8 characters of the package version encoded as bytes.
     """
@@ -22,12 +25,9 @@ def salt() -> bytes:
 
     if __salt__ is None:
 
-        dependencies = {
-            "pandas": pd.__version__,
-            "pyarrow": pa.__version__,
-        }
-
-        versions = ";".join(f"{key}={value}" for key, value in dependencies.items())
+        versions = ";".join(
+            f"{name}={importlib.metadata.version(name)}" for name in DEPENDENCIES
+        )
 
         __salt__ = hashlib.blake2s(
             versions.encode(),
@@ -41,18 +41,25 @@ def salt() -> bytes:
 def hash_wrapped(
     function: types.FunctionType,
     arguments: Tuple[Any, ...],
+    encoder: Callable[[Any], str] = None,
 ) -> hashlib.blake2s:
     """Generate a BLAKE2s hash for all arguments and also the functions byte-code.
 
     Args:
         function (types.FunctionType): wrapped function.
         arguments (Tuple[Any, ...]): *args and **kwargs of wrapped function
+        encoder (Callable[[Any], str], optional): JSON encoder for arguments which are
+            not serializable. Defaults to `federleicht.args.json_encoder`.
 
     Returns:
         hashlib.blake2s: The BLAKE2s hash object.
     """
 
-    binarydata = args.unique(*arguments).digest()
+    import federleicht.args as args
+
+    # same as args.dumps(*arguments) with a custom encoder
+    data = args.serialize((arguments, {}), encoder or args.json_encoder)
+    binarydata = args.hash(data.encode()).digest()
 
     hash = hashlib.blake2s(
         binarydata,
@@ -70,6 +77,7 @@ def function(
     function: types.FunctionType,
     arguments: Tuple[Any, ...],
     pepper: Callable[[], bytes] = None,
+    encoder: Callable[[Any], str] = None,
 ) -> str:
     """Generate a BLAKE2s hash for all arguments and also the functions byte-code.
 
@@ -78,12 +86,14 @@ def function(
         arguments (Tuple[Any, ...]): *args and **kwargs of wrapped function
         pepper (Callable[[], bytes], optional): A function that returns a salt.
             Defaults to None.
+        encoder (Callable[[Any], str], optional): JSON encoder for arguments which are
+            not serializable. Defaults to `federleicht.args.json_encoder`.
 
     Returns:
         str: The hexadecimal digest of the BLAKE2s hash.
     """
 
-    hash = hash_wrapped(function, arguments)
+    hash = hash_wrapped(function, arguments, encoder)
 
     if callable(pepper):
         hash.update(pepper())
@@ -0,0 +1,125 @@
+"""
+Layout of the cache files in the cache directory.
+
+By default all cache files are stored flat in the cache directory. With hundreds of
+thousands of entries directory lookups and scans degrade, especially `readdir` on
+network filesystems. The sharded layout stores each cache file two levels deep in
+directories named after the prefix of its key, e.g. `cache_dir/ab/cd/abcd...`, so no
+directory holds more than 256 subdirectories.
+
+The layout of a cache file is derived from its path alone, so both layouts can be
+mixed within one cache directory, e.g. while it is migrated.
+"""
+
+import os
+import re
+from typing import Iterator, Tuple
+
+from pathlibutil import Path
+
+from federleicht.config import CACHE
+
+KEY = re.compile(
+    f"[a-f0-9]{{{2 * CACHE.digest}}}(?:\\.parquet|\\.arrows)?",
+    re.IGNORECASE,
+)
+"""Regular expression matching the file names of feather, parquet and stream entries."""
+
+SHARD = re.compile("[a-f0-9]{2}", re.IGNORECASE)
+"""Regular expression matching the directory names of shards."""
+
+DEPTH = 2
+"""Number of nested shard directories of the sharded layout."""
+
+
+def shards(key: str) -> Tuple[str, ...]:
+    """
+    Return the names of the nested shard directories of a key.
+    """
+
+    return tuple(key[slice(i, i + 2)] for i in range(0, 2 * DEPTH, 2))
+
+
+def path(cache_dir: str, key: str, sharded: bool = False) -> Path:
+    """
+    Return the path of the cache file of a key.
+
+    Args:
+        cache_dir (str): The directory where the cache files are stored.
+        key (str): The hash of the function and its arguments.
+        sharded (bool, optional): Use the sharded layout. Defaults to False.
+
+    Example:
+        >>> path(".pandas_cache", "abcdef0123456789", sharded=True).as_posix()
+        '.pandas_cache/ab/cd/abcdef0123456789'
+    """
+
+    if sharded is True:
+        return Path(cache_dir).joinpath(*shards(key), key)
+
+    return Path(cache_dir).joinpath(key)
+
+
+def is_sharded(file: Path) -> bool:
+    """
+    Check if a cache file is stored in the shard directories of its key.
+    """
+
+    parents = Path(file).parent.parts[-DEPTH:]
+
+    return parents == shards(Path(file).name)
+
+
+def root(file: Path) -> Path:
+    """
+    Return the cache directory of a cache file of either layout.
+    """
+
+    file = Path(file)
+
+    return file.parents[DEPTH] if is_sharded(file) else file.parent
+
+
+def find(cache_dir: str, key: str) -> Path:
+    """
+    Return the path of an existing cache file, the sharded layout is looked up first.
+    The flat path is returned if neither exists.
+    """
+
+    file = path(cache_dir, key, sharded=True)
+
+    return file if file.is_file() else path(cache_dir, key)
+
+
+def _scan(directory: str, depth: int) -> Iterator[os.DirEntry]:
+
+    try:
+        it = os.scandir(directory)
+    except FileNotFoundError:
+        return
+
+    with it:
+        for entry in it:
+            if KEY.fullmatch(entry.name):
+                if depth in (0, DEPTH) and entry.is_file():
+                    yield entry
+            elif depth < DEPTH and SHARD.fullmatch(entry.name) and entry.is_dir():
+                yield from _scan(entry.path, depth + 1)
+
+
+def scan(cache_dir: str) -> Iterator[os.DirEntry]:
+    """
+    Yield the directory entries of all cache files in the cache directory, stored
+    flat or sharded, with `os.scandir` which avoids a `stat` call per file.
+    """
+
+    yield from _scan(cache_dir, 0)
+
+
+__all__ = [
+    "KEY",
+    "path",
+    "find",
+    "root",
+    "scan",
+]
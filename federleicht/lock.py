@@ -0,0 +1,203 @@
+"""
+Single-flight locks to protect the cache from stampedes.
+
+When many threads or processes miss the same cache entry at once, only one of them
+should compute the DataFrame while the others wait and read the finished cache file.
+
+`SingleFlight` combines a lock per key within the process with an advisory lock on a
+lock file next to the cache file, which serializes processes sharing the cache
+directory on the same filesystem.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from pathlibutil import Path
+
+if os.name == "nt":  # pragma: no cover
+    import msvcrt
+
+    def _trylock(fd: int) -> bool:
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+
+    def _unlock(fd: int) -> None:
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _trylock(fd: int) -> bool:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            return False
+        return True
+
+    def _unlock(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+def _same_file(fd: int, file: Path) -> bool:
+    """
+    Check if the file descriptor still refers to the file at the path.
+    """
+
+    try:
+        return os.path.samestat(os.fstat(fd), os.stat(file))
+    except OSError:
+        return False
+
+
+_registry: Dict[str, List] = {}
+_registry_lock = threading.Lock()
+
+
+def _thread_acquire(key: str, timeout: Optional[float]) -> bool:
+    """
+    Acquire the reference counted lock of the key within this process.
+    """
+
+    with _registry_lock:
+        entry = _registry.setdefault(key, [threading.Lock(), 0])
+        entry[1] += 1
+
+    if entry[0].acquire(timeout=-1 if timeout is None else max(timeout, 0)):
+        return True
+
+    _thread_release(key, locked=False)
+
+    return False
+
+
+def _thread_release(key: str, locked: bool = True) -> None:
+    """
+    Release the lock of the key and remove it when it is not referenced anymore.
+    """
+
+    with _registry_lock:
+        entry = _registry[key]
+
+        if locked is True:
+            entry[0].release()
+
+        entry[1] -= 1
+
+        if entry[1] == 0:
+            del _registry[key]
+
+
+class SingleFlight:
+    """
+    Lock a cache file across threads and processes.
+
+    The lock may be released from another thread than the one which acquired it, e.g.
+    by the thread writing the cache file in the background, and `release` can be
+    called more than once.
+
+    Args:
+        cache (Path): The cache file to lock, the lock file is created next to it.
+        timeout (float, optional): Maximum number of seconds to wait for the lock.
+            Defaults to None, which waits forever.
+
+    Example:
+        ```python
+        with SingleFlight(cache, timeout=60) as flight:
+            if flight.locked:
+                ...
+        ```
+    """
+
+    def __init__(self, cache: Path, timeout: Optional[float] = None) -> None:
+
+        self.file = Path(cache).with_name(f"{Path(cache).name}.lock")
+        self.timeout = timeout
+
+        self._key = os.path.abspath(self.file)
+        self._fd: Optional[int] = None
+        self._thread = False
+        self._release = threading.Lock()
+
+    @property
+    def locked(self) -> bool:
+        """True if the lock is held by this flight."""
+        return self._fd is not None
+
+    def acquire(self) -> bool:
+        """
+        Wait for the lock of the cache file.
+
+        Returns:
+            bool: False if the timeout expired before the lock was acquired.
+        """
+
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+
+        if not _thread_acquire(self._key, self.timeout):
+            return False
+
+        self._thread = True
+        self.file.parent.mkdir(parents=True, exist_ok=True)
+
+        delay = 0.001
+
+        while True:
+            fd = os.open(self.file, os.O_RDWR | os.O_CREAT, 0o644)
+
+            while not _trylock(fd):
+                if deadline is not None and time.monotonic() >= deadline:
+                    os.close(fd)
+                    self.release()
+                    return False
+
+                time.sleep(delay)
+                delay = min(delay * 2, 0.1)
+
+            if _same_file(fd, self.file):
+                break
+
+            # the previous holder removed the lock file, lock the new one
+            _unlock(fd)
+            os.close(fd)
+
+        self._fd = fd
+
+        return True
+
+    def release(self) -> None:
+        """
+        Remove the lock file and release the lock, does nothing if it is not held.
+        """
+
+        with self._release:
+            fd, self._fd = self._fd, None
+
+            if fd is not None:
+                try:
+                    os.unlink(self.file)
+                except OSError:
+                    pass
+
+                _unlock(fd)
+                os.close(fd)
+
+            if self._thread is True:
+                self._thread = False
+                _thread_release(self._key)
+
+    def __enter__(self) -> "SingleFlight":
+        self.acquire()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.release()
+
+
+__all__ = [
+    "SingleFlight",
+]
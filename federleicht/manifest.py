@@ -0,0 +1,342 @@
+"""
+SQLite manifest of the cache directory.
+
+The manifest records for each cache entry its key, the qualified name of the decorated
+function, the size of the cache file, the creation time, the last access time and the
+number of hits. It replaces scanning and stating the whole cache directory with indexed
+queries, e.g. in `federleicht.cache.clear_cache` and `federleicht.cache.evict_cache`.
+
+The manifest is an index only, the cache files stay the source of truth. Use `rebuild`
+to synchronize the manifest with the files in the cache directory.
+"""
+
+import contextlib
+import functools
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+
+from pathlibutil import Path
+
+from federleicht.config import CACHE
+from federleicht.layout import KEY, scan
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    function TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS entries_created ON entries (created);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE INDEX IF NOT EXISTS entries_function ON entries (function);
+CREATE INDEX IF NOT EXISTS entries_hits ON entries (hits, accessed);
+CREATE TABLE IF NOT EXISTS totals (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    size INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO totals SELECT 0, COALESCE(SUM(size), 0) FROM entries;
+CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+    UPDATE totals SET size = size + NEW.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+    UPDATE totals SET size = size - OLD.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF size ON entries BEGIN
+    UPDATE totals SET size = size - OLD.size + NEW.size WHERE id = 0;
+END;
+"""
+
+POLICIES = {
+    "lru": "accessed",
+    "lfu": "hits, accessed",
+}
+"""Order of the cache entries to evict for each eviction policy."""
+
+
+class Entry(NamedTuple):
+    """
+    A cache entry recorded in the manifest.
+
+    Attributes:
+        key (str): The hash of the function and its arguments, the name of the file.
+        function (str): The qualified name of the decorated function.
+        size (int): The size of the cache file in bytes.
+        created (float): Timestamp when the cache file was written.
+        accessed (float): Timestamp of the last hit.
+        hits (int): Number of hits.
+    """
+
+    key: str
+    function: str
+    size: int
+    created: float
+    accessed: float
+    hits: int
+
+
+class Manifest:
+    """
+    SQLite database in the cache directory which indexes the cache entries.
+
+    Args:
+        cache_dir (str): The directory where the cache files are stored.
+
+    Example:
+        ```python
+        manifest = Manifest(".pandas_cache")
+        stale = manifest.expired(time.time() - 3600)
+        ```
+    """
+
+    def __init__(self, cache_dir: str = CACHE.dir) -> None:
+
+        self.cache_dir = Path(cache_dir)
+        self.file = self.cache_dir.joinpath(CACHE.manifest)
+
+        self._local = threading.local()
+
+    @classmethod
+    def exists(cls, cache_dir: str = CACHE.dir) -> bool:
+        """
+        Check if the cache directory has a manifest.
+        """
+
+        return Path(cache_dir).joinpath(CACHE.manifest).is_file()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """
+        The connection to the manifest database of the current thread.
+        """
+
+        connection = getattr(self._local, "connection", None)
+
+        if connection is None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+            connection = sqlite3.connect(self.file, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA synchronous=OFF")
+            connection.execute("PRAGMA recursive_triggers=ON")
+            connection.executescript(SCHEMA)
+
+            self._local.connection = connection
+
+        return connection
+
+    def close(self) -> None:
+        """
+        Close the connection of the current thread.
+        """
+
+        connection = getattr(self._local, "connection", None)
+
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Execute all statements within the context in a single transaction.
+        """
+
+        connection = self.connection
+        connection.execute("BEGIN IMMEDIATE")
+
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+        connection.execute("COMMIT")
+
+    def add(
+        self,
+        key: str,
+        function: str,
+        size: int,
+        created: Optional[float] = None,
+    ) -> None:
+        """
+        Record a new or rewritten cache entry.
+        """
+
+        created = time.time() if created is None else created
+
+        self.connection.execute(
+            "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, 0)",
+            (key, function, size, created, created),
+        )
+
+    def hit(self, key: str, accessed: Optional[float] = None) -> None:
+        """
+        Record a hit of a cache entry.
+        """
+
+        self.connection.execute(
+            "UPDATE entries SET accessed = ?, hits = hits + 1 WHERE key = ?",
+            (time.time() if accessed is None else accessed, key),
+        )
+
+    def remove(self, keys: Iterable[str]) -> None:
+        """
+        Remove cache entries from the manifest.
+        """
+
+        with self.transaction() as connection:
+            connection.executemany(
+                "DELETE FROM entries WHERE key = ?",
+                ((key,) for key in keys),
+            )
+
+    def get(self, key: str) -> Optional[Entry]:
+        """
+        Return the cache entry of the key or None if it is not recorded.
+        """
+
+        row = self.connection.execute(
+            "SELECT * FROM entries WHERE key = ?",
+            (key,),
+        ).fetchone()
+
+        return None if row is None else Entry(*row)
+
+    def entries(self, function: Optional[str] = None) -> List[Entry]:
+        """
+        Return all cache entries, optionally only of a single function.
+        """
+
+        if function is None:
+            rows = self.connection.execute("SELECT * FROM entries")
+        else:
+            rows = self.connection.execute(
+                "SELECT * FROM entries WHERE function = ?",
+                (function,),
+            )
+
+        return [Entry(*row) for row in rows]
+
+    def expired(self, before: float) -> List[str]:
+        """
+        Return the keys of all cache entries created before the timestamp.
+        """
+
+        rows = self.connection.execute(
+            "SELECT key FROM entries WHERE created < ?",
+            (before,),
+        )
+
+        return [key for (key,) in rows]
+
+    def keys(self) -> List[str]:
+        """
+        Return the keys of all cache entries.
+        """
+
+        return [key for (key,) in self.connection.execute("SELECT key FROM entries")]
+
+    def nbytes(self) -> int:
+        """
+        Return the total size of all cache entries in bytes, which is maintained by
+        triggers and does not scan the entries.
+        """
+
+        (total,) = self.connection.execute(
+            "SELECT size FROM totals WHERE id = 0"
+        ).fetchone()
+
+        return total
+
+    def victims(self, policy: str = "lru", limit: int = 64) -> List[Entry]:
+        """
+        Return the cache entries which should be evicted first.
+
+        Args:
+            policy (str, optional): `lru` to evict the least recently used or `lfu` to
+                evict the least frequently used entries first. Defaults to "lru".
+            limit (int, optional): Maximum number of entries. Defaults to 64.
+
+        Returns:
+            List[Entry]: The cache entries in the order of eviction.
+        """
+
+        try:
+            order = POLICIES[policy]
+        except KeyError:
+            raise ValueError(
+                f"Invalid eviction policy: {policy}. Must be one of {list(POLICIES)}."
+            ) from None
+
+        rows = self.connection.execute(
+            f"SELECT * FROM entries ORDER BY {order} LIMIT ?",
+            (limit,),
+        )
+
+        return [Entry(*row) for row in rows]
+
+    def __len__(self) -> int:
+
+        (count,) = self.connection.execute("SELECT COUNT(*) FROM entries").fetchone()
+
+        return count
+
+    def rebuild(self) -> int:
+        """
+        Synchronize the manifest with the cache files by scanning the cache directory
+        once, in flat and sharded layout. Files missing in the manifest are added with
+        an unknown function, entries without a file are removed.
+
+        Returns:
+            int: The number of cache entries in the manifest.
+        """
+
+        files = {}
+
+        for entry in scan(self.cache_dir):
+            files[entry.name] = entry.stat()
+
+        known = set(self.keys())
+
+        with self.transaction() as connection:
+            connection.executemany(
+                "DELETE FROM entries WHERE key = ?",
+                ((key,) for key in known - files.keys()),
+            )
+            connection.executemany(
+                "INSERT INTO entries VALUES (?, '', ?, ?, ?, 0)",
+                (
+                    (key, files[key].st_size, files[key].st_mtime, files[key].st_mtime)
+                    for key in files.keys() - known
+                ),
+            )
+
+        return len(self)
+
+
+@functools.lru_cache(maxsize=None)
+def _connect(cache_dir: str) -> Manifest:
+    return Manifest(cache_dir)
+
+
+def connect(cache_dir: str = CACHE.dir) -> Manifest:
+    """
+    Return the shared `Manifest` instance of the cache directory.
+    """
+
+    return _connect(os.path.abspath(cache_dir))
+
+
+__all__ = [
+    "KEY",
+    "POLICIES",
+    "Entry",
+    "Manifest",
+    "connect",
+]
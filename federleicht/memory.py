@@ -0,0 +1,240 @@
+"""
+In-process memory tier in front of the feather files on disk.
+
+`MemoryCache` keeps recently used DataFrames keyed by the hash of the decorated
+function and its arguments. The size of all entries is bounded by a byte budget,
+measured with `pandas.DataFrame.memory_usage(deep=True)`, and the least recently used
+entries are evicted first.
+
+Callers always receive a copy of the cached DataFrame, so modifying a returned
+DataFrame never corrupts the cached entry. With pandas Copy-on-Write enabled the copy
+is lazy and costs nothing until it is modified.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any, Dict, NamedTuple, Optional, Union
+
+from federleicht.config import CACHE
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class Entry(NamedTuple):
+    dataframe: pd.DataFrame
+    nbytes: int
+    created: float
+
+
+def copy_on_write() -> bool:
+    """
+    Check if pandas Copy-on-Write is enabled, which is always the case for pandas 3.
+    """
+
+    import pandas as pd
+
+    if int(pd.__version__.split(".")[0]) >= 3:
+        return True
+
+    return pd.get_option("mode.copy_on_write") is True
+
+
+def copy(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return a copy of the DataFrame which does not share modifiable data with the
+    original DataFrame. A `pyarrow.Table` is immutable and returned as it is, a
+    `polars.DataFrame` is cloned without copying its data.
+    """
+
+    import pandas as pd
+    import pyarrow as pa
+
+    if isinstance(df, pa.Table):
+        return df
+
+    if not isinstance(df, pd.DataFrame):
+        return df.clone()
+
+    return df.copy(deep=not copy_on_write())
+
+
+def nbytes(df: pd.DataFrame) -> int:
+    """
+    Return the memory usage of the DataFrame in bytes including the index, or the size
+    of the buffers of a `pyarrow.Table` or `polars.DataFrame`.
+    """
+
+    import pandas as pd
+    import pyarrow as pa
+
+    if isinstance(df, pa.Table):
+        return df.nbytes
+
+    if not isinstance(df, pd.DataFrame):
+        return int(df.estimated_size())
+
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class MemoryCache:
+    """
+    Thread-safe LRU cache for DataFrames with a byte budget.
+
+    Args:
+        max_bytes (int): Maximum number of bytes all cached DataFrames may occupy.
+
+    Example:
+        ```python
+        memory = MemoryCache(max_bytes=512 * 2**20)
+
+        @cache_dataframe(memory=memory)
+        def load(file):
+            return pd.read_csv(file)
+        ```
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+
+        if not isinstance(max_bytes, int) or max_bytes < 0:
+            raise ValueError(f"Invalid max_bytes: {max_bytes}. Must be an int >= 0.")
+
+        self.max_bytes = max_bytes
+
+        self._entries: "OrderedDict[str, Entry]" = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes occupied by all cached DataFrames."""
+        return self._nbytes
+
+    def get(
+        self,
+        key: str,
+        expires: Union[int, Dict[str, Any]] = None,
+    ) -> Optional[pd.DataFrame]:
+        """
+        Return a copy of the cached DataFrame or None if the key is missing or the
+        entry is expired.
+
+        Args:
+            key (str): The hash of the decorated function and its arguments.
+            expires (Union[int, Dict[str, Any]], optional): The expiration time in
+                seconds or a dictionary containing kwargs for `datetime.timedelta`.
+        """
+
+        with self._lock:
+            try:
+                entry = self._entries[key]
+            except KeyError:
+                return None
+
+            if is_expired(entry.created, expires):
+                self._remove(key)
+                return None
+
+            self._entries.move_to_end(key)
+
+        return copy(entry.dataframe)
+
+    def put(self, key: str, df: pd.DataFrame, created: float = None) -> bool:
+        """
+        Store a copy of the DataFrame and evict least recently used entries until the
+        budget is met.
+
+        Args:
+            key (str): The hash of the decorated function and its arguments.
+            df (pd.DataFrame): The DataFrame to cache.
+            created (float, optional): Timestamp of the creation of the cache entry,
+                e.g. the modification time of the feather file. Defaults to now.
+
+        Returns:
+            bool: False if the DataFrame exceeds the budget and was not cached.
+        """
+
+        size = nbytes(df)
+
+        if size > self.max_bytes:
+            return False
+
+        entry = Entry(
+            copy(df),
+            size,
+            time.time() if created is None else created,
+        )
+
+        with self._lock:
+            self._remove(key)
+
+            while self._entries and self._nbytes + size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+            self._entries[key] = entry
+            self._nbytes += size
+
+        return True
+
+    def pop(self, key: str) -> None:
+        """
+        Remove an entry from the cache.
+        """
+
+        with self._lock:
+            self._remove(key)
+
+    def clear(self) -> None:
+        """
+        Remove all entries from the cache.
+        """
+
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    def _remove(self, key: str) -> None:
+
+        entry = self._entries.pop(key, None)
+
+        if entry is not None:
+            self._nbytes -= entry.nbytes
+
+
+def is_expired(created: float, expires: Union[int, Dict[str, Any]]) -> bool:
+    """
+    Check if a cache entry created at the given timestamp is expired.
+
+    Args:
+        created (float): Timestamp of the creation of the cache entry.
+        expires (Union[int, Dict[str, Any]]): The expiration time in seconds or a
+            dictionary containing kwargs for `datetime.timedelta`.
+
+    Returns:
+        bool: True if the entry is expired, False if it is not or expires is None.
+    """
+
+    if expires is None:
+        return False
+
+    if isinstance(expires, int):
+        expires = {CACHE.expires: expires}
+    elif not isinstance(expires, dict):
+        raise TypeError(f"Invalid type expires: {type(expires)}. Must be int or dict.")
+
+    return time.time() - created > timedelta(**expires).total_seconds()
+
+
+__all__ = [
+    "MemoryCache",
+]
@@ -0,0 +1,157 @@
+"""
+Read and write `pandas.DataFrame` objects as parquet files.
+
+Parquet files are dictionary encoded and store min/max statistics for each row group,
+they are usually several times smaller than feather files and a `filter` skips row
+groups whose statistics don't match. Decoding is slower than reading feather files, so
+parquet suits large, rarely read results on slow shared storage.
+
+Like feather files, parquet files carry the federleicht metadata in their schema and are
+written into a temporary file which is atomically renamed.
+"""
+
+import json
+from typing import Any, Dict, Optional, Sequence
+
+import pandas as pd
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from pathlibutil import Path
+
+import federleicht.compression as compression
+import federleicht.feather as feather
+import federleicht.tables as tables
+
+CODECS = {"uncompressed": "none"}
+"""Names of the compression codecs which differ between feather and parquet."""
+
+
+def write(
+    df: pd.DataFrame,
+    file: Path,
+    memory_map: bool = False,
+    codec: Optional[str] = None,
+    level: Optional[int] = None,
+    chunksize: Optional[int] = None,
+    row_group_size: int = 2**20,
+) -> Path:
+    """
+    Write the DataFrame to a parquet file with dictionary encoding and row group
+    statistics.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to write.
+        file (Path): The destination of the parquet file.
+        memory_map (bool, optional): Not supported by parquet files. Defaults to False.
+        codec (str, optional): The compression codec `lz4`, `zstd`, `uncompressed` or
+            `auto` to choose the codec with `federleicht.compression.choose`.
+            Defaults to None, which uses `zstd`.
+        level (int, optional): The compression level for `zstd`. Defaults to None.
+        chunksize (int, optional): Convert and write the DataFrame in record batches
+            of at most `chunksize` rows, which also limits the rows per row group.
+            Defaults to None, which converts the whole DataFrame.
+        row_group_size (int, optional): Maximum number of rows per row group.
+            Defaults to 2**20.
+
+    Returns:
+        Path: The path to the parquet file.
+
+    Raises:
+        ValueError: If the codec is not supported or the file should be memory-mapped.
+    """
+
+    if memory_map is True:
+        raise ValueError("memory_map is only supported by feather files")
+
+    compression.validate(codec, level)
+
+    if codec == "auto":
+        codec, level = compression.choose(df)
+    elif codec is None:
+        codec = "zstd"
+
+    options = {
+        "compression": CODECS.get(codec, codec),
+        "compression_level": level,
+        "use_dictionary": True,
+        "write_statistics": True,
+    }
+
+    if chunksize is not None:
+        schema, batches = feather.batches(
+            df, chunksize, compression=codec, compression_level=level
+        )
+
+        def stream(tmp: Path) -> None:
+            with pq.ParquetWriter(tmp, schema, **options) as writer:
+                for batch in batches:
+                    writer.write_batch(batch, row_group_size=row_group_size)
+
+        return feather.atomic(file, stream)
+
+    table = feather.to_arrow(df, compression=codec, compression_level=level)
+
+    return feather.atomic(
+        file,
+        lambda tmp: pq.write_table(
+            table, tmp, row_group_size=row_group_size, **options
+        ),
+    )
+
+
+def read(
+    file: Path,
+    memory_map: bool = False,
+    columns: Optional[Sequence[str]] = None,
+    filter: Optional[pc.Expression] = None,
+) -> pd.DataFrame:
+    """
+    Read a DataFrame from a parquet file.
+
+    Args:
+        file (Path): The parquet file to read.
+        memory_map (bool, optional): Memory-map the file and return a DataFrame with
+            `pyarrow` backed columns. Defaults to False.
+        columns (Sequence[str], optional): Read only these columns and the index.
+            Defaults to None, which reads all columns.
+        filter (pc.Expression, optional): Read only the rows matching the expression,
+            row groups are skipped by their statistics. Defaults to None.
+
+    Returns:
+        pd.DataFrame: The DataFrame read from the parquet file, or the `pyarrow.Table`
+            or `polars.DataFrame` which was written.
+    """
+
+    table = pq.read_table(
+        file,
+        columns=None if columns is None else list(columns),
+        filters=filter,
+        memory_map=memory_map,
+        use_pandas_metadata=True,
+    )
+
+    return tables.from_arrow(table, memory_map)
+
+
+def metadata(file: Path) -> Dict[str, Any]:
+    """
+    Read the federleicht metadata, e.g. the compression codec, of a parquet file
+    without reading its data.
+
+    Args:
+        file (Path): The parquet file.
+
+    Returns:
+        Dict[str, Any]: The metadata or an empty dict for files written by others.
+    """
+
+    schema = pq.read_schema(file)
+
+    return json.loads((schema.metadata or {}).get(feather.METADATA, b"{}"))
+
+
+__all__ = [
+    "write",
+    "read",
+    "metadata",
+]
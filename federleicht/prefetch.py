@@ -0,0 +1,181 @@
+"""
+Warm up the cache in the background before the results are requested.
+
+`cache_dataframe(...).prefetch(items)` checks the cache entry of every call in a thread
+pool. Missing or expired entries are computed and written, existing cache files are
+read once into the page cache of the operating system, or loaded into the memory tier
+if the function has one. `warm` prefetches the calls of several functions at once.
+
+Both return a `Progress` handle immediately, which reports how many calls are done,
+were hits or misses and which errors occurred.
+"""
+
+import concurrent.futures
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List, Mapping, Sequence
+
+
+class Progress:
+    """
+    Handle of a background warm-up.
+
+    Each call is a future whose result is True if the entry was already cached and
+    False if it was computed.
+
+    Args:
+        futures (Sequence[Future]): The futures of the calls.
+    """
+
+    def __init__(self, futures: Sequence[Future]) -> None:
+        self.futures: List[Future] = list(futures)
+
+    def __len__(self) -> int:
+        return len(self.futures)
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(done={self.done}/{len(self)}, hits={self.hits}, "
+            f"misses={self.misses}, errors={len(self.errors)})"
+        )
+
+    def _finished(self) -> List[Future]:
+        """futures which are done without being cancelled or failed."""
+
+        return [
+            f
+            for f in self.futures
+            if f.done() and not f.cancelled() and f.exception() is None
+        ]
+
+    @property
+    def done(self) -> int:
+        """Number of calls which are finished, failed or cancelled."""
+
+        return sum(f.done() for f in self.futures)
+
+    @property
+    def hits(self) -> int:
+        """Number of calls whose entry was already cached."""
+
+        return sum(f.result() is True for f in self._finished())
+
+    @property
+    def misses(self) -> int:
+        """Number of calls which were computed."""
+
+        return sum(f.result() is False for f in self._finished())
+
+    @property
+    def errors(self) -> List[BaseException]:
+        """Exceptions raised by failed calls."""
+
+        return [
+            f.exception()
+            for f in self.futures
+            if f.done() and not f.cancelled() and f.exception() is not None
+        ]
+
+    def wait(self, timeout: float = None) -> bool:
+        """
+        Wait until all calls are done.
+
+        Args:
+            timeout (float, optional): Maximum number of seconds to wait.
+                Defaults to None.
+
+        Returns:
+            bool: True if all calls are done.
+        """
+
+        _, pending = concurrent.futures.wait(self.futures, timeout)
+
+        return not pending
+
+    def cancel(self) -> int:
+        """
+        Cancel the calls which are not started yet.
+
+        Returns:
+            int: The number of cancelled calls.
+        """
+
+        return sum(f.cancel() for f in self.futures)
+
+
+def submit(
+    task: Callable[[Any], bool],
+    items: Iterable[Any],
+    max_workers: int = None,
+) -> Progress:
+    """
+    Run the task for each item in a new thread pool, which shuts down when all items
+    are done.
+    """
+
+    pool = ThreadPoolExecutor(max_workers, thread_name_prefix="federleicht-warm")
+
+    try:
+        return Progress([pool.submit(task, item) for item in items])
+    finally:
+        pool.shutdown(wait=False)
+
+
+def readahead(file: os.PathLike, chunksize: int = 2**20) -> int:
+    """
+    Read a file once into the page cache of the operating system without keeping its
+    content in memory.
+
+    Returns:
+        int: The number of bytes read.
+    """
+
+    buffer = bytearray(chunksize)
+    total = 0
+
+    with open(file, "rb", buffering=0) as f:
+        while True:
+            n = f.readinto(buffer)
+
+            if not n:
+                return total
+
+            total += n
+
+
+def warm(
+    calls: Mapping[Callable, Iterable[Any]],
+    max_workers: int = None,
+) -> Progress:
+    """
+    Prefetch the calls of several decorated functions in the background.
+
+    Args:
+        calls (Mapping[Callable, Iterable[Any]]): The items of `prefetch` for each
+            function decorated with `cache_dataframe`.
+        max_workers (int, optional): Maximum number of threads per function.
+            Defaults to None, which uses the default of `concurrent.futures`.
+
+    Returns:
+        Progress: The combined handle of all calls.
+
+    Example:
+        ```python
+        progress = warm({load_prices: ["A", "B"], load_trades: [("A", 2024)]})
+        progress.wait()
+        ```
+    """
+
+    futures = []
+
+    for func, items in calls.items():
+        futures.extend(func.prefetch(items, max_workers).futures)
+
+    return Progress(futures)
+
+
+__all__ = [
+    "Progress",
+    "warm",
+    "readahead",
+]
@@ -0,0 +1,179 @@
+"""
+Incremental caching of functions loading a time range, e.g. `load(start, end)`.
+
+Every distinct `(start, end)` pair is a separate cache entry of `cache_dataframe`, so
+extending a range recomputes all of it. `cache_range` splits the range into day or
+month partitions instead, calls the function once per partition with the bounds of the
+partition and caches each result with `cache_dataframe`. A call loads the cached
+partitions, computes only the missing ones, concatenates them and trims the result to
+the requested range. Partitions which end in the future are incomplete, they are
+computed on every call and never cached.
+
+Ranges are half-open, `start <= value < end`.
+"""
+
+from __future__ import annotations
+
+import inspect
+from functools import wraps
+from typing import TYPE_CHECKING, Callable, Iterator, Tuple
+
+from federleicht.cache import from_cache
+from federleicht.dataframe import cache_dataframe
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+FREQUENCIES = {
+    "day": "D",
+    "month": "MS",
+}
+"""Supported partition granularities and their pandas frequency."""
+
+
+def partitions(
+    start: pd.Timestamp,
+    end: pd.Timestamp,
+    freq: str = "day",
+) -> Iterator[Tuple[pd.Timestamp, pd.Timestamp]]:
+    """
+    Yield the bounds of the partitions covering the range `[start, end)`.
+
+    Example:
+        >>> [str(a.date()) for a, _ in partitions("2024-01-15", "2024-03-01", "month")]
+        ['2024-01-01', '2024-02-01']
+    """
+
+    import pandas as pd
+
+    offset = pd.tseries.frequencies.to_offset(FREQUENCIES[freq])
+
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+
+    if start >= end:
+        return
+    first = start.normalize()
+
+    if freq == "month":
+        first = first.replace(day=1)
+
+    for lower in pd.date_range(first, end, freq=offset, inclusive="left"):
+        yield lower, lower + offset
+
+
+def cache_range(
+    func: Callable = None,
+    *,
+    start: str = "start",
+    end: str = "end",
+    freq: str = "day",
+    on: str = None,
+    **kwargs,
+):
+    """
+    Decorator to cache a function loading a time range in day or month partitions.
+
+    The decorated function is called with the bounds of a partition as `pd.Timestamp`
+    for each partition which is not cached yet, all other arguments are passed
+    unchanged and are part of the cache key of each partition. Partitions ending after
+    the current time are still growing and are computed without caching. If all
+    partitions are loaded from the cache, `from_cache` of the result holds the paths of
+    all of them.
+
+    Args:
+        func (callable, optional): The function to be decorated. Defaults to None.
+        start (str, optional): Name of the parameter with the inclusive start of the
+            range. Defaults to "start".
+        end (str, optional): Name of the parameter with the exclusive end of the range.
+            Defaults to "end".
+        freq (str, optional): Partition granularity, `day` or `month`.
+            Defaults to "day".
+        on (str, optional): Column with the timestamps to trim the result to the
+            range. Defaults to None, which uses the index.
+        **kwargs: Arguments of `cache_dataframe` for the partitions.
+
+    Returns:
+        callable: The wrapped function with caching functionality.
+
+    Raises:
+        ValueError: If the granularity is unknown, the function has no parameters
+            `start` and `end` or the range is empty.
+        TypeError: If the function is a coroutine or generator function.
+
+    Example:
+        ```python
+        @cache_range(freq="month", on="time", expires={"days": 1})
+        def load(start, end, site):
+            return query(site, start, end)
+
+        df = load("2024-01-01", "2024-07-01", site="A")
+        ```
+    """
+
+    if func is None:
+        return lambda f: cache_range(
+            f, start=start, end=end, freq=freq, on=on, **kwargs
+        )
+
+    if freq not in FREQUENCIES:
+        raise ValueError(f"Invalid freq: {freq}. Must be one of {list(FREQUENCIES)}.")
+
+    if inspect.iscoroutinefunction(func) or inspect.isgeneratorfunction(func):
+        raise TypeError("cache_range supports only functions returning a DataFrame.")
+
+    signature = inspect.signature(func)
+
+    for name in (start, end):
+        if name not in signature.parameters:
+            raise ValueError(f"{func.__qualname__} has no parameter {name!r}.")
+
+    cached = cache_dataframe(func, **kwargs)
+
+    def trim(df: pd.DataFrame, lower: pd.Timestamp, upper: pd.Timestamp):
+        """keep the rows of the DataFrame within the range."""
+
+        values = df.index if on is None else df[on]
+
+        return df[(values >= lower) & (values < upper)]
+
+    @wraps(func)
+    def wrapper(*args, **kw):
+
+        import pandas as pd
+
+        bound = signature.bind(*args, **kw)
+        bound.apply_defaults()
+
+        lower = pd.Timestamp(bound.arguments[start])
+        upper = pd.Timestamp(bound.arguments[end])
+
+        now = pd.Timestamp.now(tz=upper.tz)
+        frames = []
+
+        for first, last in partitions(lower, upper, freq):
+            bound.arguments[start] = first
+            bound.arguments[end] = last
+
+            load = cached if last <= now else func
+
+            frames.append(load(*bound.args, **bound.kwargs))
+
+        if not frames:
+            raise ValueError(f"Empty range: {start}={lower}, {end}={upper}")
+
+        df = trim(pd.concat(frames), lower, upper)
+
+        if all(from_cache(frame) for frame in frames):
+            df.attrs["from_cache"] = tuple(f.attrs["from_cache"] for f in frames)
+
+        return df
+
+    wrapper.cached = cached
+
+    return wrapper
+
+
+__all__ = [
+    "cache_range",
+    "partitions",
+]
@@ -0,0 +1,225 @@
+"""
+Statistics of the functions decorated with `cache_dataframe`.
+
+Each decorated function counts its hits, misses, expirations and errors and measures
+the time spent in the stages of a call:
+
+- `hash`: hashing the arguments with `federleicht.hash.function`
+- `read`: reading the result from the memory tier or the cache file
+- `compute`: calling the decorated function on a miss
+- `write`: writing the cache file
+
+Percentiles are computed over the most recent `SAMPLES` measurements of a stage, the
+count and the total time over all measurements. `func.cache_info()` returns the
+statistics of a function like `functools.lru_cache`, `cache_info()` of this module
+those of all decorated functions which are alive.
+
+An optional callback receives every `Event` to export the numbers to another metrics
+system, it is called in the thread of the event and must not raise.
+"""
+
+import threading
+import weakref
+from collections import deque
+from typing import Callable, Deque, Dict, List, NamedTuple, Optional
+
+STAGES = ("hash", "read", "compute", "write")
+"""Timed stages of a call."""
+
+COUNTERS = {
+    "hit": "hits",
+    "miss": "misses",
+    "expired": "expirations",
+    "error": "errors",
+}
+"""Counted events and the names of their counters."""
+
+SAMPLES = 1024
+"""Number of recent measurements per stage used for percentiles."""
+
+
+class Event(NamedTuple):
+    """
+    A counted event or a measured stage of a decorated function.
+
+    Attributes:
+        function (str): The qualified name of the decorated function.
+        event (str): One of `STAGES` or `COUNTERS`.
+        seconds (float): The duration of a stage, 0.0 for counted events.
+        nbytes (int): The bytes read or written by the stage, otherwise 0.
+    """
+
+    function: str
+    event: str
+    seconds: float = 0.0
+    nbytes: int = 0
+
+
+class Timing(NamedTuple):
+    """
+    Durations of a stage in seconds.
+
+    Attributes:
+        count (int): Number of measurements.
+        total (float): Cumulative duration of all measurements.
+        p50 (float): Median of the recent measurements.
+        p90 (float): 90th percentile of the recent measurements.
+        p99 (float): 99th percentile of the recent measurements.
+        max (float): Maximum of the recent measurements.
+    """
+
+    count: int = 0
+    total: float = 0.0
+    p50: float = 0.0
+    p90: float = 0.0
+    p99: float = 0.0
+    max: float = 0.0
+
+
+class CacheInfo(NamedTuple):
+    """
+    Statistics of a decorated function, see `Stats.info`.
+    """
+
+    function: str
+    hits: int
+    misses: int
+    expirations: int
+    errors: int
+    bytes_read: int
+    bytes_written: int
+    timings: Dict[str, Timing]
+
+
+class Stats:
+    """
+    Thread-safe statistics of a decorated function.
+
+    Args:
+        function (str): The qualified name of the decorated function.
+        callback (Callable[[Event], None], optional): Called with every event.
+            Defaults to None.
+    """
+
+    def __init__(
+        self,
+        function: str,
+        callback: Optional[Callable[[Event], None]] = None,
+    ) -> None:
+        self.function = function
+        self.callback = callback
+        self._lock = threading.Lock()
+        self.clear()
+
+        REGISTRY.add(self)
+
+    def clear(self) -> None:
+        """Reset all counters and timings."""
+
+        with self._lock:
+            self._counters: Dict[str, int] = dict.fromkeys(COUNTERS.values(), 0)
+            self._nbytes = {"read": 0, "write": 0}
+            self._counts = dict.fromkeys(STAGES, 0)
+            self._totals = dict.fromkeys(STAGES, 0.0)
+            self._samples: Dict[str, Deque[float]] = {
+                stage: deque(maxlen=SAMPLES) for stage in STAGES
+            }
+
+    def record(self, event: str, seconds: float = 0.0, nbytes: int = 0) -> None:
+        """
+        Count an event or add the measurement of a stage.
+
+        Args:
+            event (str): One of `STAGES` or `COUNTERS`.
+            seconds (float, optional): The duration of a stage. Defaults to 0.0.
+            nbytes (int, optional): The bytes read or written. Defaults to 0.
+        """
+
+        with self._lock:
+            if event in COUNTERS:
+                self._counters[COUNTERS[event]] += 1
+            else:
+                self._counts[event] += 1
+                self._totals[event] += seconds
+                self._samples[event].append(seconds)
+
+                if event in self._nbytes:
+                    self._nbytes[event] += nbytes
+
+        if self.callback is not None:
+            self.callback(Event(self.function, event, seconds, nbytes))
+
+    def timing(self, stage: str) -> Timing:
+        """Return the durations of a stage."""
+
+        import numpy as np
+
+        with self._lock:
+            count, total = self._counts[stage], self._totals[stage]
+            samples = np.fromiter(self._samples[stage], dtype=float)
+
+        if count == 0:
+            return Timing()
+
+        p50, p90, p99 = np.percentile(samples, [50, 90, 99])
+
+        return Timing(
+            count, total, float(p50), float(p90), float(p99), float(samples.max())
+        )
+
+    def info(self) -> CacheInfo:
+        """Return a snapshot of the statistics."""
+
+        timings = {stage: self.timing(stage) for stage in STAGES}
+
+        with self._lock:
+            return CacheInfo(
+                function=self.function,
+                bytes_read=self._nbytes["read"],
+                bytes_written=self._nbytes["write"],
+                timings=timings,
+                **self._counters,
+            )
+
+
+REGISTRY: "weakref.WeakSet[Stats]" = weakref.WeakSet()
+"""Statistics of all decorated functions which are alive."""
+
+
+def cache_info() -> List[CacheInfo]:
+    """
+    Return the statistics of all decorated functions which are alive, sorted by the
+    name of the function.
+
+    Example:
+        ```python
+        for info in cache_info():
+            print(info.function, info.hits, info.timings["read"].p90)
+        ```
+    """
+
+    return sorted((stats.info() for stats in list(REGISTRY)), key=lambda i: i.function)
+
+
+def dump() -> List[Dict]:
+    """
+    Return the statistics of all decorated functions as JSON serializable dicts.
+    """
+
+    return [
+        {
+            **info._asdict(),
+            "timings": {k: v._asdict() for k, v in info.timings.items()},
+        }
+        for info in cache_info()
+    ]
+
+
+__all__ = [
+    "Event",
+    "Timing",
+    "CacheInfo",
+    "Stats",
+    "cache_info",
+    "dump",
+]
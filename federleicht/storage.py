@@ -0,0 +1,94 @@
+"""
+Storage formats of the cache files.
+
+Each format bundles the functions to write, read and inspect a cache file and the
+suffix of its file name. Feather files keep the bare hash as file name, so existing
+cache directories stay valid, parquet files are named `<hash>.parquet`. Together with
+the format being part of the hash, both formats coexist in one cache directory.
+
+The module of a format is imported on its first use, which imports pandas and pyarrow.
+"""
+
+import importlib
+from types import ModuleType
+from typing import Any, Dict, NamedTuple
+
+
+class Storage(NamedTuple):
+    """
+    A storage format of the cache files.
+
+    Attributes:
+        name (str): The name of the format.
+        suffix (str): The suffix of the cache file names.
+        module (str): The module with the functions `write`, `read` and `metadata`,
+            see `federleicht.feather`.
+    """
+
+    name: str
+    suffix: str
+    module: str
+
+    @property
+    def implementation(self) -> ModuleType:
+        """The imported module of the format."""
+
+        return importlib.import_module(self.module)
+
+    def write(self, *args, **kwargs) -> None:
+        """Write a DataFrame, see `federleicht.feather.write`."""
+
+        return self.implementation.write(*args, **kwargs)
+
+    def read(self, *args, **kwargs) -> Any:
+        """Read a DataFrame, see `federleicht.feather.read`."""
+
+        return self.implementation.read(*args, **kwargs)
+
+    def metadata(self, *args, **kwargs) -> Dict[str, Any]:
+        """Read the federleicht metadata, see `federleicht.feather.metadata`."""
+
+        return self.implementation.metadata(*args, **kwargs)
+
+
+FORMATS = {
+    "feather": Storage("feather", "", "federleicht.feather"),
+    "parquet": Storage("parquet", ".parquet", "federleicht.parquet"),
+}
+"""Supported storage formats by name."""
+
+
+def get(format: str) -> Storage:
+    """
+    Return the storage format by its name.
+
+    Raises:
+        ValueError: If the format is not supported.
+    """
+
+    try:
+        return FORMATS[format]
+    except KeyError:
+        raise ValueError(
+            f"Invalid format: {format}. Must be one of {list(FORMATS)}."
+        ) from None
+
+
+def detect(file: str) -> Storage:
+    """
+    Return the storage format of a cache file by its suffix.
+    """
+
+    for storage in FORMATS.values():
+        if storage.suffix and str(file).endswith(storage.suffix):
+            return storage
+
+    return FORMATS["feather"]
+
+
+__all__ = [
+    "Storage",
+    "FORMATS",
+    "get",
+    "detect",
+]
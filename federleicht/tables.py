@@ -0,0 +1,176 @@
+"""
+Results of other types than `pandas.DataFrame`: `pyarrow.Table` and `polars.DataFrame`.
+
+Both are Arrow tables in memory, so they are written into the cache file as they are
+and read back without a round trip through pandas. The type of the result is stored in
+the federleicht metadata of the cache file and a hit returns the same type.
+
+polars is an optional dependency, it is only imported to restore a `polars.DataFrame`
+from a cache file and objects are recognized as polars objects by their module.
+"""
+
+import json
+from typing import Any, Optional, Sequence
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+METADATA = b"federleicht"
+"""Key of the federleicht metadata in the schema, same as `federleicht.feather`."""
+
+
+def is_polars(obj: Any) -> bool:
+    """
+    Check if the object is a polars object, without importing polars.
+    """
+
+    return type(obj).__module__.split(".")[0] == "polars" and hasattr(obj, "to_arrow")
+
+
+def kind(obj: Any) -> str:
+    """
+    Return the name of the type of a result.
+
+    Raises:
+        TypeError: If the result is neither a pandas or polars DataFrame nor a pyarrow
+            Table.
+    """
+
+    if isinstance(obj, pd.DataFrame):
+        return "pandas"
+
+    if isinstance(obj, pa.Table):
+        return "pyarrow"
+
+    if is_polars(obj) and hasattr(obj, "columns"):
+        return "polars"
+
+    raise TypeError(
+        f"Unsupported result of type {type(obj).__qualname__}. "
+        "Must be a pandas.DataFrame, pyarrow.Table or polars.DataFrame."
+    )
+
+
+def to_arrow(obj: Any) -> pa.Table:
+    """
+    Return the `pyarrow.Table` of a pyarrow Table or polars DataFrame.
+    """
+
+    if isinstance(obj, pa.Table):
+        return obj
+
+    return obj.to_arrow()
+
+
+def stored(schema: pa.Schema) -> str:
+    """
+    Return the type of the result stored in a cache file with this schema, files
+    without the type hold a `pandas.DataFrame`.
+    """
+
+    metadata = json.loads((schema.metadata or {}).get(METADATA, b"{}"))
+
+    return metadata.get("type", "pandas")
+
+
+def from_arrow(table: pa.Table, memory_map: bool = False) -> Any:
+    """
+    Convert a table read from a cache file into the type of the stored result.
+
+    A `pyarrow.Table` keeps the federleicht metadata in its schema, which marks it as
+    loaded from the cache, see `federleicht.from_cache`.
+
+    Args:
+        table (pa.Table): The table read from the cache file.
+        memory_map (bool, optional): Return a pandas DataFrame with `pyarrow` backed
+            columns. Defaults to False.
+    """
+
+    result = stored(table.schema)
+
+    if result == "pyarrow":
+        return table
+
+    if result == "polars":
+        import polars
+
+        return polars.from_arrow(table)
+
+    return table.to_pandas(types_mapper=pd.ArrowDtype if memory_map else None)
+
+
+def mark(obj: Any, cache: Any) -> Any:
+    """
+    Mark a result as loaded from the cache file: DataFrames get the attribute
+    `from_cache`, tables the federleicht metadata in their schema. polars DataFrames
+    can't be marked.
+    """
+
+    if isinstance(obj, pd.DataFrame):
+        obj.attrs["from_cache"] = cache
+    elif isinstance(obj, pa.Table) and METADATA not in (obj.schema.metadata or {}):
+        obj = obj.replace_schema_metadata(
+            {
+                **(obj.schema.metadata or {}),
+                METADATA: json.dumps({"type": "pyarrow"}).encode(),
+            }
+        )
+
+    return obj
+
+
+def concat(results: Sequence[Any]) -> Any:
+    """
+    Concatenate results of the same type, e.g. of `map`.
+    """
+
+    if len(results) == 0:
+        return pd.DataFrame()
+
+    result = kind(results[0])
+
+    if result == "pyarrow":
+        return pa.concat_tables(results)
+
+    if result == "polars":
+        import polars
+
+        return polars.concat(results)
+
+    return pd.concat(results)
+
+
+def select(
+    obj: Any,
+    columns: Optional[Sequence[str]] = None,
+    filter: Optional[pc.Expression] = None,
+) -> Any:
+    """
+    Apply a projection and a filter to a pyarrow Table or polars DataFrame in memory.
+    """
+
+    table = to_arrow(obj)
+
+    if filter is not None:
+        table = table.filter(filter)
+
+    if columns is not None:
+        table = table.select(list(columns))
+
+    if kind(obj) == "polars":
+        import polars
+
+        return polars.from_arrow(table)
+
+    return table
+
+
+__all__ = [
+    "kind",
+    "to_arrow",
+    "from_arrow",
+    "mark",
+    "concat",
+    "select",
+]
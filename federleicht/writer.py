@@ -0,0 +1,148 @@
+"""
+Write-behind of cache files in background threads.
+
+With `cache_dataframe(write_behind=True)` the DataFrame is returned to the caller right
+after it was computed, while a snapshot of it is written to the cache directory by a
+bounded thread pool. The bytes of all pending DataFrames are limited by a memory budget,
+once it is exceeded new writes block until enough pending writes are finished.
+
+Pending writes are flushed when the interpreter exits, call `flush` to wait for them
+explicitly.
+"""
+
+import atexit
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional, Set
+
+from federleicht.config import CACHE
+
+
+class Writer:
+    """
+    Bounded thread pool to write cache files in the background.
+
+    Args:
+        max_workers (int, optional): Number of writer threads. Defaults to 2.
+        max_bytes (int, optional): Memory budget for all pending writes in bytes.
+            Defaults to CACHE.pending.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_bytes: int = CACHE.pending,
+    ) -> None:
+
+        self.max_workers = max_workers
+        self.max_bytes = max_bytes
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Set[Future] = set()
+        self._nbytes = 0
+        self._errors = 0
+        self._condition = threading.Condition()
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes of all pending writes."""
+        return self._nbytes
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def submit(self, nbytes: int, fn: Callable, *args, **kwargs) -> Future:
+        """
+        Schedule `fn(*args, **kwargs)` in a writer thread.
+
+        Blocks while the pending writes exceed the memory budget, a single write larger
+        than the budget is accepted when no other write is pending.
+
+        Args:
+            nbytes (int): Number of bytes held in memory until the write is finished.
+            fn (Callable): The function writing the cache file.
+
+        Returns:
+            Future: The future of the write.
+        """
+
+        with self._condition:
+            self._condition.wait_for(
+                lambda: not self._pending or self._nbytes + nbytes <= self.max_bytes
+            )
+
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="federleicht",
+                )
+
+            future = self._executor.submit(fn, *args, **kwargs)
+
+            self._pending.add(future)
+            self._nbytes += nbytes
+
+        future.add_done_callback(lambda f: self._done(f, nbytes))
+
+        return future
+
+    def _done(self, future: Future, nbytes: int) -> None:
+
+        with self._condition:
+            self._pending.discard(future)
+            self._nbytes -= nbytes
+
+            if future.exception() is not None:
+                self._errors += 1
+
+            self._condition.notify_all()
+
+    def flush(self, timeout: float = None) -> int:
+        """
+        Wait until all pending writes are finished.
+
+        Args:
+            timeout (float, optional): Maximum number of seconds to wait.
+                Defaults to None.
+
+        Returns:
+            int: The number of failed writes since the last flush.
+        """
+
+        with self._condition:
+            self._condition.wait_for(lambda: not self._pending, timeout)
+
+            errors, self._errors = self._errors, 0
+
+        return errors
+
+
+WRITER = Writer()
+"""Default writer of `cache_dataframe(write_behind=True)`."""
+
+
+def flush(timeout: float = None) -> int:
+    """
+    Wait until all pending background writes are finished.
+
+    Args:
+        timeout (float, optional): Maximum number of seconds to wait. Defaults to None.
+
+    Returns:
+        int: The number of failed writes since the last flush.
+
+    Example:
+        >>> flush()
+        0
+    """
+
+    return WRITER.flush(timeout)
+
+
+atexit.register(flush)
+
+
+__all__ = [
+    "Writer",
+    "flush",
+]
@@ -16,7 +16,7 @@ def cache() -> str:
     name = "".join(
         random.choices(
             string.hexdigits,
-            k=CACHE.digest,
+            k=2 * CACHE.digest,
         )
     )
 
@@ -5,6 +5,7 @@ from datetime import datetime
 import numpy as np
 import pandas as pd
 import pathlibutil
+import pyarrow as pa
 import pytest
 
 import federleicht.args as args
@@ -188,3 +189,389 @@ def test_args_hash(attr):
     hasher = args.hash()
 
     assert hasattr(hasher, attr)
+
+
+def readonly(array: np.ndarray) -> np.ndarray:
+    array.flags.writeable = False
+    return array
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        readonly(np.arange(1000)),
+        readonly(np.array(1)),
+        pa.array(range(1000)).to_numpy(),
+    ],
+    ids=["ndarray", "scalar", "arrow"],
+)
+def test_args_fingerprint_memo(mocker, obj):
+    """
+    check if the fingerprint of the same immutable object is calculated only once.
+    """
+
+    spy = mocker.spy(args, "digest")
+
+    assert args.fingerprint(obj) == args.fingerprint(obj)
+    assert spy.call_count == 1
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        pd.DataFrame({"a": range(1000), "b": ["x"] * 1000}),
+        pd.Series(range(1000)),
+        np.arange(1000),
+        readonly(np.arange(1000)[:]),
+    ],
+    ids=["DataFrame", "Series", "ndarray", "view"],
+)
+def test_args_fingerprint_mutable(mocker, obj):
+    """
+    check if the fingerprint of a mutable object is calculated on every call.
+    """
+
+    spy = mocker.spy(args, "digest")
+
+    assert args.fingerprint(obj) == args.fingerprint(obj)
+    assert spy.call_count == 2
+    assert id(obj) not in args._fingerprints
+
+
+@pytest.mark.parametrize("row", [5, 999])
+@pytest.mark.parametrize(
+    "obj",
+    [
+        lambda: pd.DataFrame({"a": range(1000), "b": range(1000)}),
+        lambda: np.arange(1000),
+    ],
+    ids=["DataFrame", "ndarray"],
+)
+def test_args_fingerprint_mutated(obj, row):
+    """
+    check if the fingerprint changes after an in-place edit of any row.
+    """
+
+    obj = obj()
+    before = args.fingerprint(obj)
+
+    if isinstance(obj, pd.DataFrame):
+        obj.loc[row, "a"] = -1
+    else:
+        obj[row] = -1
+
+    assert args.fingerprint(obj) != before
+
+
+def arrow_frame() -> pd.DataFrame:
+    """
+    dataframe backed by pyarrow like `read_parquet(..., dtype_backend="pyarrow")`.
+    """
+
+    table = pa.table({"a": range(1000), "b": [f"s{i}" for i in range(1000)]})
+
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        arrow_frame,
+        lambda: arrow_frame()["a"],
+        lambda: arrow_frame().set_index("b"),
+        lambda: pd.DataFrame(readonly(np.ones((500, 2))), copy=False),
+    ],
+    ids=["DataFrame", "Series", "index", "readonly"],
+)
+def test_args_fingerprint_frozen(mocker, obj):
+    """
+    check if the fingerprint of a pandas object backed by immutable data is
+    calculated only once.
+    """
+
+    obj = obj()
+    spy = mocker.spy(args, "digest")
+
+    assert args.frozen(obj) is not None
+    assert args.fingerprint(obj) == args.fingerprint(obj)
+    assert spy.call_count == 1
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        lambda df: df.loc.__setitem__((5, "a"), -1),
+        lambda df: df.iloc.__setitem__((999, 0), -1),
+        lambda df: df.__setitem__("c", 1),
+        lambda df: df.__delitem__("b"),
+        lambda df: setattr(df.index, "name", "row"),
+        lambda df: setattr(df.columns, "name", "column"),
+        lambda df: df.rename(columns={"a": "c"}, inplace=True),
+        lambda df: df.sort_values("a", ascending=False, inplace=True),
+        lambda df: df["a"].array.__setitem__(5, -1),
+    ],
+    ids=[
+        "loc",
+        "iloc",
+        "insert",
+        "delete",
+        "index-name",
+        "columns-name",
+        "rename",
+        "sort",
+        "array",
+    ],
+)
+def test_args_fingerprint_frozen_mutated(mutate):
+    """
+    check if the memoized fingerprint of a frozen DataFrame changes after an in-place
+    modification.
+    """
+
+    df = arrow_frame()
+    before = args.fingerprint(df)
+
+    mutate(df)
+
+    assert args.fingerprint(df) != before
+    assert args.fingerprint(df) == args.digest(df)
+
+
+def test_args_fingerprint_frozen_series_name():
+
+    series = arrow_frame()["a"]
+    before = args.fingerprint(series)
+
+    series.name = "c"
+
+    assert args.fingerprint(series) != before
+
+
+def test_args_fingerprint_weakref():
+    """
+    check if the memo entry dies with the object.
+    """
+
+    obj = readonly(np.arange(3))
+    key = id(obj)
+
+    args.fingerprint(obj)
+    assert key in args._fingerprints
+
+    del obj
+    assert key not in args._fingerprints
+
+
+def test_args_fingerprint_forget(mocker):
+
+    obj = readonly(np.arange(10))
+    spy = mocker.spy(args, "digest")
+
+    args.fingerprint(obj)
+    args.forget(obj)
+    args.fingerprint(obj)
+
+    assert spy.call_count == 2
+
+
+def test_args_json_encoder_numpy_scalar():
+
+    assert args.json_encoder(np.int64(1)) != args.json_encoder(np.int64(2))
+
+
+def frame() -> pd.DataFrame:
+    """
+    dataframe with numpy, extension, pyarrow and object columns.
+    """
+
+    n = 100
+
+    return pd.DataFrame(
+        {
+            "int": np.arange(n),
+            "float": np.linspace(0, 1, n),
+            "time": pd.date_range("2020-01-01", periods=n, freq="h"),
+            "utc": pd.date_range("2020-01-01", periods=n, freq="h", tz="UTC"),
+            "category": pd.Categorical(["a", "b"] * (n // 2)),
+            "string": [f"s{i}" for i in range(n)],
+            "mixed": pd.Series([1, "a", None, 2.5] * (n // 4), dtype=object),
+            "nullable": pd.array([1, None] * (n // 2), dtype="Int64"),
+            "arrow": pd.array(np.arange(n), dtype="int64[pyarrow]"),
+        }
+    )
+
+
+def test_args_digest_deterministic():
+    """
+    check if equal dataframes have the same digest.
+    """
+
+    assert args.digest(frame()) == args.digest(frame())
+    assert args.digest(frame().set_index(["int", "string"])) == args.digest(
+        frame().set_index(["int", "string"])
+    )
+
+
+@pytest.mark.parametrize(
+    "column, value",
+    [
+        ("int", -1),
+        ("time", pd.Timestamp("1999-01-01")),
+        ("category", "a"),
+        ("string", "foo"),
+        ("mixed", "foo"),
+        ("nullable", 5),
+        ("arrow", -1),
+    ],
+)
+def test_args_digest_changed(column, value):
+    """
+    check if a single changed value changes the digest.
+    """
+
+    df = frame()
+    df.loc[1, column] = value
+
+    assert args.digest(df) != args.digest(frame())
+
+
+def test_args_digest_categories():
+    """
+    check if the categories are part of the digest and not only the codes.
+    """
+
+    df = frame()
+    df["category"] = pd.Categorical(["a", "c"] * (len(df) // 2))
+
+    assert args.digest(df) != args.digest(frame())
+
+
+def test_args_digest_numpy_layout():
+    """
+    check if the memory layout of an array does not change the digest.
+    """
+
+    array = np.random.default_rng(0).random((100, 10))
+
+    assert args.digest(array.T) == args.digest(np.ascontiguousarray(array.T))
+    assert args.digest(array) != args.digest(array.T)
+
+
+def test_args_digest_numpy_chunks():
+    """
+    check if non-contiguous arrays are hashed in chunks with the same result.
+    """
+
+    hashes = []
+    array = np.asfortranarray(np.random.default_rng(0).random((100, 10)))
+
+    for chunksize in (80, 2**26):
+        hasher = args.hash()
+        args.update_numpy(hasher, array, chunksize)
+        hashes.append(hasher.hexdigest())
+
+    assert hashes[0] == hashes[1]
+
+
+def axes() -> pd.DataFrame:
+    return pd.DataFrame({"a": [1, 2, 3], "b": [4, 5, 6]})
+
+
+@pytest.mark.parametrize(
+    "df, other",
+    [
+        (axes(), axes().rename_axis("row")),
+        (axes(), axes().rename_axis(columns="column")),
+        (axes(), axes().set_axis(pd.Index([0, 1, 2]), axis=0)),
+        (axes(), axes().set_axis(pd.Index(["a", "b"], dtype=object), axis=1)),
+        (
+            axes().set_index(["a", "b"]),
+            axes().set_index(["a", "b"]).rename_axis(["b", "a"]),
+        ),
+    ],
+    ids=["index", "columns", "index-type", "columns-type", "levels"],
+)
+def test_args_digest_axes(df, other):
+    """
+    check if the names and types of the index and columns are part of the digest.
+    """
+
+    assert args.digest(df) != args.digest(other)
+
+
+def test_args_digest_series_name():
+
+    series = pd.Series([1, 2, 3])
+
+    assert args.digest(series) != args.digest(series.rename(0))
+    assert args.digest(series) != args.digest(series.rename_axis("row"))
+    assert args.digest(series.to_frame()) != args.digest(series)
+
+
+@pytest.mark.parametrize(
+    "values, other",
+    [
+        (["1", 1], [1, "1"]),
+        ([1, 2.0], [1.0, 2]),
+        ([1, "a", None], [1, "a", "None"]),
+        ([True, "a"], [1, "a"]),
+        ([1, "a", pd.NA], [1, "a", None]),
+    ],
+)
+def test_args_digest_objects(values, other):
+    """
+    check if object columns of mixed types are hashed with the type of each value.
+    """
+
+    assert args.digest(pd.Series(values, dtype=object)) != args.digest(
+        pd.Series(other, dtype=object)
+    )
+    assert args.digest(pd.Series(values, dtype=object)) == args.digest(
+        pd.Series(values, dtype=object)
+    )
+
+
+def test_args_digest_objects_raises():
+
+    with pytest.raises(TypeError):
+        args.digest(pd.Series([1, "a", object()], dtype=object))
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        pa.table({"a": range(1000), "b": ["x"] * 1000}),
+        pa.record_batch({"a": range(1000)}),
+        pa.array(range(1000)),
+        pa.chunked_array([range(500), range(500)]),
+    ],
+    ids=lambda x: type(x).__name__,
+)
+def test_args_fingerprint_arrow(mocker, obj):
+
+    spy = mocker.spy(args, "digest")
+
+    assert args.json_encoder(obj) == args.json_encoder(obj)
+    assert spy.call_count == 1
+
+
+def test_args_digest_arrow():
+
+    table = pa.table({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+
+    assert args.digest(table) == args.digest(pa.table(table.to_pydict()))
+    assert args.digest(table) != args.digest(table.slice(1))
+    assert args.digest(table) != args.digest(table.rename_columns(["a", "c"]))
+    assert args.digest(table) != args.digest(
+        table.replace_schema_metadata({"key": "value"})
+    )
+
+
+def test_args_json_encoder_polars():
+
+    pl = pytest.importorskip("polars")
+
+    df = pl.DataFrame({"a": [1, 2, 3]})
+
+    assert args.json_encoder(df) == args.json_encoder(df.clone())
+    assert args.json_encoder(df) != args.json_encoder(df.with_columns(pl.col("a") + 1))
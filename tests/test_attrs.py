@@ -105,3 +105,27 @@ def test_attrs_restore_keyerror(mocker, dataframe, dataframe_attrs, tmp_cachefil
     cached_df = attrs.restore(dataframe, tmp_cachefile)
 
     assert cached_df.attrs == dataframe.attrs == {}
+
+
+def test_attrs_dump_atomic(mocker, dataframe_attrs, tmp_cachefile):
+    """
+    check if a failed write leaves neither the JSON file nor a temporary file.
+    """
+
+    mocker.patch("pathlib.Path.write_text", side_effect=OSError)
+
+    with pytest.raises(OSError):
+        attrs.save(dataframe_attrs, tmp_cachefile)
+
+    assert sorted(p.name for p in tmp_cachefile.parent.iterdir()) == [
+        tmp_cachefile.name
+    ]
+
+
+def test_attrs_restore_invalid(dataframe, dataframe_attrs, tmp_cachefile):
+
+    file = attrs.save(dataframe_attrs, tmp_cachefile)
+    file.write_text(file.read_text()[:10])
+
+    with pytest.raises(ValueError):
+        attrs.restore(dataframe, tmp_cachefile)
@@ -1,6 +1,11 @@
+import os
+import time
+
 import pytest
 
 import federleicht.cache as cache
+import federleicht.layout as layout
+from federleicht.manifest import connect
 
 
 @pytest.mark.parametrize(
@@ -55,7 +60,7 @@ def test_clear_cache_expired(tmp_cachefile):
 
 def test_clear_cache_error(mocker, tmp_cachefile):
 
-    mocker.patch("federleicht.cache.delete_cache", side_effect=PermissionError)
+    mocker.patch("federleicht.cache.unlink", side_effect=PermissionError)
 
     assert cache.clear_cache(tmp_cachefile.parent) == 1
 
@@ -70,3 +75,201 @@ def test_clear_cache_different_file(tmp_path):
 
     assert cache.clear_cache(tmp_path) == 0
     assert file.is_file()
+
+
+@pytest.fixture
+def manifest(tmp_cachefile):
+    """
+    manifest with one fresh and one outdated cache file.
+    """
+
+    manifest = connect(tmp_cachefile.parent)
+
+    outdated = tmp_cachefile.with_name("0" * 2 * cache.CACHE.digest)
+    outdated.touch()
+
+    manifest.add(tmp_cachefile.name, "test", 0)
+    manifest.add(outdated.name, "test", 0, created=time.time() - 7200)
+
+    return manifest
+
+
+def test_clear_cache_manifest(manifest, tmp_cachefile, mocker):
+    """
+    check if recorded cache files expire by their creation time in the manifest,
+    without scanning the directory and removed from it in a single transaction.
+    """
+
+    scan = mocker.spy(cache.layout, "scan")
+    remove = mocker.spy(manifest, "remove")
+
+    assert cache.clear_cache(tmp_cachefile.parent, hours=1) == 0
+
+    scan.assert_not_called()
+    remove.assert_called_once()
+
+    assert tmp_cachefile.is_file()
+    assert manifest.keys() == [tmp_cachefile.name]
+
+    assert cache.clear_cache(tmp_cachefile.parent) == 0
+
+    assert not tmp_cachefile.is_file()
+    assert len(manifest) == 0
+
+
+def test_clear_cache_manifest_error(manifest, tmp_cachefile, mocker):
+    """
+    check if entries whose cache file can't be deleted stay in the manifest.
+    """
+
+    mocker.patch("federleicht.cache.unlink", side_effect=PermissionError)
+
+    assert cache.clear_cache(tmp_cachefile.parent) == 2
+    assert len(manifest) == 2
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"hours": 1}])
+@pytest.mark.parametrize("rebuild", [False, True])
+def test_clear_cache_unrecorded(manifest, tmp_cachefile, kwargs, rebuild):
+    """
+    check if cache files missing in the manifest are only cleared with rebuild, which
+    removes entries without a cache file from the manifest as well.
+    """
+
+    unrecorded = tmp_cachefile.with_name("1" * 2 * cache.CACHE.digest)
+    unrecorded.touch()
+    os.utime(unrecorded, (time.time() - 7200,) * 2)
+
+    stale = "2" * 2 * cache.CACHE.digest
+    manifest.add(stale, "test", 0)
+
+    assert cache.clear_cache(tmp_cachefile.parent, rebuild=rebuild, **kwargs) == 0
+
+    assert unrecorded.is_file() is not rebuild
+    assert tmp_cachefile.is_file() is bool(kwargs)
+
+    if not kwargs:
+        assert manifest.keys() == []
+    elif rebuild:
+        assert manifest.keys() == [tmp_cachefile.name]
+    else:
+        assert sorted(manifest.keys()) == sorted([tmp_cachefile.name, stale])
+
+
+def test_delete_cache_manifest(manifest, tmp_cachefile):
+
+    cache.delete_cache(tmp_cachefile)
+
+    assert manifest.get(tmp_cachefile.name) is None
+
+
+def test_evict_cache(tmp_path):
+
+    manifest = connect(tmp_path)
+
+    for i, name in enumerate("abc"):
+        file = tmp_path / (name * 2 * cache.CACHE.digest)
+        file.write_bytes(b"x" * 100)
+        manifest.add(file.name, "test", 100, created=float(i))
+
+    assert cache.evict_cache(tmp_path, max_bytes=300) == 0
+    assert len(manifest) == 3
+
+    assert (
+        cache.evict_cache(tmp_path, max_bytes=150, keep="a" * 2 * cache.CACHE.digest)
+        == 0
+    )
+
+    assert sorted(manifest.keys()) == ["a" * 2 * cache.CACHE.digest]
+    assert sorted(f.name for f in tmp_path.iterdir() if f.suffix == "") == [
+        "a" * 2 * cache.CACHE.digest
+    ]
+
+
+def test_evict_cache_limit(tmp_path):
+
+    manifest = connect(tmp_path)
+
+    for i in range(10):
+        manifest.add(f"{i:0{2 * cache.CACHE.digest}}", "test", 100, created=float(i))
+
+    assert cache.evict_cache(tmp_path, max_bytes=0, limit=4) == 0
+    assert len(manifest) == 6
+
+
+def test_evict_cache_error(tmp_path, mocker):
+
+    connect(tmp_path).add("a" * 2 * cache.CACHE.digest, "test", 100)
+
+    mocker.patch("federleicht.cache.delete_cache", side_effect=PermissionError)
+
+    assert cache.evict_cache(tmp_path, max_bytes=0) == 1
+
+
+@pytest.fixture
+def sharded(tmp_path, cache):
+    """
+    cache file with attributes file in the sharded layout.
+    """
+
+    file = layout.path(tmp_path, cache, sharded=True)
+    file.parent.mkdir(parents=True)
+    file.touch()
+    file.with_suffix(".json").touch()
+
+    return file
+
+
+def test_delete_cache_sharded(sharded, tmp_path):
+
+    manifest = connect(tmp_path)
+    manifest.add(sharded.name, "test", 0)
+
+    cache.delete_cache(sharded)
+
+    assert not sharded.is_file()
+    assert not sharded.with_suffix(".json").is_file()
+    assert len(manifest) == 0
+
+
+@pytest.mark.parametrize("indexed", [True, False])
+def test_clear_cache_sharded(sharded, tmp_path, indexed):
+
+    if indexed is True:
+        connect(tmp_path).add(sharded.name, "test", 0)
+
+    assert cache.clear_cache(tmp_path) == 0
+    assert not sharded.is_file()
+
+
+def test_migrate_cache(sharded, tmp_path):
+
+    flat = layout.path(tmp_path, sharded.name)
+
+    assert cache.migrate_cache(tmp_path, sharded=False) == 0
+    assert flat.is_file() and flat.with_suffix(".json").is_file()
+    assert not sharded.is_file()
+
+    assert cache.migrate_cache(tmp_path, sharded=True) == 0
+    assert sharded.is_file() and sharded.with_suffix(".json").is_file()
+    assert not flat.is_file()
+
+    assert cache.migrate_cache(tmp_path, sharded=True) == 0
+
+
+def test_migrate_cache_error(tmp_cachefile, mocker):
+
+    mocker.patch("federleicht.cache.os.replace", side_effect=PermissionError)
+
+    assert cache.migrate_cache(tmp_cachefile.parent) == 1
+    assert tmp_cachefile.is_file()
+
+
+def test_clear_cache_parquet(tmp_cachefile):
+
+    parquet = tmp_cachefile.with_name(f"{tmp_cachefile.name}.parquet")
+    parquet.touch()
+
+    assert cache.clear_cache(tmp_cachefile.parent) == 0
+    assert not parquet.is_file()
+    assert not tmp_cachefile.is_file()
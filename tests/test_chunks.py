@@ -0,0 +1,112 @@
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+import federleicht.chunks as chunks
+
+
+@pytest.fixture
+def frames():
+    """
+    chunks with a continuing RangeIndex like `pd.read_csv(..., chunksize=2)`.
+    """
+
+    df = pd.DataFrame({"a": range(5), "s": list("abcde")})
+
+    return [df.iloc[0:2], df.iloc[2:4], df.iloc[4:5]]
+
+
+@pytest.mark.parametrize(
+    "memory_map, codec",
+    [(False, None), (False, "zstd"), (True, None)],
+    ids=["default", "zstd", "memory_map"],
+)
+def test_chunks_roundtrip(frames, tmp_cachefile, memory_map, codec):
+
+    written = list(chunks.write(iter(frames), tmp_cachefile, memory_map, codec))
+
+    assert all(w is f for w, f in zip(written, frames))
+
+    replayed = list(chunks.read(tmp_cachefile, memory_map))
+
+    assert len(replayed) == len(frames)
+
+    for replay, frame in zip(replayed, frames):
+        pdt.assert_frame_equal(
+            replay,
+            frame,
+            check_dtype=not memory_map,
+            check_index_type=False if memory_map else "equiv",
+        )
+
+
+def test_chunks_empty(tmp_cachefile):
+
+    assert list(chunks.write(iter([]), tmp_cachefile)) == []
+    assert list(chunks.read(tmp_cachefile)) == []
+
+
+def test_chunks_return(frames, tmp_path):
+
+    def consume(it):
+        result = yield from it
+        return result
+
+    file = tmp_path / "stream"
+    gen = consume(chunks.write(iter(frames), file))
+
+    with pytest.raises(StopIteration) as stop:
+        while True:
+            next(gen)
+
+    assert stop.value.value is True
+
+
+def test_chunks_not_exhausted(frames, tmp_path):
+    """
+    check if the stream is discarded if the generator is closed early.
+    """
+
+    file = tmp_path / "stream"
+    gen = chunks.write(iter(frames), file)
+
+    next(gen)
+    gen.close()
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_chunks_schema_mismatch(frames, tmp_path):
+    """
+    check if all chunks are passed through when a chunk can't be written.
+    """
+
+    frames[1] = pd.DataFrame({"a": ["x", "y"]}, index=[2, 3])
+
+    file = tmp_path / "stream"
+
+    assert list(chunks.write(iter(frames), file)) == frames
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_chunks_error(frames, tmp_path):
+    """
+    check if the stream is discarded if the generator raises.
+    """
+
+    def failing():
+        yield frames[0]
+        raise RuntimeError
+
+    file = tmp_path / "stream"
+
+    with pytest.raises(RuntimeError):
+        list(chunks.write(failing(), file))
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_chunks_read_missing(tmp_path):
+
+    with pytest.raises(FileNotFoundError):
+        chunks.read(tmp_path / "missing")
@@ -0,0 +1,251 @@
+import os
+import subprocess
+import sys
+import time
+
+import pandas as pd
+import pytest
+
+from federleicht import cache_dataframe
+from federleicht.cli import main, parse_age, parse_size, truncated
+from federleicht.manifest import Manifest, connect
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+
+    @cache_dataframe(cache_dir=tmp_path, manifest=True)
+    def small(n):
+        return pd.DataFrame({"n": [n]})
+
+    @cache_dataframe(cache_dir=tmp_path, manifest=True, format="parquet")
+    def large(n):
+        return pd.DataFrame({"n": range(n)})
+
+    _ = [small(n) for n in range(3)]
+    _ = large(10000)
+
+    return tmp_path
+
+
+def files(cache_dir):
+    return sorted(
+        f
+        for _, _, names in os.walk(cache_dir)
+        for f in names
+        if not f.startswith("manifest")
+    )
+
+
+@pytest.mark.parametrize(
+    "size, expected",
+    [("1024", 1024), ("1K", 1024), ("1.5MB", 3 * 2**19), ("2 GiB", 2**31)],
+)
+def test_parse_size(size, expected):
+    assert parse_size(size) == expected
+
+
+@pytest.mark.parametrize(
+    "age, expected",
+    [("90s", 90), ("30m", 1800), ("12h", 43200), ("7d", 604800), ("2w", 1209600)],
+)
+def test_parse_age(age, expected):
+    assert parse_age(age) == expected
+
+
+@pytest.mark.parametrize("value", ["", "1X", "-1d", "d"])
+def test_parse_invalid(value):
+
+    with pytest.raises(Exception):
+        parse_size(value)
+
+    with pytest.raises(Exception):
+        parse_age(value)
+
+
+@pytest.mark.parametrize("scan", [[], ["--scan"]])
+def test_stats(cache_dir, capsys, scan):
+
+    assert main(["--cache-dir", str(cache_dir), *scan, "stats"]) == 0
+
+    out = capsys.readouterr().out
+
+    assert "entries: 4" in out
+    assert "parquet" in out
+    assert "feather" in out
+
+    if not scan:
+        assert "small" in out
+
+
+@pytest.mark.parametrize("sort", ["size", "age", "hits", "name"])
+def test_ls(cache_dir, capsys, sort):
+
+    args = ["--cache-dir", str(cache_dir), "ls", "--sort", sort, "--limit", "2"]
+
+    assert main(args) == 0
+
+    lines = capsys.readouterr().out.splitlines()
+
+    assert lines[0].split() == ["key", "size", "age", "hits", "function"]
+    assert len(lines) == 3
+
+    if sort == "size":
+        assert lines[1].split()[0].endswith(".parquet")
+
+
+def test_prune_dry_run(cache_dir, capsys):
+
+    before = files(cache_dir)
+
+    args = ["--cache-dir", str(cache_dir), "prune", "--function", "*small", "--dry-run"]
+
+    assert main(args) == 0
+    assert "would delete 3 entries" in capsys.readouterr().out
+    assert files(cache_dir) == before
+
+
+@pytest.mark.parametrize("scan", [[], ["--scan"]])
+def test_prune_larger_than(cache_dir, capsys, scan):
+
+    args = ["--cache-dir", str(cache_dir), *scan, "prune", "--larger-than", "10K"]
+
+    assert main(args) == 0
+    assert "deleted 1 entries" in capsys.readouterr().out
+    assert not any(f.endswith(".parquet") for f in files(cache_dir))
+    assert len(connect(cache_dir)) == 3
+
+
+def test_prune_older_than(cache_dir, capsys):
+
+    args = ["--cache-dir", str(cache_dir), "prune", "--older-than", "1h"]
+
+    assert main(args) == 0
+    assert "deleted 0 entries" in capsys.readouterr().out
+
+    manifest = connect(cache_dir)
+
+    with manifest.transaction() as connection:
+        connection.execute("UPDATE entries SET created = ?", (time.time() - 7200,))
+
+    assert main(args) == 0
+    assert "deleted 4 entries" in capsys.readouterr().out
+    assert files(cache_dir) == []
+    assert len(manifest) == 0
+
+
+def test_prune_requires_filter(cache_dir):
+
+    assert main(["--cache-dir", str(cache_dir), "prune"]) == 2
+
+
+def test_prune_without_manifest(cache_dir, capsys):
+
+    connect(cache_dir).close()
+    os.remove(Manifest(cache_dir).file)
+
+    args = ["--cache-dir", str(cache_dir), "prune", "--older-than", "0s"]
+
+    assert main(args) == 0
+    assert "deleted 4 entries" in capsys.readouterr().out
+    assert files(cache_dir) == []
+
+
+@pytest.mark.parametrize("scan", [[], ["--scan"]])
+def test_prune_function_without_manifest(cache_dir, capsys, scan):
+
+    if not scan:
+        connect(cache_dir).close()
+        os.remove(Manifest(cache_dir).file)
+
+    before = files(cache_dir)
+
+    args = ["--cache-dir", str(cache_dir), *scan, "prune", "--function", "*small"]
+
+    assert main(args) == 2
+    assert "requires the manifest" in capsys.readouterr().err
+    assert files(cache_dir) == before
+
+
+def test_prune_unrecorded(cache_dir, capsys):
+
+    @cache_dataframe(cache_dir=cache_dir)
+    def unrecorded(n):
+        return pd.DataFrame({"n": [n]})
+
+    _ = unrecorded(1)
+
+    assert main(["--cache-dir", str(cache_dir), "stats"]) == 0
+    assert "entries: 5" in capsys.readouterr().out
+
+    args = ["--cache-dir", str(cache_dir), "prune", "--function", "*small"]
+
+    assert main(args) == 0
+
+    captured = capsys.readouterr()
+
+    assert "deleted 3 entries" in captured.out
+    assert "1 entries are missing in the manifest" in captured.err
+
+    args = ["--cache-dir", str(cache_dir), "prune", "--older-than", "0s"]
+
+    assert main(args) == 0
+    assert "deleted 2 entries" in capsys.readouterr().out
+    assert files(cache_dir) == []
+
+
+def test_verify(cache_dir, capsys):
+
+    args = ["--cache-dir", str(cache_dir), "verify"]
+
+    assert main(args) == 0
+    assert "4 files, 0 invalid" in capsys.readouterr().out
+
+    file = next(
+        os.path.join(root, f)
+        for root, _, names in os.walk(cache_dir)
+        for f in names
+        if f.startswith(tuple("0123456789abcdef")) and "." not in f
+    )
+
+    with open(file, "r+b") as f:
+        f.truncate(os.path.getsize(file) // 2)
+
+    assert main(args) == 1
+    assert "1 invalid" in capsys.readouterr().out
+
+    assert main([*args, "--delete"]) == 0
+    assert not os.path.exists(file)
+    assert main(args) == 0
+
+
+@pytest.mark.parametrize(
+    "name, content, valid",
+    [
+        ("a" * 32, b"ARROW1\x00\x00" + b"\x00" * 8 + b"\x08\x00\x00\x00ARROW1", True),
+        ("a" * 32, b"ARROW1\x00\x00" + b"\x00" * 8, False),
+        ("a" * 32, b"", False),
+        ("a" * 32 + ".parquet", b"PAR1" + b"\x00" * 8 + b"PAR1", True),
+        ("a" * 32 + ".parquet", b"PAR1" + b"\x00" * 8, False),
+        ("a" * 32 + ".arrows", b"\x00" * 8 + b"\xff\xff\xff\xff\x00\x00\x00\x00", True),
+        ("a" * 32 + ".arrows", b"\x00" * 16, False),
+    ],
+)
+def test_truncated(tmp_path, name, content, valid):
+
+    file = tmp_path / name
+    file.write_bytes(content)
+
+    assert (truncated(str(file)) is None) is valid
+
+
+def test_module(tmp_path):
+
+    result = subprocess.run(
+        [sys.executable, "-m", "federleicht", "--cache-dir", str(tmp_path), "stats"],
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.returncode == 0
+    assert "entries: 0" in result.stdout
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import federleicht.compression as compression
+
+
+@pytest.fixture
+def frame() -> pd.DataFrame:
+    """
+    well compressible dataframe.
+    """
+
+    return pd.DataFrame(
+        {
+            "a": np.repeat(np.arange(100), 1000),
+            "b": ["foo", "bar"] * 50000,
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "codec, level",
+    [
+        (None, None),
+        ("auto", None),
+        ("lz4", None),
+        ("zstd", None),
+        ("zstd", 9),
+        ("uncompressed", None),
+    ],
+    ids=str,
+)
+def test_compression_validate(codec, level):
+
+    assert compression.validate(codec, level) is None
+
+
+@pytest.mark.parametrize(
+    "codec, level, memory_map",
+    [
+        ("gzip", None, False),
+        ("lz4", 3, False),
+        (None, 3, False),
+        ("zstd", None, True),
+        ("auto", None, True),
+    ],
+    ids=str,
+)
+def test_compression_validate_raises(codec, level, memory_map):
+
+    with pytest.raises(ValueError):
+        compression.validate(codec, level, memory_map)
+
+
+def test_compression_profile(frame):
+
+    profiles = compression.profile(frame)
+
+    assert {p.codec for p in profiles} == set(compression.CODECS)
+
+    sizes = {p.codec: p.nbytes for p in profiles}
+    assert sizes["zstd"] < sizes["uncompressed"]
+
+
+@pytest.mark.parametrize(
+    "bandwidth, codecs",
+    [
+        (1, ("zstd",)),
+        (float("inf"), compression.CODECS),
+    ],
+    ids=["slow", "fast"],
+)
+def test_compression_choose(frame, bandwidth, codecs):
+    """
+    check if a slow storage chooses the strongest compression.
+    """
+
+    codec, _ = compression.choose(frame, bandwidth)
+
+    assert codec in codecs
+
+
+def test_compression_choose_empty():
+
+    codec, level = compression.choose(pd.DataFrame())
+
+    assert codec == compression.default()
+    assert level is None
@@ -0,0 +1,103 @@
+import json
+
+import pytest
+
+import federleicht.args as args
+import federleicht.content as content
+from federleicht.config import CACHE
+
+
+@pytest.fixture
+def memo(tmp_path) -> content.ContentMemo:
+    return content.ContentMemo(tmp_path / "cache")
+
+
+@pytest.fixture
+def datafile(tmp_path):
+    file = tmp_path / "data.csv"
+    file.write_text("a,b\n1,2\n")
+    return file
+
+
+def test_content_digest(datafile, tmp_path):
+    """
+    check if the digest only depends on the content and not on the read chunks.
+    """
+
+    copy = tmp_path / "copy.csv"
+    copy.write_bytes(datafile.read_bytes())
+
+    assert content.digest(datafile) == content.digest(copy)
+    assert content.digest(datafile, chunksize=3) == content.digest(datafile)
+    assert content.digest(datafile) == args.hash(datafile.read_bytes()).hexdigest()
+
+
+def test_content_memo_persistent(memo, datafile, mocker):
+    """
+    check if unchanged files are read only once, even from a new memo instance.
+    """
+
+    spy = mocker.spy(content, "digest")
+
+    first = memo.digest(datafile)
+    assert memo.digest(datafile) == first
+
+    other = content.ContentMemo(memo.file.parent)
+    assert other.digest(datafile) == first
+
+    assert spy.call_count == 1
+    assert memo.file.name == CACHE.content
+    assert first in json.loads(memo.file.read_text()).values()
+
+
+def test_content_memo_modified(memo, datafile):
+
+    first = memo.digest(datafile)
+
+    datafile.write_text("a,b\n3,4\n")
+
+    assert memo.digest(datafile) != first
+
+
+def test_content_memo_corrupt(memo, datafile):
+
+    memo.file.parent.mkdir(parents=True)
+    memo.file.write_text("[not a dict")
+
+    assert memo.digest(datafile) == content.digest(datafile)
+
+
+def test_content_memo_max_entries(tmp_path):
+
+    memo = content.ContentMemo(tmp_path / "cache", max_entries=2)
+
+    for i in range(3):
+        file = tmp_path / f"{i}.txt"
+        file.write_text(str(i))
+        memo.digest(file)
+
+    assert len(json.loads(memo.file.read_text())) == 2
+
+
+def test_content_encoder_copy(memo, datafile, tmp_path):
+    """
+    check if a file copied with identical bytes has the same hash with content mode.
+    """
+
+    encoder = memo.encoder()
+
+    before = args.serialize(datafile, encoder)
+    stat = args.serialize(datafile)
+
+    datafile.write_bytes(datafile.read_bytes())
+
+    assert args.serialize(datafile, encoder) == before
+    assert stat != before
+
+
+def test_content_encoder_directory(memo, tmp_path):
+    """
+    check if directories are still fingerprinted by size and modification time.
+    """
+
+    assert memo.encoder()(tmp_path) == args.json_encoder(tmp_path)
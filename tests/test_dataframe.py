@@ -1,12 +1,22 @@
+import asyncio
+import inspect
 import pathlib
+import threading
+import time
 
+import numpy as np
 import pandas as pd
 import pandas.testing as pdt
+import pyarrow as pa
+import pyarrow.compute as pc
 import pytest
 from pathlibutil import Path
 
-from federleicht import from_cache
+import federleicht.args as args
+import federleicht.feather as feather
+from federleicht import flush, from_cache
 from federleicht.dataframe import cache_dataframe, is_expired
+from federleicht.manifest import connect
 
 
 @pytest.mark.parametrize(
@@ -135,3 +145,779 @@ def test_dataframe_args(dataframe: pd.DataFrame, tmp_path: pathlib.Path):
 
     df = wrapped()
     assert from_cache(df) is True
+
+
+def test_dataframe_memory_map(dataframe, mock_hash):
+
+    @cache_dataframe(memory_map=True)
+    def wrapped():
+        return dataframe
+
+    _ = wrapped()
+    df = wrapped()
+
+    assert from_cache(df) is True
+    assert all(isinstance(dtype, pd.ArrowDtype) for dtype in df.dtypes)
+    pdt.assert_frame_equal(df, dataframe, check_dtype=False)
+
+
+def test_dataframe_memory(dataframe, mock_hash, mocker):
+
+    @cache_dataframe(memory=2**20)
+    def wrapped():
+        return dataframe
+
+    _ = wrapped()
+
+    read = mocker.patch("federleicht.feather.read")
+
+    df = wrapped()
+
+    read.assert_not_called()
+    assert from_cache(df) is True
+    assert df is not dataframe
+    assert wrapped.memory.nbytes > 0
+    pdt.assert_frame_equal(df, dataframe)
+
+
+def test_dataframe_memory_expires(dataframe, mock_hash):
+
+    @cache_dataframe(memory=2**20, expires=-60)
+    def wrapped():
+        return dataframe
+
+    _ = wrapped()
+    df = wrapped()
+
+    assert df is dataframe, "Memory entry should be expired as well."
+
+
+def test_dataframe_content_hash(dataframe: pd.DataFrame, tmp_path: pathlib.Path):
+
+    file = tmp_path / "data.csv"
+    file.write_text("a,b\n1,2\n")
+
+    @cache_dataframe(cache_dir=tmp_path / "cache", content_hash=True)
+    def wrapped(file):
+        return dataframe
+
+    assert from_cache(wrapped(file)) is False
+
+    file.write_bytes(file.read_bytes())
+
+    assert from_cache(wrapped(file)) is True
+
+
+def test_dataframe_compression(dataframe, mock_hash):
+
+    @cache_dataframe(compression="zstd", compression_level=5)
+    def wrapped():
+        return dataframe
+
+    _ = wrapped()
+
+    assert feather.metadata(mock_hash)["compression"] == "zstd"
+    pdt.assert_frame_equal(wrapped(), dataframe)
+
+
+def test_dataframe_compression_memory_map():
+
+    with pytest.raises(ValueError):
+        cache_dataframe(lambda: None, compression="lz4", memory_map=True)
+
+
+def test_dataframe_async(dataframe, mock_hash):
+
+    @cache_dataframe
+    async def wrapped():
+        return dataframe
+
+    assert inspect.iscoroutinefunction(wrapped)
+
+    df = asyncio.run(wrapped())
+    assert df is dataframe, "First call should return the dataframe."
+    assert mock_hash.is_file(), "Cache file should exist."
+
+    df = asyncio.run(wrapped())
+    assert from_cache(df) is True
+    pdt.assert_frame_equal(df, dataframe)
+
+
+def test_dataframe_async_executor(dataframe, tmp_path, mocker):
+    """
+    check if reading the cache file is not blocking the event loop.
+    """
+
+    @cache_dataframe(cache_dir=tmp_path)
+    async def wrapped():
+        return dataframe
+
+    async def main():
+        await wrapped()
+
+        spy = mocker.spy(asyncio.get_running_loop(), "run_in_executor")
+        df = await wrapped()
+
+        return df, spy
+
+    df, spy = asyncio.run(main())
+
+    assert from_cache(df) is True
+    assert spy.call_count == 2
+
+
+def test_dataframe_write_behind(dataframe, mock_hash, mocker):
+
+    event = threading.Event()
+    write = feather.write
+
+    def slow_write(*args, **kwargs):
+        event.wait()
+        return write(*args, **kwargs)
+
+    mocker.patch("federleicht.feather.write", side_effect=slow_write)
+
+    @cache_dataframe(write_behind=True)
+    def wrapped():
+        return dataframe
+
+    df = wrapped()
+
+    assert df is dataframe, "DataFrame should be returned before it is written."
+    assert not mock_hash.is_file()
+
+    df.loc[0, "a"] = 99
+
+    event.set()
+    assert flush() == 0
+
+    pdt.assert_frame_equal(feather.read(mock_hash), wrapped())
+    assert feather.read(mock_hash).loc[0, "a"] == 1, "Snapshot should be written."
+
+
+@pytest.mark.parametrize("write_behind", [False, True])
+def test_dataframe_single_flight(dataframe, tmp_path, write_behind):
+    """
+    check if concurrent misses compute the dataframe only once.
+    """
+
+    calls = []
+
+    @cache_dataframe(
+        cache_dir=tmp_path,
+        single_flight=True,
+        write_behind=write_behind,
+    )
+    def wrapped():
+        calls.append(1)
+        time.sleep(0.1)
+        return dataframe
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(wrapped())) for _ in range(8)
+    ]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    flush()
+
+    assert len(calls) == 1
+    assert sum(from_cache(df) for df in results) == 7
+    assert [f.name for f in Path(tmp_path).iterdir() if f.suffix == ".lock"] == []
+
+
+def test_dataframe_single_flight_timeout(dataframe, mock_hash, mocker):
+
+    mocker.patch("federleicht.lock.SingleFlight.acquire", return_value=False)
+
+    @cache_dataframe(single_flight=True, lock_timeout=0)
+    def wrapped():
+        return dataframe
+
+    assert wrapped() is dataframe
+    assert from_cache(wrapped()) is True
+
+
+def test_dataframe_single_flight_async(dataframe, tmp_path):
+
+    @cache_dataframe(cache_dir=tmp_path, single_flight=True)
+    async def wrapped():
+        await asyncio.sleep(0.05)
+        return dataframe
+
+    async def main():
+        return await asyncio.gather(*(wrapped() for _ in range(16)))
+
+    results = asyncio.run(main())
+
+    assert sum(from_cache(df) for df in results) == 15
+
+
+def test_dataframe_manifest(dataframe, tmp_path):
+
+    @cache_dataframe(cache_dir=tmp_path, manifest=True)
+    def wrapped(value):
+        return dataframe
+
+    _ = wrapped(1)
+    _ = wrapped(1)
+    _ = wrapped(1)
+
+    (entry,) = connect(tmp_path).entries()
+
+    assert entry.function.endswith("wrapped")
+    assert entry.hits == 2
+    assert entry.size == Path(tmp_path).joinpath(entry.key).stat().st_size
+
+
+@pytest.mark.parametrize("eviction", ["lru", "lfu"])
+def test_dataframe_max_bytes(dataframe, tmp_path, eviction):
+
+    @cache_dataframe(cache_dir=tmp_path, max_bytes=1, eviction=eviction)
+    def wrapped(value):
+        return dataframe
+
+    _ = wrapped(1)
+    _ = wrapped(2)
+
+    assert from_cache(wrapped(2)) is True, "Newest entry should be kept."
+    assert from_cache(wrapped(1)) is False, "Oldest entry should be evicted."
+    assert len(connect(tmp_path)) == 1
+
+
+def test_dataframe_eviction_invalid():
+
+    with pytest.raises(ValueError):
+        cache_dataframe(lambda: None, max_bytes=1, eviction="fifo")
+
+
+def test_dataframe_sharded(dataframe, tmp_path):
+
+    @cache_dataframe(cache_dir=tmp_path, sharded=True)
+    def wrapped():
+        return dataframe
+
+    _ = wrapped()
+    df = wrapped()
+
+    assert from_cache(df) is True
+
+    file = df.attrs["from_cache"]
+
+    assert file.parent.parent.parent == tmp_path
+    assert file.parent.parent.name + file.parent.name == file.name[:4]
+
+
+@pytest.mark.parametrize("memory", [None, 2**20])
+def test_dataframe_columns(dataframe, tmp_path, mocker, memory):
+
+    @cache_dataframe(cache_dir=tmp_path, memory=memory)
+    def wrapped(value):
+        return dataframe
+
+    projected = wrapped.columns("b")
+
+    miss = projected(1)
+
+    assert from_cache(miss) is False
+    pdt.assert_frame_equal(miss, dataframe[["b"]])
+
+    read = mocker.spy(feather.feather, "read_table")
+    hit = projected(1)
+
+    assert from_cache(hit) is True
+    pdt.assert_frame_equal(hit, dataframe[["b"]])
+
+    if memory is None:
+        assert read.call_args.kwargs["columns"] == ["b"]
+
+    pdt.assert_frame_equal(wrapped(1), dataframe)
+
+
+def test_dataframe_columns_key(dataframe, tmp_path):
+    """
+    check if the projection reuses the cache file of the full DataFrame.
+    """
+
+    @cache_dataframe(cache_dir=tmp_path)
+    def wrapped():
+        return dataframe
+
+    _ = wrapped()
+
+    assert from_cache(wrapped.columns("a")()) is True
+
+
+def test_dataframe_columns_async(dataframe, tmp_path):
+
+    @cache_dataframe(cache_dir=tmp_path)
+    async def wrapped():
+        return dataframe
+
+    projected = wrapped.columns("a")
+
+    assert inspect.iscoroutinefunction(projected)
+
+    miss = asyncio.run(projected())
+    hit = asyncio.run(projected())
+
+    assert from_cache(miss) is False
+    assert from_cache(hit) is True
+    pdt.assert_frame_equal(hit, dataframe[["a"]])
+
+
+@pytest.mark.parametrize("memory", [None, 2**20])
+def test_dataframe_filter(tmp_path, memory):
+
+    dataframe = pd.DataFrame(
+        {"a": [1, 2, 3, 4], "status": ["ok", "error", "ok", "error"]},
+    )
+
+    @cache_dataframe(cache_dir=tmp_path, memory=memory)
+    def wrapped():
+        return dataframe
+
+    ok = wrapped.filter(pc.field("status") == "ok")
+    expected = dataframe.iloc[[0, 2]].reset_index(drop=True)
+
+    miss = ok()
+    hit = ok()
+
+    assert from_cache(miss) is False
+    assert from_cache(hit) is True
+
+    pdt.assert_frame_equal(miss, expected)
+    pdt.assert_frame_equal(hit, expected)
+
+    pdt.assert_frame_equal(wrapped(), dataframe)
+
+
+def test_dataframe_filter_chained(tmp_path):
+
+    dataframe = pd.DataFrame({"a": [1, 2, 3, 4], "b": [5, 6, 7, 8]})
+
+    @cache_dataframe(cache_dir=tmp_path)
+    def wrapped():
+        return dataframe
+
+    _ = wrapped()
+
+    query = wrapped.filter(pc.field("a") > 1).columns("b").filter(pc.field("b") < 8)
+    df = query()
+
+    assert from_cache(df) is True
+    pdt.assert_frame_equal(df, dataframe.iloc[[1, 2]][["b"]].reset_index(drop=True))
+
+
+@pytest.mark.parametrize("format", ["feather", "parquet"])
+def test_dataframe_format(dataframe, tmp_path, format):
+
+    @cache_dataframe(cache_dir=tmp_path, format=format, cache_attrs=True)
+    def wrapped():
+        df = dataframe.copy()
+        df.attrs["format"] = format
+        return df
+
+    _ = wrapped()
+    df = wrapped()
+
+    assert from_cache(df) is True
+    assert df.attrs["format"] == format
+    pdt.assert_frame_equal(df, dataframe, check_flags=False)
+
+    file = df.attrs["from_cache"]
+    assert file.name.endswith(".parquet") is (format == "parquet")
+
+
+def test_dataframe_format_coexist(dataframe, tmp_path):
+    """
+    check if feather and parquet files of the same call coexist.
+    """
+
+    def create():
+        return dataframe
+
+    feather_cached = cache_dataframe(create, cache_dir=tmp_path)
+    parquet_cached = cache_dataframe(create, cache_dir=tmp_path, format="parquet")
+
+    _ = feather_cached()
+    _ = parquet_cached()
+
+    files = sorted(f.name for f in tmp_path.iterdir())
+
+    assert len(files) == 2
+    assert files[0] + ".parquet" != files[1]
+
+    assert from_cache(feather_cached()) is True
+    assert from_cache(parquet_cached()) is True
+
+
+def test_dataframe_format_filter(tmp_path):
+
+    dataframe = pd.DataFrame({"a": [1, 2, 3, 4], "b": list("wxyz")})
+
+    @cache_dataframe(cache_dir=tmp_path, format="parquet", manifest=True)
+    def wrapped():
+        return dataframe
+
+    _ = wrapped()
+    df = wrapped.filter(pc.field("a") > 2).columns("b")()
+
+    assert from_cache(df) is True
+    pdt.assert_frame_equal(df, dataframe.iloc[2:][["b"]].reset_index(drop=True))
+    assert connect(tmp_path).get(df.attrs["from_cache"].name).hits == 1
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"format": "csv"},
+        {"format": "parquet", "memory_map": True},
+    ],
+)
+def test_dataframe_format_invalid(kwargs):
+
+    with pytest.raises(ValueError):
+        cache_dataframe(lambda: None, **kwargs)
+
+
+@pytest.mark.parametrize("format", ["feather", "parquet"])
+def test_dataframe_chunksize(dataframe, tmp_path, format):
+
+    @cache_dataframe(cache_dir=tmp_path, chunksize=2, format=format)
+    def wrapped():
+        return dataframe
+
+    _ = wrapped()
+    df = wrapped()
+
+    assert from_cache(df) is True
+    pdt.assert_frame_equal(df, dataframe)
+
+
+def test_dataframe_chunksize_invalid():
+
+    with pytest.raises(ValueError):
+        cache_dataframe(lambda: None, chunksize=0)
+
+
+@pytest.fixture
+def generator(tmp_path):
+    """
+    cached generator function yielding three chunks and counting its calls.
+    """
+
+    df = pd.DataFrame({"a": range(5), "b": list("abcde")})
+    calls = []
+
+    @cache_dataframe(cache_dir=tmp_path, manifest=True)
+    def wrapped(chunksize):
+        calls.append(chunksize)
+
+        for start in range(0, len(df), chunksize):
+            yield df.iloc[slice(start, start + chunksize)]
+
+    wrapped.calls = calls
+    wrapped.df = df
+
+    return wrapped
+
+
+def test_dataframe_generator(generator, tmp_path):
+
+    assert inspect.isgeneratorfunction(generator)
+
+    miss = list(generator(2))
+    hit = list(generator(2))
+
+    assert generator.calls == [2]
+    assert [from_cache(df) for df in miss] == [False] * 3
+    assert [from_cache(df) for df in hit] == [True] * 3
+
+    pdt.assert_frame_equal(pd.concat(hit), generator.df)
+
+    file = hit[0].attrs["from_cache"]
+
+    assert file.name.endswith(".arrows")
+    assert connect(tmp_path).get(file.name).hits == 1
+
+
+def test_dataframe_generator_partial(generator):
+    """
+    check if a partially consumed generator is not cached.
+    """
+
+    gen = generator(2)
+    next(gen)
+    gen.close()
+
+    _ = list(generator(2))
+
+    assert generator.calls == [2, 2]
+
+
+def test_dataframe_generator_columns(generator):
+
+    _ = list(generator(2))
+    hit = list(generator.columns("b")(2))
+
+    pdt.assert_frame_equal(pd.concat(hit), generator.df[["b"]])
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"memory": 2**20},
+        {"cache_attrs": True},
+        {"write_behind": True},
+        {"single_flight": True},
+        {"format": "parquet"},
+    ],
+)
+def test_dataframe_generator_invalid(kwargs):
+
+    def chunks():
+        yield pd.DataFrame()
+
+    with pytest.raises(ValueError):
+        cache_dataframe(chunks, **kwargs)
+
+
+@pytest.mark.parametrize("format", ["feather", "parquet"])
+def test_dataframe_table(tmp_path, format):
+
+    table = pa.table({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+
+    @cache_dataframe(cache_dir=tmp_path, format=format, cache_attrs=True)
+    def wrapped():
+        return table
+
+    assert from_cache(wrapped()) is False
+
+    result = wrapped()
+
+    assert isinstance(result, pa.Table)
+    assert from_cache(result) is True
+    assert result.equals(table)
+    assert wrapped.filter(pc.field("a") > 2)().equals(table.slice(2))
+
+
+def test_dataframe_table_memory(tmp_path):
+
+    table = pa.table({"a": [1, 2, 3]})
+
+    @cache_dataframe(cache_dir=tmp_path, memory=2**20, write_behind=True)
+    def wrapped():
+        return table
+
+    assert wrapped() is table
+    flush()
+
+    result = wrapped.columns("a")()
+
+    assert from_cache(result) is True
+    assert result.equals(table)
+    assert len(wrapped.memory) == 1
+
+
+def test_dataframe_table_argument(tmp_path):
+
+    @cache_dataframe(cache_dir=tmp_path)
+    def wrapped(table):
+        return table.to_pandas()
+
+    _ = wrapped(pa.table({"a": [1, 2, 3]}))
+
+    assert from_cache(wrapped(pa.table({"a": [1, 2, 3]}))) is True
+    assert from_cache(wrapped(pa.table({"a": [1, 2, 4]}))) is False
+
+
+def square(n):
+    """module-level function for process pools."""
+
+    return pd.DataFrame({"n": [n], "square": [n * n]})
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_dataframe_map(tmp_path, executor):
+
+    wrapped = cache_dataframe(square, cache_dir=tmp_path, manifest=True)
+
+    _ = wrapped(2)
+
+    result = wrapped.map([3, (2,), {"n": 1}, 3], max_workers=2, executor=executor)
+
+    assert [df["n"].item() for df in result] == [3, 2, 1, 3]
+    assert [from_cache(df) for df in result] == [False, True, False, False]
+    assert len(connect(tmp_path)) == 3
+
+    df = wrapped.columns("square").map(range(4), executor=executor, concat=True)
+
+    assert df["square"].tolist() == [0, 1, 4, 9]
+    assert list(df.columns) == ["square"]
+
+
+def test_dataframe_map_error(tmp_path):
+
+    @cache_dataframe(cache_dir=tmp_path)
+    def wrapped(n):
+        if n < 0:
+            raise ValueError(n)
+
+        return pd.DataFrame({"n": [n]})
+
+    with pytest.raises(ValueError):
+        wrapped.map([1, -1])
+
+    assert from_cache(wrapped(1)) is True
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"executor": "interpreter"},
+        {"executor": "process"},
+    ],
+)
+def test_dataframe_map_invalid(tmp_path, kwargs):
+
+    @cache_dataframe(cache_dir=tmp_path)
+    def wrapped(n):
+        return pd.DataFrame({"n": [n]})
+
+    with pytest.raises(ValueError):
+        wrapped.map([1], **kwargs)
+
+
+def test_dataframe_cache_info(tmp_path):
+
+    events = []
+
+    @cache_dataframe(cache_dir=tmp_path, on_event=events.append)
+    def wrapped(n):
+        if n < 0:
+            raise ValueError(n)
+
+        return pd.DataFrame({"n": [n]})
+
+    _ = wrapped(1)
+    _ = wrapped(1)
+
+    with pytest.raises(ValueError):
+        wrapped(-1)
+
+    info = wrapped.cache_info()
+
+    assert (info.hits, info.misses, info.expirations, info.errors) == (1, 2, 0, 1)
+    assert info.bytes_written == info.bytes_read > 0
+    assert info.timings["hash"].count == 3
+    assert info.timings["compute"].count == 1
+    assert info.timings["write"].count == 1
+    assert info.timings["read"].count == 1
+    assert info.function.endswith("wrapped")
+    assert {e.event for e in events} == {
+        "hash",
+        "miss",
+        "compute",
+        "write",
+        "read",
+        "hit",
+        "error",
+    }
+
+    wrapped.stats.clear()
+    assert wrapped.cache_info().hits == 0
+
+
+def test_dataframe_cache_info_expired(tmp_path):
+
+    @cache_dataframe(cache_dir=tmp_path, expires=-1)
+    def wrapped():
+        return pd.DataFrame({"n": [1]})
+
+    _ = wrapped()
+    _ = wrapped()
+
+    info = wrapped.cache_info()
+
+    assert (info.hits, info.misses, info.expirations) == (0, 2, 1)
+
+
+def test_dataframe_argument_frozen(tmp_path, mocker):
+    """
+    check if a DataFrame argument backed by pyarrow is hashed only on the first call.
+    """
+
+    @cache_dataframe(cache_dir=tmp_path)
+    def total(df):
+        return pd.DataFrame({"sum": [int(df["a"].sum())]})
+
+    obj = pd.DataFrame({"a": pd.array(range(1000), dtype="int64[pyarrow]")})
+    spy = mocker.spy(args, "digest")
+
+    assert from_cache(total(obj)) is False
+    assert from_cache(total(obj)) is True
+    assert spy.call_count == 1
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        pd.DataFrame({"a": range(1000)}),
+        pd.DataFrame({"a": pd.array(range(1000), dtype="int64[pyarrow]")}),
+        np.arange(1000),
+    ],
+    ids=["DataFrame", "arrow", "ndarray"],
+)
+def test_dataframe_argument_mutated(tmp_path, obj):
+    """
+    check if an in-place edit of an argument outside any sample is a miss.
+    """
+
+    @cache_dataframe(cache_dir=tmp_path)
+    def total(values):
+        return pd.DataFrame({"sum": [int(np.sum(values))]})
+
+    assert total(obj)["sum"].item() == 499500
+    assert from_cache(total(obj)) is True
+
+    if isinstance(obj, pd.DataFrame):
+        obj.loc[5, "a"] = 10**6
+    else:
+        obj[5] = 10**6
+
+    df = total(obj)
+
+    assert from_cache(df) is False
+    assert df["sum"].item() == 1499495
+
+
+def test_dataframe_attrs_invalid(tmp_path):
+    """
+    check if a partially written attributes file is recomputed like a miss.
+    """
+
+    calls = []
+
+    @cache_dataframe(cache_dir=tmp_path, cache_attrs=True)
+    def create():
+        calls.append(1)
+        df = pd.DataFrame({"a": [1]})
+        df.attrs["name"] = "test"
+        return df
+
+    _ = create()
+    file = next(tmp_path.glob("*.json"))
+    file.write_text(file.read_text()[:10])
+
+    df = create()
+
+    assert len(calls) == 2
+    assert from_cache(df) is False
+    assert df.attrs == {"name": "test"}
+    assert from_cache(create()) is True
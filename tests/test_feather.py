@@ -0,0 +1,315 @@
+import pandas as pd
+import pandas.testing as pdt
+import pyarrow
+import pyarrow.compute as pc
+import pytest
+
+import federleicht.compression as compression
+import federleicht.feather as feather
+
+
+@pytest.mark.parametrize(
+    "memory_map",
+    [False, True],
+    ids=["read", "memory_map"],
+)
+def test_feather_roundtrip(memory_map, dataframe, tmp_cachefile):
+    """
+    check if the dataframe is the same after writing and reading it.
+    """
+
+    feather.write(dataframe, tmp_cachefile, memory_map)
+
+    df = feather.read(tmp_cachefile, memory_map)
+
+    pdt.assert_frame_equal(df, dataframe, check_dtype=not memory_map)
+
+
+def test_feather_memory_map_zero_copy(tmp_cachefile):
+    """
+    check if memory-mapped files are read without allocating memory for the columns.
+    """
+
+    dataframe = pd.DataFrame({"a": range(100_000), "b": range(100_000)})
+
+    feather.write(dataframe, tmp_cachefile, memory_map=True)
+
+    allocated = pyarrow.total_allocated_bytes()
+    df = feather.read(tmp_cachefile, memory_map=True)
+
+    assert pyarrow.total_allocated_bytes() - allocated < 1024
+    assert len(df) == len(dataframe)
+
+
+def test_feather_memory_map_dtypes(dataframe, tmp_cachefile):
+    """
+    check if memory-mapped dataframes are backed by pyarrow.
+    """
+
+    feather.write(dataframe, tmp_cachefile, memory_map=True)
+
+    df = feather.read(tmp_cachefile, memory_map=True)
+
+    assert all(isinstance(dtype, pd.ArrowDtype) for dtype in df.dtypes)
+
+
+def test_feather_memory_map_filenotfound(tmp_path):
+    """
+    check if a missing file raises a FileNotFoundError to trigger a cache miss.
+    """
+
+    with pytest.raises(FileNotFoundError):
+        feather.read(tmp_path / "missing", memory_map=True)
+
+
+@pytest.mark.parametrize(
+    "codec, level",
+    [
+        ("lz4", None),
+        ("zstd", 7),
+        ("uncompressed", None),
+        (None, None),
+    ],
+    ids=str,
+)
+def test_feather_compression_metadata(codec, level, dataframe, tmp_cachefile):
+    """
+    check if the chosen codec is stored in the metadata of the file.
+    """
+
+    feather.write(dataframe, tmp_cachefile, codec=codec, level=level)
+
+    metadata = feather.metadata(tmp_cachefile)
+
+    assert metadata["compression"] == (codec or "lz4")
+    assert metadata["compression_level"] == level
+    pdt.assert_frame_equal(feather.read(tmp_cachefile), dataframe)
+
+
+def test_feather_compression_auto(dataframe, tmp_cachefile, mocker):
+
+    mocker.patch("federleicht.compression.choose", return_value=("zstd", 3))
+
+    feather.write(dataframe, tmp_cachefile, codec="auto")
+
+    assert feather.metadata(tmp_cachefile)["compression"] == "zstd"
+    assert feather.metadata(tmp_cachefile)["compression_level"] == 3
+
+
+def test_feather_metadata_foreign(dataframe, tmp_cachefile):
+    """
+    check if files written by pandas have empty metadata.
+    """
+
+    dataframe.to_feather(tmp_cachefile)
+
+    assert feather.metadata(tmp_cachefile) == {}
+
+
+def test_feather_write_atomic(dataframe, tmp_cachefile, mocker):
+    """
+    check if a failed write leaves neither a partial nor a temporary file.
+    """
+
+    tmp_cachefile.unlink()
+
+    mocker.patch("pyarrow.feather.write_feather", side_effect=OSError)
+
+    with pytest.raises(OSError):
+        feather.write(dataframe, tmp_cachefile)
+
+    assert list(tmp_cachefile.parent.iterdir()) == []
+
+
+@pytest.mark.parametrize(
+    "index",
+    [
+        pd.RangeIndex(3),
+        pd.Index(["x", "y", "z"], name="key"),
+        pd.MultiIndex.from_tuples([(1, "x"), (1, "y"), (2, "x")]),
+    ],
+    ids=["range", "named", "multi"],
+)
+@pytest.mark.parametrize("memory_map", [False, True], ids=["read", "memory_map"])
+def test_feather_columns(dataframe, tmp_cachefile, index, memory_map):
+    """
+    check if only the requested columns are read and the index is restored.
+    """
+
+    dataframe = dataframe.set_axis(index)
+
+    feather.write(dataframe, tmp_cachefile, memory_map)
+
+    df = feather.read(tmp_cachefile, memory_map, columns=["b"])
+
+    pdt.assert_frame_equal(
+        df,
+        dataframe[["b"]],
+        check_dtype=not memory_map,
+        check_index_type=not memory_map,
+    )
+
+
+def test_feather_columns_unknown(dataframe, tmp_cachefile):
+
+    feather.write(dataframe, tmp_cachefile)
+
+    with pytest.raises(Exception):
+        feather.read(tmp_cachefile, columns=["missing"])
+
+
+@pytest.mark.parametrize("memory_map", [False, True], ids=["read", "memory_map"])
+def test_feather_filter(tmp_cachefile, memory_map):
+    """
+    check if only the matching rows are read and the index is restored.
+    """
+
+    dataframe = pd.DataFrame(
+        {"a": [1, 2, 3, 4], "status": ["ok", "error", "ok", "error"]},
+        index=pd.Index([10, 20, 30, 40], name="key"),
+    )
+
+    feather.write(dataframe, tmp_cachefile, memory_map)
+
+    df = feather.read(
+        tmp_cachefile,
+        memory_map,
+        columns=["a"],
+        filter=pc.field("status") == "ok",
+    )
+
+    pdt.assert_frame_equal(
+        df,
+        dataframe.loc[[10, 30], ["a"]],
+        check_dtype=not memory_map,
+        check_index_type=not memory_map,
+    )
+
+
+def test_feather_filter_index(dataframe, tmp_cachefile):
+
+    dataframe = dataframe.set_axis(pd.Index([10, 20, 30], name="key"))
+
+    feather.write(dataframe, tmp_cachefile)
+
+    df = feather.read(tmp_cachefile, filter=pc.field("key") > 10)
+
+    pdt.assert_frame_equal(df, dataframe.iloc[1:])
+
+
+@pytest.mark.parametrize(
+    "columns, filter, expected",
+    [
+        (None, None, slice(None)),
+        (["b"], None, slice(None)),
+        (None, pc.field("a") >= 2, slice(1, None)),
+        (["a"], pc.field("b") == 4, slice(0, 1)),
+    ],
+)
+def test_feather_select(dataframe, columns, filter, expected):
+
+    df = feather.select(dataframe, columns, filter)
+
+    expected = dataframe.iloc[expected][columns or list(dataframe.columns)]
+
+    pdt.assert_frame_equal(df, expected.reset_index(drop=True))
+
+
+def test_feather_select_index(dataframe):
+    """
+    check if the labels of other indexes than a RangeIndex are kept.
+    """
+
+    dataframe = dataframe.set_axis(pd.Index(["x", "y", "z"], name="key"))
+
+    df = feather.select(dataframe, filter=pc.field("a") != 2)
+
+    pdt.assert_frame_equal(df, dataframe.loc[["x", "z"]])
+
+
+@pytest.fixture
+def mixed() -> pd.DataFrame:
+    """
+    DataFrame with numeric, string and categorical columns.
+    """
+
+    return pd.DataFrame(
+        {
+            "a": range(10),
+            "s": list("abcdefghij"),
+            "c": pd.Categorical(list("xyxyxyxyxy")),
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "index",
+    [None, "s"],
+    ids=["range", "named"],
+)
+@pytest.mark.parametrize(
+    "memory_map, codec",
+    [(False, None), (False, "zstd"), (True, None)],
+    ids=["default", "zstd", "memory_map"],
+)
+def test_feather_chunksize(mixed, tmp_cachefile, index, memory_map, codec):
+    """
+    check if chunked files are written as record batches and read like other files.
+    """
+
+    if index is not None:
+        mixed = mixed.set_index(index)
+
+    feather.write(mixed, tmp_cachefile, memory_map, codec, chunksize=3)
+
+    with pyarrow.memory_map(str(tmp_cachefile)) as source:
+        assert pyarrow.ipc.open_file(source).num_record_batches == 4
+
+    df = feather.read(tmp_cachefile, memory_map)
+
+    pdt.assert_frame_equal(
+        df,
+        mixed,
+        check_dtype=not memory_map,
+        check_index_type=not memory_map,
+        check_categorical=not memory_map,
+    )
+    assert feather.metadata(tmp_cachefile)["compression"] == (
+        "uncompressed" if memory_map else codec or compression.default()
+    )
+
+
+def test_feather_chunksize_empty(mixed, tmp_cachefile):
+
+    feather.write(mixed.iloc[:0], tmp_cachefile, chunksize=3)
+
+    pdt.assert_frame_equal(feather.read(tmp_cachefile), mixed.iloc[:0])
+
+
+def test_feather_chunksize_invalid(mixed, tmp_cachefile):
+
+    with pytest.raises(ValueError):
+        feather.write(mixed, tmp_cachefile, chunksize=0)
+
+    assert list(tmp_cachefile.parent.iterdir()) == [tmp_cachefile]
+
+
+@pytest.mark.parametrize(
+    "dataframe",
+    [
+        pd.DataFrame({"a": range(6)}, index=pd.RangeIndex(10, 22, 2)),
+        pd.DataFrame({"o": pd.Series([None, None, None, "x", "y", "z"], dtype=object)}),
+    ],
+    ids=["range", "null"],
+)
+def test_feather_chunksize_schema(dataframe, tmp_cachefile):
+    """
+    check if the schema of the first batch is extended to the whole DataFrame.
+    """
+
+    table = tmp_cachefile.with_name("table")
+
+    feather.write(dataframe, table)
+    feather.write(dataframe, tmp_cachefile, chunksize=3)
+
+    pdt.assert_frame_equal(feather.read(tmp_cachefile), feather.read(table))
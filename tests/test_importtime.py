@@ -0,0 +1,40 @@
+from benchmarks.importtime import BUDGET, MODULE, deferred, importtime, measure
+
+
+def test_import_deferred():
+    """
+    check if importing the package and decorating a function imports neither pandas,
+    pyarrow nor numpy.
+    """
+
+    modules = importtime()
+
+    assert MODULE in modules
+    assert deferred(modules) == []
+
+
+def test_import_first_call(tmp_path):
+    """
+    check if the deferred modules are imported on the first call.
+    """
+
+    statement = "\n".join(
+        [
+            "import federleicht",
+            f"@federleicht.cache_dataframe(cache_dir={str(tmp_path)!r})",
+            "def load():",
+            "    import pandas as pd",
+            "    return pd.DataFrame({'a': [1]})",
+            "assert not federleicht.from_cache(load())",
+            "assert federleicht.from_cache(load())",
+        ]
+    )
+
+    assert deferred(importtime(statement)) == ["pandas", "pyarrow", "numpy"]
+
+
+def test_import_budget():
+
+    median, _ = measure(repeat=3)
+
+    assert median < BUDGET
@@ -0,0 +1,113 @@
+import pandas as pd
+import pytest
+from pathlibutil import Path
+
+import federleicht.layout as layout
+from federleicht import cache_dataframe, from_cache, migrate_cache
+from federleicht.manifest import Manifest
+
+
+@pytest.mark.parametrize("sharded", [True, False])
+def test_path(tmp_path, cache, sharded):
+
+    file = layout.path(tmp_path, cache, sharded)
+
+    assert file.name == cache
+    assert layout.is_sharded(file) is sharded
+    assert layout.root(file) == tmp_path
+
+
+def test_path_sharded(tmp_path):
+
+    file = layout.path(tmp_path, "abcdef0123456789", sharded=True)
+
+    assert file == tmp_path / "ab" / "cd" / "abcdef0123456789"
+
+
+def test_is_sharded_other_prefix(tmp_path, cache):
+
+    file = tmp_path.joinpath("00", "00", "f" * len(cache))
+
+    assert layout.is_sharded(file) is False
+    assert layout.root(file) == file.parent
+
+
+def test_find(tmp_path, cache):
+
+    assert layout.find(tmp_path, cache) == tmp_path / cache
+
+    file = layout.path(tmp_path, cache, sharded=True)
+    file.parent.mkdir(parents=True)
+    file.touch()
+
+    assert layout.find(tmp_path, cache) == file
+
+
+def test_scan(tmp_path, cache):
+
+    flat = layout.path(tmp_path, "0" * len(cache))
+    flat.touch()
+
+    sharded = layout.path(tmp_path, cache, sharded=True)
+    sharded.parent.mkdir(parents=True)
+    sharded.touch()
+
+    sharded.with_suffix(".json").touch()
+    sharded.parent.joinpath("f" * len(cache)).mkdir()
+    tmp_path.joinpath("manifest.sqlite").touch()
+
+    # cache files in the first level of shards are not part of either layout
+    sharded.parent.parent.joinpath("1" * len(cache)).touch()
+
+    files = sorted(Path(entry) for entry in layout.scan(tmp_path))
+
+    assert files == sorted([flat, sharded])
+
+
+def test_scan_missing(tmp_path):
+
+    assert list(layout.scan(tmp_path / "missing")) == []
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("0123456789abcdef" * 2, True),
+        ("0123456789abcdef" * 2 + ".parquet", True),
+        ("0123456789abcdef" * 2 + ".json", False),
+        ("0123456789abcdef" * 2 + ".lock", False),
+        ("manifest.sqlite", False),
+    ],
+)
+def test_key(name, expected):
+
+    assert bool(layout.KEY.fullmatch(name)) is expected
+
+
+def test_scan_decorated(tmp_path):
+    """
+    check if scan, rebuild and migrate_cache find the cache files of real keys.
+    """
+
+    def create(n):
+        return pd.DataFrame({"n": [n]})
+
+    flat = cache_dataframe(create, cache_dir=tmp_path)
+    parquet = cache_dataframe(create, cache_dir=tmp_path, format="parquet")
+
+    _ = flat(1), parquet(2)
+    files = sorted(p.name for p in tmp_path.iterdir())
+
+    assert sorted(entry.name for entry in layout.scan(tmp_path)) == files
+
+    manifest = Manifest(tmp_path)
+    assert manifest.rebuild() == 2
+    assert sorted(manifest.keys()) == files
+    manifest.close()
+
+    assert migrate_cache(tmp_path, sharded=True) == 0
+
+    sharded = cache_dataframe(create, cache_dir=tmp_path, sharded=True)
+
+    assert from_cache(sharded(1)) is True
+    assert all(layout.is_sharded(Path(entry)) for entry in layout.scan(tmp_path))
@@ -0,0 +1,121 @@
+import multiprocessing
+import threading
+import time
+
+import pytest
+
+import federleicht.lock as lock
+from federleicht.lock import SingleFlight
+
+
+def hold(cache, event, seconds):
+    """
+    hold the lock of the cache file in another process.
+    """
+
+    with SingleFlight(cache):
+        event.set()
+        time.sleep(seconds)
+
+
+def test_lock_acquire_release(tmp_cachefile):
+
+    flight = SingleFlight(tmp_cachefile)
+
+    assert flight.acquire() is True
+    assert flight.locked is True
+    assert flight.file.is_file()
+
+    flight.release()
+    flight.release()
+
+    assert flight.locked is False
+    assert not flight.file.exists()
+    assert lock._registry == {}
+
+
+def test_lock_context(tmp_cachefile):
+
+    with SingleFlight(tmp_cachefile) as flight:
+        assert flight.locked is True
+
+    assert flight.locked is False
+
+
+def test_lock_timeout_thread(tmp_cachefile):
+    """
+    check if a second flight in the same process times out.
+    """
+
+    with SingleFlight(tmp_cachefile):
+        other = SingleFlight(tmp_cachefile, timeout=0.05)
+
+        assert other.acquire() is False
+        assert other.locked is False
+
+    assert other.acquire() is True
+    other.release()
+
+
+def test_lock_release_other_thread(tmp_cachefile):
+    """
+    check if the lock can be released by another thread, e.g. a background writer.
+    """
+
+    flight = SingleFlight(tmp_cachefile)
+    flight.acquire()
+
+    thread = threading.Thread(target=flight.release)
+    thread.start()
+    thread.join()
+
+    with SingleFlight(tmp_cachefile, timeout=0.05) as other:
+        assert other.locked is True
+
+
+def test_lock_timeout_process(tmp_cachefile):
+    """
+    check if the lock file serializes processes.
+    """
+
+    ctx = multiprocessing.get_context("spawn")
+    event = ctx.Event()
+
+    process = ctx.Process(target=hold, args=(tmp_cachefile, event, 1.0))
+    process.start()
+
+    try:
+        assert event.wait(timeout=30)
+
+        assert SingleFlight(tmp_cachefile, timeout=0.05).acquire() is False
+
+        flight = SingleFlight(tmp_cachefile, timeout=30)
+        assert flight.acquire() is True
+        flight.release()
+    finally:
+        process.join()
+
+
+@pytest.mark.parametrize("threads", [8])
+def test_lock_mutual_exclusion(tmp_cachefile, threads):
+
+    active = []
+    overlap = []
+
+    def work():
+        with SingleFlight(tmp_cachefile):
+            active.append(1)
+            overlap.append(len(active))
+            time.sleep(0.01)
+            active.pop()
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+
+    for worker in workers:
+        worker.start()
+
+    for worker in workers:
+        worker.join()
+
+    assert max(overlap) == 1
+    assert len(overlap) == threads
@@ -0,0 +1,135 @@
+import time
+
+import pytest
+
+from federleicht.config import CACHE
+from federleicht.manifest import Entry, Manifest, connect
+
+
+@pytest.fixture
+def manifest(tmp_path) -> Manifest:
+    manifest = Manifest(tmp_path)
+    yield manifest
+    manifest.close()
+
+
+def test_manifest_exists(manifest, tmp_path):
+
+    assert Manifest.exists(tmp_path) is False
+
+    assert len(manifest) == 0
+
+    assert Manifest.exists(tmp_path) is True
+    assert manifest.file.name == CACHE.manifest
+
+
+def test_manifest_add_get(manifest):
+
+    manifest.add("a", "module.func", 100, created=1.0)
+
+    assert manifest.get("a") == Entry("a", "module.func", 100, 1.0, 1.0, 0)
+    assert manifest.get("b") is None
+
+
+def test_manifest_hit(manifest):
+
+    manifest.add("a", "module.func", 100, created=1.0)
+
+    manifest.hit("a", accessed=2.0)
+    manifest.hit("a", accessed=3.0)
+
+    entry = manifest.get("a")
+
+    assert entry.hits == 2
+    assert entry.accessed == 3.0
+    assert entry.created == 1.0
+
+
+def test_manifest_queries(manifest):
+
+    now = time.time()
+
+    manifest.add("a", "module.foo", 100, created=now - 3600)
+    manifest.add("b", "module.foo", 200, created=now)
+    manifest.add("c", "module.bar", 300, created=now)
+
+    assert manifest.expired(now - 60) == ["a"]
+    assert sorted(manifest.keys()) == ["a", "b", "c"]
+    assert {e.key for e in manifest.entries("module.foo")} == {"a", "b"}
+    assert len(manifest.entries()) == 3
+    assert manifest.nbytes() == 600
+
+    manifest.remove(["a", "b"])
+
+    assert manifest.keys() == ["c"]
+
+
+def test_manifest_transaction_rollback(manifest):
+
+    with pytest.raises(RuntimeError):
+        with manifest.transaction() as connection:
+            connection.execute("INSERT INTO entries VALUES ('a', '', 1, 1, 1, 0)")
+            raise RuntimeError
+
+    assert len(manifest) == 0
+
+
+def test_manifest_rebuild(manifest, tmp_path, cache):
+
+    (tmp_path / cache).write_bytes(b"1234")
+    (tmp_path / "other.txt").write_bytes(b"1234")
+
+    manifest.add("0" * CACHE.digest, "module.func", 100)
+
+    assert manifest.rebuild() == 1
+    assert manifest.get(cache).size == 4
+
+
+def test_manifest_connect(tmp_path):
+
+    assert connect(tmp_path) is connect(str(tmp_path))
+
+
+def test_manifest_nbytes_triggers(manifest):
+    """
+    check if the total size is maintained on insert, replace, update and delete.
+    """
+
+    manifest.add("a", "", 100)
+    manifest.add("b", "", 200)
+    manifest.add("a", "", 50)
+
+    assert manifest.nbytes() == 250
+
+    manifest.connection.execute("UPDATE entries SET size = 10 WHERE key = 'b'")
+    assert manifest.nbytes() == 60
+
+    manifest.remove(["a"])
+    assert manifest.nbytes() == 10
+
+
+@pytest.mark.parametrize(
+    "policy, order",
+    [
+        ("lru", ["b", "a", "c"]),
+        ("lfu", ["c", "b", "a"]),
+    ],
+)
+def test_manifest_victims(manifest, policy, order):
+
+    manifest.add("a", "", 1, created=1.0)
+    manifest.add("b", "", 1, created=1.0)
+    manifest.add("c", "", 1, created=5.0)
+
+    manifest.hit("a", accessed=3.0)
+    manifest.hit("a", accessed=4.0)
+    manifest.hit("b", accessed=2.0)
+
+    assert [e.key for e in manifest.victims(policy)] == order
+    assert len(manifest.victims(policy, limit=1)) == 1
+
+
+def test_manifest_victims_invalid(manifest):
+
+    with pytest.raises(ValueError):
+        manifest.victims("fifo")
@@ -0,0 +1,156 @@
+import time
+
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from federleicht.memory import MemoryCache, is_expired, nbytes
+
+
+@pytest.fixture
+def memory(dataframe) -> MemoryCache:
+    """
+    memory cache with space for two dataframes.
+    """
+    return MemoryCache(max_bytes=2 * nbytes(dataframe))
+
+
+@pytest.mark.parametrize(
+    "max_bytes",
+    [-1, 1.5, "1024"],
+    ids=str,
+)
+def test_memory_invalid_budget(max_bytes):
+
+    with pytest.raises(ValueError):
+        MemoryCache(max_bytes)
+
+
+def test_memory_get_missing(memory):
+
+    assert memory.get("missing") is None
+
+
+def test_memory_put_get(memory, dataframe):
+
+    assert memory.put("a", dataframe) is True
+
+    df = memory.get("a")
+
+    assert df is not dataframe
+    pdt.assert_frame_equal(df, dataframe)
+    assert memory.nbytes == nbytes(dataframe)
+
+
+def test_memory_copy_on_return(memory, dataframe):
+    """
+    check if modifying a returned dataframe does not corrupt the cached entry.
+    """
+
+    memory.put("a", dataframe)
+
+    df = memory.get("a")
+    df.loc[0, "a"] = 99
+    df.attrs["foo"] = "bar"
+
+    pdt.assert_frame_equal(memory.get("a"), dataframe)
+    assert memory.get("a").attrs == {}
+
+
+def test_memory_copy_on_put(memory, dataframe):
+    """
+    check if modifying the original dataframe does not corrupt the cached entry.
+    """
+
+    original = dataframe.copy()
+
+    memory.put("a", dataframe)
+    dataframe.loc[0, "a"] = 99
+
+    pdt.assert_frame_equal(memory.get("a"), original)
+
+
+def test_memory_lru_eviction(memory, dataframe):
+
+    memory.put("a", dataframe)
+    memory.put("b", dataframe)
+
+    assert memory.get("a") is not None
+
+    memory.put("c", dataframe)
+
+    assert "a" in memory
+    assert "b" not in memory
+    assert "c" in memory
+    assert len(memory) == 2
+    assert memory.nbytes <= memory.max_bytes
+
+
+def test_memory_exceeds_budget(dataframe):
+
+    memory = MemoryCache(max_bytes=nbytes(dataframe) - 1)
+
+    assert memory.put("a", dataframe) is False
+    assert len(memory) == 0
+
+
+def test_memory_replace(memory, dataframe):
+
+    memory.put("a", dataframe)
+    memory.put("a", dataframe)
+
+    assert len(memory) == 1
+    assert memory.nbytes == nbytes(dataframe)
+
+
+def test_memory_expired(memory, dataframe):
+
+    memory.put("a", dataframe, created=time.time() - 120)
+
+    assert memory.get("a", expires={"minutes": 5}) is not None
+    assert memory.get("a", expires=60) is None
+    assert "a" not in memory
+    assert memory.nbytes == 0
+
+
+def test_memory_pop_clear(memory, dataframe):
+
+    memory.put("a", dataframe)
+    memory.put("b", dataframe)
+
+    memory.pop("a")
+    assert "a" not in memory
+
+    memory.clear()
+    assert len(memory) == 0
+    assert memory.nbytes == 0
+
+
+@pytest.mark.parametrize(
+    "expires, expired",
+    [
+        (None, False),
+        (60, True),
+        ({"hours": 1}, False),
+    ],
+    ids=str,
+)
+def test_memory_is_expired(expires, expired):
+
+    assert is_expired(time.time() - 120, expires) is expired
+
+
+def test_memory_is_expired_typeerror():
+
+    with pytest.raises(TypeError):
+        is_expired(time.time(), "60")
+
+
+def test_memory_nbytes_deep():
+    """
+    check if the memory usage of object columns is measured deep.
+    """
+
+    df = pd.DataFrame({"a": ["x" * 1000] * 10}, dtype=object)
+
+    assert nbytes(df) > 10 * 1000
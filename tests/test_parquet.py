@@ -0,0 +1,105 @@
+import pandas as pd
+import pandas.testing as pdt
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+import pytest
+
+import federleicht.parquet as parquet
+
+
+@pytest.fixture
+def parquetfile(tmp_path, cache):
+    return tmp_path / f"{cache}.parquet"
+
+
+@pytest.mark.parametrize(
+    "index",
+    [
+        pd.RangeIndex(3),
+        pd.Index(["x", "y", "z"], name="key"),
+    ],
+    ids=["range", "named"],
+)
+def test_parquet_roundtrip(dataframe, parquetfile, index):
+
+    dataframe = dataframe.set_axis(index)
+
+    parquet.write(dataframe, parquetfile)
+
+    pdt.assert_frame_equal(parquet.read(parquetfile), dataframe)
+    pdt.assert_frame_equal(parquet.read(parquetfile, columns=["b"]), dataframe[["b"]])
+
+
+@pytest.mark.parametrize(
+    "codec, level, expected",
+    [
+        (None, None, "ZSTD"),
+        ("zstd", 9, "ZSTD"),
+        ("lz4", None, "LZ4"),
+        ("uncompressed", None, "UNCOMPRESSED"),
+    ],
+)
+def test_parquet_compression(dataframe, parquetfile, codec, level, expected):
+
+    parquet.write(dataframe, parquetfile, codec=codec, level=level)
+
+    column = pq.ParquetFile(parquetfile).metadata.row_group(0).column(0)
+
+    assert column.compression == expected
+    assert parquet.metadata(parquetfile)["compression_level"] == level
+
+
+def test_parquet_metadata_foreign(dataframe, parquetfile):
+
+    dataframe.to_parquet(parquetfile)
+
+    assert parquet.metadata(parquetfile) == {}
+
+
+def test_parquet_memory_map(dataframe, parquetfile):
+
+    with pytest.raises(ValueError):
+        parquet.write(dataframe, parquetfile, memory_map=True)
+
+
+def test_parquet_filter_row_groups(parquetfile):
+    """
+    check if row groups are written with statistics which allow skipping them.
+    """
+
+    dataframe = pd.DataFrame({"a": range(100), "b": ["x", "y"] * 50})
+
+    parquet.write(dataframe, parquetfile, row_group_size=10)
+
+    metadata = pq.ParquetFile(parquetfile).metadata
+    statistics = metadata.row_group(9).column(0).statistics
+
+    assert metadata.num_row_groups == 10
+    assert (statistics.min, statistics.max) == (90, 99)
+
+    df = parquet.read(parquetfile, filter=pc.field("a") >= 95)
+
+    pdt.assert_frame_equal(df, dataframe.iloc[95:].reset_index(drop=True))
+
+
+def test_parquet_write_error(dataframe, parquetfile, mocker):
+
+    mocker.patch("federleicht.parquet.pq.write_table", side_effect=OSError)
+
+    with pytest.raises(OSError):
+        parquet.write(dataframe, parquetfile)
+
+    assert list(parquetfile.parent.iterdir()) == []
+
+
+def test_parquet_chunksize(parquetfile):
+
+    dataframe = pd.DataFrame(
+        {"a": range(10), "c": pd.Categorical(list("xyxyxyxyxy"))},
+        index=pd.Index(list("abcdefghij"), name="key"),
+    )
+
+    parquet.write(dataframe, parquetfile, chunksize=4)
+
+    assert pq.ParquetFile(parquetfile).metadata.num_row_groups == 3
+    pdt.assert_frame_equal(parquet.read(parquetfile), dataframe)
@@ -0,0 +1,145 @@
+import threading
+
+import pandas as pd
+import pytest
+
+from federleicht import cache_dataframe, from_cache, warm
+from federleicht.prefetch import Progress, readahead
+
+
+def test_prefetch(tmp_path):
+
+    calls = []
+
+    @cache_dataframe(cache_dir=tmp_path)
+    def wrapped(n):
+        calls.append(n)
+        return pd.DataFrame({"n": [n]})
+
+    _ = wrapped(1)
+
+    progress = wrapped.prefetch([1, 2, (3,)], max_workers=2)
+
+    assert isinstance(progress, Progress)
+    assert progress.wait(timeout=10) is True
+    assert (progress.done, progress.hits, progress.misses) == (3, 1, 2)
+    assert progress.errors == []
+    assert sorted(calls) == [1, 2, 3]
+    assert all(from_cache(wrapped(n)) for n in (1, 2, 3))
+
+
+def test_prefetch_memory(tmp_path):
+
+    @cache_dataframe(cache_dir=tmp_path)
+    def create(n):
+        return pd.DataFrame({"n": [n]})
+
+    _ = create(1)
+
+    wrapped = cache_dataframe(create.__wrapped__, cache_dir=tmp_path, memory=2**20)
+
+    progress = wrapped.prefetch([1])
+    progress.wait()
+
+    assert progress.hits == 1
+    assert len(wrapped.memory) == 1
+
+
+def test_prefetch_expired(tmp_path):
+
+    @cache_dataframe(cache_dir=tmp_path, expires=-1)
+    def wrapped(n):
+        return pd.DataFrame({"n": [n]})
+
+    _ = wrapped(1)
+
+    progress = wrapped.prefetch([1])
+    progress.wait()
+
+    assert progress.misses == 1
+
+
+def test_prefetch_errors(tmp_path):
+
+    @cache_dataframe(cache_dir=tmp_path)
+    def wrapped(n):
+        raise ValueError(n)
+
+    progress = wrapped.prefetch([1, 2])
+    progress.wait()
+
+    assert progress.done == 2
+    assert progress.hits + progress.misses == 0
+    assert [type(e) for e in progress.errors] == [ValueError, ValueError]
+    assert "errors=2" in repr(progress)
+
+
+def test_prefetch_async(tmp_path):
+
+    @cache_dataframe(cache_dir=tmp_path)
+    async def wrapped(n):
+        return pd.DataFrame({"n": [n]})
+
+    progress = wrapped.prefetch([1])
+    progress.wait()
+
+    assert progress.misses == 1
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_prefetch_generator(tmp_path):
+
+    @cache_dataframe(cache_dir=tmp_path)
+    def wrapped(n):
+        yield pd.DataFrame({"n": [n]})
+
+    for _ in range(2):
+        progress = wrapped.prefetch([1])
+        progress.wait()
+
+    assert progress.hits == 1
+    assert all(from_cache(chunk) for chunk in wrapped(1))
+
+
+def test_prefetch_cancel(tmp_path):
+
+    event = threading.Event()
+
+    @cache_dataframe(cache_dir=tmp_path)
+    def wrapped(n):
+        event.wait(10)
+        return pd.DataFrame({"n": [n]})
+
+    progress = wrapped.prefetch(range(4), max_workers=1)
+
+    assert progress.cancel() >= 2
+
+    event.set()
+    progress.wait()
+
+    assert progress.done == len(progress) == 4
+
+
+def test_warm(tmp_path):
+
+    @cache_dataframe(cache_dir=tmp_path)
+    def first(n):
+        return pd.DataFrame({"n": [n]})
+
+    @cache_dataframe(cache_dir=tmp_path)
+    def second(n):
+        return pd.DataFrame({"n": [n]})
+
+    progress = warm({first: [1, 2], second: [3]})
+
+    assert progress.wait() is True
+    assert progress.misses == 3
+
+
+@pytest.mark.parametrize("size", [0, 10, 2**20 + 1])
+def test_readahead(tmp_path, size):
+
+    file = tmp_path / "file"
+    file.write_bytes(b"x" * size)
+
+    assert readahead(file) == size
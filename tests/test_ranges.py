@@ -0,0 +1,171 @@
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from federleicht import from_cache
+from federleicht.ranges import cache_range, partitions
+
+
+@pytest.fixture
+def series() -> pd.DataFrame:
+    """
+    hourly values over three months.
+    """
+
+    index = pd.date_range("2024-01-01", "2024-04-01", freq="h", inclusive="left")
+
+    return pd.DataFrame({"value": range(len(index))}, index=index)
+
+
+@pytest.fixture
+def load(series, tmp_path):
+    """
+    cached loader which records the partitions it computes.
+    """
+
+    calls = []
+
+    @cache_range(freq="month", cache_dir=tmp_path)
+    def wrapped(start, end, scale=1):
+        calls.append((start, end))
+        return series[(series.index >= start) & (series.index < end)] * scale
+
+    wrapped.calls = calls
+
+    return wrapped
+
+
+@pytest.mark.parametrize(
+    "start, end, freq, expected",
+    [
+        ("2024-01-15", "2024-03-01", "month", ["2024-01-01", "2024-02-01"]),
+        (
+            "2024-01-15",
+            "2024-03-02",
+            "month",
+            ["2024-01-01", "2024-02-01", "2024-03-01"],
+        ),
+        ("2024-01-01 12:00", "2024-01-03", "day", ["2024-01-01", "2024-01-02"]),
+        ("2024-01-03", "2024-01-03", "day", []),
+    ],
+)
+def test_partitions(start, end, freq, expected):
+
+    bounds = list(partitions(start, end, freq))
+
+    assert [str(lower.date()) for lower, _ in bounds] == expected
+    assert all(lower < upper for lower, upper in bounds)
+
+
+def test_partitions_tz():
+
+    (lower, upper), *_ = partitions(
+        pd.Timestamp("2024-01-15", tz="UTC"),
+        pd.Timestamp("2024-02-15", tz="UTC"),
+        "month",
+    )
+
+    assert lower == pd.Timestamp("2024-01-01", tz="UTC")
+    assert upper == pd.Timestamp("2024-02-01", tz="UTC")
+
+
+def test_cache_range(load, series):
+
+    df = load("2024-01-10", "2024-02-20")
+
+    assert from_cache(df) is False
+    assert len(load.calls) == 2
+    pdt.assert_frame_equal(df, series.loc["2024-01-10":"2024-02-19"], check_freq=False)
+
+    df = load("2024-01-01", "2024-03-15")
+
+    assert from_cache(df) is False
+    assert len(load.calls) == 3, "only March should be computed"
+    pdt.assert_frame_equal(df, series.loc["2024-01-01":"2024-03-14"], check_freq=False)
+
+    df = load(end="2024-03-01", start="2024-02-01")
+
+    assert from_cache(df) is True
+    assert len(df.attrs["from_cache"]) == 1
+    assert len(load.calls) == 3
+
+
+def test_cache_range_arguments(load, series):
+    """
+    check if other arguments are part of the cache key of each partition.
+    """
+
+    _ = load("2024-01-01", "2024-02-01")
+    df = load("2024-01-01", "2024-02-01", scale=2)
+
+    assert len(load.calls) == 2
+    pdt.assert_frame_equal(df, series.loc["2024-01"] * 2, check_freq=False)
+
+
+def test_cache_range_on(tmp_path):
+
+    data = pd.DataFrame(
+        {"time": pd.date_range("2024-01-01", periods=48, freq="h"), "value": 1}
+    )
+
+    @cache_range(on="time", cache_dir=tmp_path)
+    def wrapped(start, end):
+        return data[(data["time"] >= start) & (data["time"] < end)]
+
+    df = wrapped("2024-01-01 06:00", "2024-01-02 06:00")
+
+    assert len(df) == 24
+    assert df["time"].min() == pd.Timestamp("2024-01-01 06:00")
+
+
+@pytest.mark.parametrize("tz", [None, "UTC"])
+def test_cache_range_incomplete(tmp_path, tz):
+    """
+    check if partitions ending in the future are computed on every call.
+    """
+
+    calls = []
+
+    @cache_range(cache_dir=tmp_path)
+    def wrapped(start, end):
+        calls.append((start, end))
+        return pd.DataFrame({"value": [1]}, index=[start])
+
+    today = pd.Timestamp.now(tz=tz).normalize()
+    start, end = today - pd.Timedelta(days=2), today + pd.Timedelta(days=1)
+
+    _ = wrapped(start, end)
+    df = wrapped(start, end)
+
+    assert len(calls) == 4, "only today should be computed again"
+    assert calls[-1] == (today, end)
+    assert from_cache(df) is False
+    assert len(df) == 3
+
+
+def test_cache_range_empty(load):
+
+    with pytest.raises(ValueError):
+        load("2024-01-02", "2024-01-01")
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"freq": "week"},
+        {"start": "begin"},
+    ],
+)
+def test_cache_range_invalid(kwargs):
+
+    with pytest.raises(ValueError):
+        cache_range(lambda start, end: None, **kwargs)
+
+
+def test_cache_range_coroutine():
+
+    async def wrapped(start, end):
+        return pd.DataFrame()
+
+    with pytest.raises(TypeError):
+        cache_range(wrapped)
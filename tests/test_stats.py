@@ -0,0 +1,82 @@
+import gc
+import json
+
+import pytest
+
+import federleicht.stats as stats
+from federleicht.stats import CacheInfo, Event, Stats, Timing
+
+
+def test_stats_record():
+
+    s = Stats("module.function")
+
+    s.record("hit")
+    s.record("miss")
+    s.record("read", 0.5, 100)
+    s.record("write", 1.5, 200)
+
+    info = s.info()
+
+    assert isinstance(info, CacheInfo)
+    assert (info.hits, info.misses, info.expirations, info.errors) == (1, 1, 0, 0)
+    assert (info.bytes_read, info.bytes_written) == (100, 200)
+    assert info.timings["read"] == Timing(1, 0.5, 0.5, 0.5, 0.5, 0.5)
+    assert info.timings["compute"] == Timing()
+
+
+def test_stats_percentiles(monkeypatch):
+
+    monkeypatch.setattr(stats, "SAMPLES", 100)
+
+    s = Stats("function")
+
+    for i in range(200):
+        s.record("hash", float(i))
+
+    timing = s.info().timings["hash"]
+
+    assert timing.count == 200
+    assert timing.total == sum(range(200))
+    assert timing.p50 == pytest.approx(149.5)
+    assert timing.max == 199
+
+
+def test_stats_clear():
+
+    s = Stats("function")
+    s.record("error")
+    s.record("compute", 1.0)
+    s.clear()
+
+    assert s.info() == Stats("function").info()
+
+
+def test_stats_callback():
+
+    events = []
+    s = Stats("function", events.append)
+
+    s.record("expired")
+    s.record("read", 0.1, 10)
+
+    assert events == [
+        Event("function", "expired"),
+        Event("function", "read", 0.1, 10),
+    ]
+
+
+def test_stats_registry():
+
+    s = Stats("test_stats_registry")
+    s.record("hit")
+
+    assert [i.hits for i in stats.cache_info() if i.function == s.function] == [1]
+
+    dumped = [d for d in stats.dump() if d["function"] == s.function]
+    assert json.loads(json.dumps(dumped))[0]["timings"]["read"]["count"] == 0
+
+    del s
+    gc.collect()
+
+    assert "test_stats_registry" not in [i.function for i in stats.cache_info()]
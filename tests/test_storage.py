@@ -0,0 +1,27 @@
+import pytest
+
+import federleicht.storage as storage
+
+
+@pytest.mark.parametrize("format", ["feather", "parquet"])
+def test_storage_get(format):
+
+    assert storage.get(format).name == format
+
+
+def test_storage_get_invalid():
+
+    with pytest.raises(ValueError):
+        storage.get("csv")
+
+
+@pytest.mark.parametrize(
+    "file, expected",
+    [
+        ("0123456789abcdef", "feather"),
+        ("0123456789abcdef.parquet", "parquet"),
+    ],
+)
+def test_storage_detect(file, expected):
+
+    assert storage.detect(file).name == expected
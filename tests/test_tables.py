@@ -0,0 +1,132 @@
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pytest
+
+import federleicht.feather as feather
+import federleicht.parquet as parquet
+import federleicht.tables as tables
+from federleicht import from_cache
+
+
+@pytest.fixture
+def table():
+    return pa.table({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+
+
+@pytest.mark.parametrize(
+    "obj, expected",
+    [
+        (pd.DataFrame({"a": [1]}), "pandas"),
+        (pa.table({"a": [1]}), "pyarrow"),
+    ],
+    ids=lambda x: str(x) if isinstance(x, str) else type(x).__name__,
+)
+def test_tables_kind(obj, expected):
+
+    assert tables.kind(obj) == expected
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        None,
+        pd.Series([1]),
+        pa.array([1]),
+        {"a": [1]},
+    ],
+    ids=lambda x: type(x).__name__,
+)
+def test_tables_kind_raises(obj):
+
+    with pytest.raises(TypeError):
+        tables.kind(obj)
+
+
+@pytest.mark.parametrize("module", [feather, parquet])
+@pytest.mark.parametrize("chunksize", [None, 2])
+def test_tables_roundtrip(table, tmp_path, module, chunksize):
+
+    file = module.write(table, tmp_path / "cache", chunksize=chunksize)
+    result = module.read(file)
+
+    assert isinstance(result, pa.Table)
+    assert result.equals(table)
+    assert module.metadata(file)["type"] == "pyarrow"
+
+
+def test_tables_roundtrip_memory_map(table, tmp_path):
+
+    file = feather.write(table, tmp_path / "cache", memory_map=True)
+    result = feather.read(file, memory_map=True)
+
+    assert result.equals(table)
+
+
+@pytest.mark.parametrize("module", [feather, parquet])
+def test_tables_read_filter(table, tmp_path, module):
+
+    file = module.write(table, tmp_path / "cache")
+    result = module.read(file, columns=["b"], filter=pc.field("a") > 1)
+
+    assert result.equals(pa.table({"b": ["y", "z"]}))
+
+
+def test_tables_compression_auto(table, tmp_path):
+
+    file = feather.write(table, tmp_path / "cache", codec="auto")
+
+    assert feather.metadata(file)["compression"] in ("lz4", "zstd", "uncompressed")
+
+
+def test_tables_select(table):
+
+    assert feather.select(table) is table
+    assert feather.select(table, ["a"], pc.field("b") == "y").equals(
+        pa.table({"a": [2]})
+    )
+
+
+def test_tables_mark(table, tmp_path):
+
+    assert from_cache(table) is False
+
+    marked = tables.mark(table, tmp_path)
+
+    assert from_cache(marked) is True
+    assert marked.equals(table)
+    assert tables.mark(marked, tmp_path) is marked
+
+
+def test_tables_polars(tmp_path):
+
+    pl = pytest.importorskip("polars")
+
+    df = pl.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+
+    assert tables.kind(df) == "polars"
+
+    file = feather.write(df, tmp_path / "cache")
+    result = feather.read(file)
+
+    assert isinstance(result, pl.DataFrame)
+    assert result.equals(df)
+    assert feather.select(df, ["a"], pc.field("a") > 2).equals(
+        df.filter(pl.col("a") > 2).select("a")
+    )
+
+
+@pytest.mark.parametrize(
+    "results",
+    [
+        [],
+        [pd.DataFrame({"a": [1]}), pd.DataFrame({"a": [2]})],
+        [pa.table({"a": [1]}), pa.table({"a": [2]})],
+    ],
+    ids=["empty", "pandas", "pyarrow"],
+)
+def test_tables_concat(results):
+
+    result = tables.concat(results)
+
+    assert len(result) == len(results)
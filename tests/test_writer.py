@@ -0,0 +1,74 @@
+import threading
+import time
+
+import pytest
+
+import federleicht
+from federleicht.writer import WRITER, Writer
+
+
+@pytest.fixture
+def writer():
+    writer = Writer(max_workers=2, max_bytes=100)
+    yield writer
+    writer.flush()
+
+
+def test_writer_flush(writer):
+
+    done = []
+
+    for i in range(5):
+        writer.submit(10, lambda i=i: done.append(i))
+
+    assert writer.flush() == 0
+    assert sorted(done) == list(range(5))
+    assert len(writer) == 0
+    assert writer.nbytes == 0
+
+
+def test_writer_errors(writer):
+
+    def fail():
+        raise PermissionError
+
+    writer.submit(10, fail)
+
+    assert writer.flush() == 1
+    assert writer.flush() == 0
+
+
+def test_writer_backpressure(writer):
+    """
+    check if submit blocks while the pending writes exceed the budget.
+    """
+
+    event = threading.Event()
+
+    writer.submit(80, event.wait)
+    assert writer.nbytes == 80
+
+    timer = threading.Timer(0.2, event.set)
+    timer.start()
+
+    start = time.perf_counter()
+    writer.submit(80, lambda: None)
+
+    assert time.perf_counter() - start >= 0.1
+    timer.join()
+
+
+def test_writer_oversized(writer):
+    """
+    check if a single write larger than the budget is accepted.
+    """
+
+    future = writer.submit(1000, lambda: 42)
+
+    assert future.result() == 42
+
+
+def test_writer_flush_default():
+
+    assert federleicht.flush() == 0
+    assert len(WRITER) == 0